@@ -0,0 +1,33 @@
+"""JSON decoding benchmark over endpoint-sized payloads: python -m benchmarks.bench_json"""
+
+import json
+import timeit
+
+from .payloads import get_payloads
+
+from trading212.decoder import get_loads
+
+
+def main(number: int = 20):
+    decoders = {'json.loads(text)': lambda data: json.loads(data.decode())}
+
+    for name in ('json', 'orjson'):
+        try:
+            decoders[f'{name} (bytes)'] = get_loads(name)
+
+        except ImportError:
+            pass
+
+    print(f'{"payload":<12}{"size":>10}' + ''.join(f'{name:>20}' for name in decoders))
+
+    for payload, data in get_payloads().items():
+        timings = [
+            timeit.timeit(lambda: decode(data), number=number) / number * 1000
+            for decode in decoders.values()
+        ]
+
+        print(f'{payload:<12}{len(data) // 1024:>8}KB' + ''.join(f'{timing:>18.2f}ms' for timing in timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Import time and login-token extraction benchmark: python -m benchmarks.bench_login"""
+
+import sys
+import timeit
+import subprocess
+
+from .payloads import make_login_page
+
+from trading212 import parser
+
+
+def get_import_time(module: str, number: int = 5) -> float:
+    code = f'import time; started = time.perf_counter(); import {module}; print(time.perf_counter() - started)'
+
+    return min(
+        float(subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout)
+        for _ in range(number)
+    ) * 1000
+
+
+def main(number: int = 10):
+    for module in ('trading212.cfd', 'bs4, html5lib'):
+        print(f'import {module:<24}{get_import_time(module):>10.2f}ms')
+
+    page = make_login_page()
+    finders = {
+        'scanner': parser.find_login_token,
+        'lxml': parser.find_login_token_lxml,
+        'bs4/html5lib': parser.find_login_token_bs4
+    }
+
+    print(f'\nlogin page {len(page) // 1024}KB')
+
+    for name, finder in finders.items():
+        if finder(page) is None:
+            print(f'{name:<31}{"unavailable":>12}')
+            continue
+
+        timing = timeit.timeit(lambda: finder(page), number=number) / number * 1000
+        print(f'{name:<31}{timing:>10.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
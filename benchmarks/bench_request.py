@@ -0,0 +1,88 @@
+"""Per-call request overhead benchmark: python -m benchmarks.bench_request"""
+
+import timeit
+
+import requests
+
+from requests.adapters import BaseAdapter
+
+from tests.conftest import SESSION_STATE
+from trading212.limiter import TokenBucket
+from trading212.rest import Trading212Rest
+
+
+class StubAdapter(BaseAdapter):
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code, response._content = 200, b'{}'
+        response.request, response.url = request, request.url
+
+        return response
+
+    def close(self):
+        pass
+
+
+class LegacyRest(Trading212Rest):
+
+    def get_legacy_headers(self) -> dict:
+        return {
+            **self.get_generic_headers(),
+            'Host': f'{self._account_type}.trading212.com',
+            'Origin': f'https://{self._account_type}.trading212.com',
+            'Referer': f'https://{self._account_type}.trading212.com/',
+            'X-Trader-Client': f'application={self._application_name}, '
+            f'version={self._application_version}, '
+            f'accountId={self._account_id}'
+        }
+
+    def get_legacy_url(self, api_endpoint: str = '') -> str:
+        return '/'.join([f'https://{self._account_type}.trading212.com', api_endpoint.strip('/')])
+
+    def _position_close(self, session, position_id, **kwargs):
+        api_url = self.get_legacy_url(f'/rest/v2/trading/open-positions/close/{position_id}')
+
+        return self._request(
+            session, 'delete', api_url,
+            priority='trading',
+            headers=self.get_legacy_headers(),
+            json={'targetPrice': None}
+        )
+
+
+def create_client(cls, install: bool):
+    client = cls(limiter=TokenBucket(rate=10 ** 9, burst=10 ** 9))
+    client._set_session_state(SESSION_STATE)
+
+    session = requests.Session()
+    session.trust_env = False
+    session.mount('https://', StubAdapter())
+
+    return client, client.install_rest_headers(session) if install else session
+
+
+def main(number: int = 20000):
+    legacy, legacy_session = create_client(LegacyRest, install=False)
+    current, current_session = create_client(Trading212Rest, install=True)
+
+    cases = {
+        'url + headers': (
+            lambda: (legacy.get_legacy_url('/rest/v2/account'), legacy.get_legacy_headers()),
+            lambda: current.get_route_url('account')
+        ),
+        'position close': (
+            lambda: legacy._position_close(legacy_session, 'p1'),
+            lambda: current._position_close(current_session, 'p1')
+        )
+    }
+
+    for name, (before, after) in cases.items():
+        before_us = timeit.timeit(before, number=number) / number * 10 ** 6
+        after_us = timeit.timeit(after, number=number) / number * 10 ** 6
+
+        print(f'{name:<16}legacy {before_us:>8.2f}us  current {after_us:>8.2f}us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""Session metadata extraction benchmark: python -m benchmarks.bench_session"""
+
+import re
+import timeit
+
+from .payloads import make_session_page
+
+from trading212.parser import parse_session_metadata
+
+
+def parse_session_metadata_legacy(html: str) -> dict:
+    return {
+        'account_id': re.search(r'\'accountId\':\s\'([0-9]+)\'', html).group(1),
+        'account_type': re.search(r'\'accountType\':\s\'([aA-zZ]+)\'', html).group(1).lower(),
+        'account_trading_type': re.search(r'\'accountTradingType\':\s\'([aA-zZ]+)\'', html).group(1).lower(),
+        'application_name': re.search(r'application=([aA-zZ0-9]+)', html).group(1),
+        'application_version': re.search(r'version=([aA-zZ0-9\.]+)', html).group(1)
+    }
+
+
+def main(number: int = 200):
+    for size in (50000, 500000, 2000000):
+        page = make_session_page(size)
+        assert parse_session_metadata(page) == parse_session_metadata_legacy(page)
+
+        legacy = timeit.timeit(lambda: parse_session_metadata_legacy(page), number=number) / number * 1000
+        current = timeit.timeit(lambda: parse_session_metadata(page), number=number) / number * 1000
+
+        print(f'{len(page) // 1024:>6}KB  legacy {legacy:>8.3f}ms  current {current:>8.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
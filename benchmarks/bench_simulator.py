@@ -0,0 +1,44 @@
+"""Order and candle throughput against the local simulator: python -m benchmarks.bench_simulator"""
+
+import time
+
+from trading212.cfd import Trading212CFD
+from trading212.limiter import TokenBucket
+from trading212.simulator import SimulatorConfig, Trading212Simulator
+
+
+def run(name: str, count: int, func):
+    started = time.perf_counter()
+    results = func()
+    elapsed = time.perf_counter() - started
+
+    errors = sum(not result.ok for result in results) if isinstance(results, list) else 0
+    print(f'{name:<28}{count:>6} calls  {elapsed:>7.2f}s  {count / elapsed:>8.0f}/s  errors {errors}')
+
+
+def main(orders: int = 1000, instruments: int = 500, latency: float = 0.005):
+    with Trading212Simulator(SimulatorConfig(latency=latency)) as simulator:
+        client = Trading212CFD(
+            'bench', 'pass', limiter=TokenBucket(rate=10 ** 6), **simulator.get_client_kwargs())
+
+        client.bulk_max_workers = 32
+        bid, ask = client.get_market_price('EURUSD')
+
+        run('open_orders', orders, lambda: client.open_orders([
+            {'direction': 'buy', 'instrument': 'EURUSD', 'price': round(ask['open'] * 0.9, 5), 'quantity': 100}
+            for _ in range(orders)
+        ]))
+
+        client.get_account()
+        order_ids = list(client.account_state.orders)
+
+        run('cancel_orders', len(order_ids), lambda: client.cancel_orders(order_ids))
+
+        run('get_candles_many', instruments, lambda: client.get_candles_many(
+            [f'INSTRUMENT{i}' for i in range(instruments)], 60, limit=100))
+
+        print(f'\nsimulator requests {sum(simulator.stats().values())}')
+
+
+if __name__ == '__main__':
+    main()
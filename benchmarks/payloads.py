@@ -0,0 +1,98 @@
+import json
+import random
+
+
+def make_candles(instrument: str, count: int = 500, period: int = 60000) -> dict:
+    price = random.uniform(1, 100)
+    candles = []
+
+    for i in range(count):
+        price *= random.uniform(0.999, 1.001)
+        spread = price * 0.0002
+
+        candles.append({
+            'timestamp': 1600000000000 + i * period,
+            'bid': {'open': price, 'high': price * 1.0005, 'low': price * 0.9995, 'close': price},
+            'ask': {'open': price + spread, 'high': price * 1.0005 + spread,
+                    'low': price * 0.9995 + spread, 'close': price + spread}
+        })
+
+    return {
+        'request': {'instCode': instrument, 'periodType': 'ONE_MINUTE', 'limit': count, 'withFakes': False},
+        'candles': candles
+    }
+
+
+def make_positions(count: int = 2000) -> list:
+    return [{
+        'positionId': f'{random.getrandbits(64):x}',
+        'code': random.choice(['EURUSD', 'GBPUSD', 'BTCUSD', 'AAPL', 'TSLA']),
+        'quantity': random.randint(1, 1000),
+        'averagePrice': random.uniform(1, 1000),
+        'margin': random.uniform(1, 100),
+        'created': '2020-11-20T10:00:00.000+02:00',
+        'closed': '2020-11-20T11:00:00.000+02:00',
+        'result': random.uniform(-100, 100),
+        'swap': 0.0,
+        'events': [{'type': 'OPEN', 'price': random.uniform(1, 1000)}]
+    } for _ in range(count)]
+
+
+def make_init_info(instruments: int = 5000) -> dict:
+    return {
+        'customer': {
+            'id': 1,
+            'demoAccounts': [{'id': 1, 'tradingType': 'CFD'}, {'id': 2, 'tradingType': 'EQUITY'}],
+            'liveAccounts': [{'id': 3, 'tradingType': 'EQUITY'}]
+        },
+        'instruments': [{
+            'code': f'INST{i}',
+            'description': f'Instrument {i}',
+            'currency': 'USD',
+            'minTrade': 0.01,
+            'maxOpenQuantity': 10000,
+            'tradable': True,
+            'leverage': '1:5'
+        } for i in range(instruments)]
+    }
+
+
+def get_payloads() -> dict:
+    random.seed(212)
+
+    return {
+        'candles': json.dumps([make_candles(f'INST{i}') for i in range(10)]).encode(),
+        'position': json.dumps(make_positions()).encode(),
+        'init_info': json.dumps(make_init_info()).encode(),
+        'account': json.dumps({'positions': make_positions(50), 'cash': {'free': 1000.0}}).encode()
+    }
+
+
+def make_login_page(size: int = 150000) -> str:
+    filler = '<div class="row"><span class="label">Trade stocks, ETFs and CFDs</span><a href="/en/cfd">CFD</a></div>'
+    script = '<script>window.__config = {"locale": "en", "features": ["a", "b", "c"]};</script>'
+    body = (filler * 8 + script) * max(size // (len(filler) * 8 + len(script)), 1)
+
+    return (
+        '<!DOCTYPE html><html><head><title>Login</title></head><body>'
+        f'{body}'
+        '<form action="/en/authenticate" method="post">'
+        '<input type="email" name="login[username]" value="">'
+        '<input type="password" name="login[password]">'
+        '<input type="hidden" id="login__token" name="login[_token]" value="0123456789abcdef">'
+        '</form></body></html>'
+    )
+
+
+def make_session_page(size: int = 500000) -> str:
+    filler = '<div class="row"><span class="label">Trade stocks, ETFs and CFDs</span><a href="/en/cfd">CFD</a></div>'
+    padding = filler * max(size // (len(filler) * 3), 1)
+
+    return (
+        f'<!DOCTYPE html><html><head></head><body>{padding}'
+        "<script>window.config = {'accountId': '1234567', 'accountType': 'DEMO', "
+        "'accountTradingType': 'CFD', 'currency': 'EUR'};</script>"
+        f'{padding}'
+        '<script src="/assets/app.js?application=WC4&version=5.118.0"></script>'
+        f'{padding}</body></html>'
+    )
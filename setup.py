@@ -26,16 +26,20 @@ if __name__ == '__main__':
             "Issue tracker": "https://github.com/meister245/trading212-web-api/issues",
         },
         packages=[
-            'trading212'
+            'trading212',
+            'trading212.aio'
         ],
         install_requires=[
             'requests',
-            'cachetools',
-            'ratelimit',
             'html5lib',
             'beautifulsoup4',
         ],
         extras_require={
+            'async': ['aiohttp'],
+            'http2': ['httpx[http2]'],
+            'speedups': ['orjson', 'lxml'],
+            'numpy': ['numpy'],
+            'pandas': ['numpy', 'pandas'],
             'dev': ['pytest']
         },
         python_requires='>=3.8',
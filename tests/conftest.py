@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from trading212.limiter import TokenBucket
+from trading212.simulator import Trading212Simulator
+from trading212.transport import TransportConfig
+
+# state of a previously saved demo cfd session, restored without logging in
+SESSION_STATE = {
+    'account_id': '123456', 'account_type': 'demo', 'account_trading_type': 'cfd',
+    'application_name': 'WC4', 'application_version': '5.118.0', 'cookies': []
+}
+
+CASSETTE_DIR = os.path.join(os.path.dirname(__file__), 'cassettes')
+
+# cassettes are matched on the full URL, so recordings are made against a fixed port
+SIMULATOR_PORT = 18212
+
+
+# TRADING212_TRANSPORT: replay (default) from tests/cassettes, record to refresh them against the
+# simulator, or http to run against Trading212 with TRADING212_USERNAME/TRADING212_PASSWORD
+@pytest.fixture(scope='module')
+def live_kwargs(request):
+    backend = os.getenv('TRADING212_TRANSPORT', 'replay')
+
+    if backend == 'http':
+        if not os.getenv('TRADING212_USERNAME'):
+            pytest.skip('set TRADING212_USERNAME and TRADING212_PASSWORD to run against Trading212')
+
+        yield {'username': os.getenv('TRADING212_USERNAME'), 'password': os.getenv('TRADING212_PASSWORD')}
+        return
+
+    cassette = os.path.join(CASSETTE_DIR, f'{request.module.__name__.rpartition(".")[2]}.jsonl')
+    simulator = Trading212Simulator(port=SIMULATOR_PORT)
+
+    kwargs = {
+        'username': 'user',
+        'password': 'pass',
+        'limiter': TokenBucket(rate=1000),
+        'transport': TransportConfig(backend=backend, cassette=cassette),
+        **simulator.get_client_kwargs()
+    }
+
+    if backend == 'record':
+        with simulator:
+            yield kwargs
+
+    else:
+        yield kwargs
+
+
+@pytest.fixture()
+def session_state():
+    return {**SESSION_STATE, 'cookies': []}
@@ -0,0 +1,223 @@
+import json
+import asyncio
+
+import pytest
+
+from trading212.account import AccountState
+from trading212.aio.equity import AsyncTrading212Equity
+from trading212.client import Trading212Client
+from trading212.equity import Trading212Equity
+
+
+def make_account(positions=(), orders=()):
+    return {
+        'positions': [{'positionId': position_id, 'code': 'EURUSD'} for position_id in positions],
+        'equityOrders': [{'orderId': order_id, 'type': 'LIMIT'} for order_id in orders]
+    }
+
+
+class FakeResponse:
+
+    def __init__(self, data):
+        self.content = json.dumps(data).encode()
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture()
+def client(monkeypatch):
+    client = Trading212Client('user', 'pass')
+    client.account = make_account(['p1'], ['o1'])
+    client.requests = []
+
+    def account(session):
+        client.requests.append('account')
+        return client.account
+
+    monkeypatch.setattr(client, 'get_session', lambda: None)
+    monkeypatch.setattr(client, '_account', account)
+
+    return client
+
+
+class TestAccountState:
+
+    def test_update(self):
+        state = AccountState()
+
+        assert state.age == float('inf') and state.lookup('orders', 'o1') is None
+
+        state.update(make_account(['p1', 'p2'], ['o1']))
+
+        assert list(state.positions) == ['p1', 'p2'] and list(state.orders) == ['o1']
+        assert state.age < 1
+
+    def test_partial_update(self):
+        state = AccountState()
+        state.update({**make_account(['p1'], ['o1']), 'cash': {'free': 10}})
+        state.update({'positions': []})
+
+        assert state.positions == {} and list(state.orders) == ['o1']
+        assert state.data['cash'] == {'free': 10}
+
+        state.clear()
+
+        assert state.data == {} and state.orders == {} and state.updated is None
+
+
+class TestClientAccountState:
+
+    def test_lookup_uses_mirror(self, client):
+        assert client.get_position('p1')['code'] == 'EURUSD'
+        assert client.get_order('o1')['type'] == 'LIMIT'
+        assert client.get_account_state()['positions'][0]['positionId'] == 'p1'
+
+        assert client.requests == ['account']
+
+    def test_lookup_refreshes_once(self, client):
+        client.get_account()
+        client.account = make_account(['p1', 'p2'])
+
+        assert client.get_position('p2')['positionId'] == 'p2'
+
+        with pytest.raises(ValueError):
+            client.get_order('o1')
+
+        assert client.requests == ['account', 'account', 'account']
+
+    def test_stale_mirror(self, client):
+        client.get_account()
+        client.account_max_age = 0
+
+        client.get_account_state()
+        client.get_order('o1')
+
+        assert client.requests == ['account', 'account', 'account']
+
+    def test_updated_from_trading_response(self, client, monkeypatch):
+        monkeypatch.setattr(client, 'call_api', lambda session, method, priority='account', **kwargs: FakeResponse(
+            {'account': make_account(['p1', 'p3'])}
+        ))
+
+        client._request(None, 'post', 'url', priority='trading')
+        assert list(client.account_state.positions) == ['p1', 'p3']
+
+        client._request(None, 'get', 'url', priority='account')
+        assert client.get_position('p3') and client.requests == []
+
+    def test_cleared_with_session(self, client):
+        client.get_account()
+        client.clear_session()
+
+        assert client.account_state.updated is None
+
+
+class TestEquityOrders:
+
+    def test_modify_order(self, monkeypatch):
+        monkeypatch.setattr(Trading212Equity, 'get_session', lambda self: None)
+        monkeypatch.setattr(Trading212Equity, 'switch_account', lambda self, **kwargs: None)
+
+        client = Trading212Equity('user', 'pass')
+        client.account_state.update(make_account(orders=['o1']))
+
+        requests = []
+        monkeypatch.setattr(client, '_account', lambda session: requests.append('account'))
+        monkeypatch.setattr(client, '_equity_order_modify', lambda *args, **kwargs: args[1:])
+
+        assert client.get_orders() == [{'orderId': 'o1', 'type': 'LIMIT'}]
+        assert client.modify_order('o1', 5, limit_price=1.5) == ('o1', 5)
+        assert requests == []
+
+    def test_async_modify_order(self, monkeypatch):
+        client = AsyncTrading212Equity('user', 'pass')
+        client.account = make_account(orders=['o1'])
+        requests = []
+
+        async def get_session():
+            return None
+
+        async def account(session):
+            requests.append('account')
+            return client.account
+
+        async def modify(session, order_id, quantity, **kwargs):
+            return order_id, quantity
+
+        monkeypatch.setattr(client, 'get_session', get_session)
+        monkeypatch.setattr(client, '_account', account)
+        monkeypatch.setattr(client, '_equity_order_modify', modify)
+
+        async def run():
+            assert await client.modify_order('o1', 5, limit_price=1.5) == ('o1', 5)
+            assert await client.get_orders() == [{'orderId': 'o1', 'type': 'LIMIT'}]
+
+            with pytest.raises(ValueError):
+                await client.modify_order('o2', 5, limit_price=1.5)
+
+        asyncio.run(run())
+
+        assert requests == ['account', 'account']
+
+
+def make_init_info():
+    return {'customer': {
+        'demoAccounts': [{'id': 1, 'tradingType': 'CFD'}, {'id': 2, 'tradingType': 'EQUITY'}],
+        'liveAccounts': [{'id': 3, 'tradingType': 'EQUITY'}]
+    }}
+
+
+class TestAccountDirectory:
+
+    @pytest.fixture()
+    def client(self, monkeypatch):
+        client = Trading212Client('user', 'pass')
+        client.session = object()
+        client.requests = []
+
+        def init_info(session):
+            client.requests.append('init_info')
+            return make_init_info()
+
+        def switch(session, account_id):
+            client.requests.append(account_id)
+            client.clear_session()
+
+        monkeypatch.setattr(client, 'get_session', lambda: client.session)
+        monkeypatch.setattr(client, '_init_info', init_info)
+        monkeypatch.setattr(client, '_switch', switch)
+
+        return client
+
+    def test_init_info_cached_per_session(self, client):
+        assert client.get_init_info() is client.get_init_info()
+        assert client.get_accounts()['live'] == [{'id': 3, 'tradingType': 'EQUITY'}]
+        assert client.requests == ['init_info']
+
+        client.session = object()
+        client.get_init_info()
+        client.get_init_info(refresh=True)
+
+        assert client.requests == ['init_info'] * 3
+
+    def test_switch_account(self, client):
+        client.switch_account('demo', 'cfd')
+        client.switch_account('live', 'equity')
+        client.switch_account('DEMO', 'EQUITY')
+
+        assert client.requests == ['init_info', 1, 3, 2]
+        assert client.get_account_directory()[('demo', 'cfd')]['id'] == 1
+
+        with pytest.raises(ValueError):
+            client.switch_account('live', 'cfd')
+
+        assert client.requests[4:] == ['init_info']
+
+    def test_session_state(self, client):
+        client.get_account_directory()
+
+        restored = Trading212Client('user', 'pass')
+        restored._set_session_state(client.get_session_state())
+
+        assert restored.account_directory == client.account_directory
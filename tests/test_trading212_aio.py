@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from trading212.aio.client import AsyncTrading212Client
+from trading212.aio.rest import encode_params
+
+
+@pytest.fixture()
+def client(live_kwargs):
+    return AsyncTrading212Client(account='demo', **live_kwargs)
+
+
+def run(client, coroutine):
+    async def wrapper():
+        try:
+            return await coroutine
+
+        finally:
+            await client.close()
+
+    return asyncio.run(wrapper())
+
+
+class TestAsyncClient:
+
+    def test_init(self):
+        client = AsyncTrading212Client('example_user', 'example_pass')
+
+        assert client._account_id is None
+        assert client._account_type == 'demo'
+        assert client.session_manager.session is None
+
+        with pytest.raises(ValueError):
+            AsyncTrading212Client('user', 'pass', account='invalid')
+
+    def test_encode_params(self):
+        assert encode_params({'instrumentCodes': ['BTCUSD', 'LTCUSD'], 'includeOpen': True}) == [
+            ('instrumentCodes', 'BTCUSD'), ('instrumentCodes', 'LTCUSD'), ('includeOpen', 'True')
+        ]
+
+    def test_candles(self, client):
+        data = run(client, client.get_candles(instrument='BTCUSD', period=30, limit=40))
+
+        assert isinstance(data, dict)
+        assert data['request']['instCode'] == 'BTCUSD'
+        assert 'candles' in data and len(data['candles']) == 40
+
+    def test_concurrent_market_price(self, client):
+        async def fetch():
+            return await asyncio.gather(*[
+                client.get_market_price(instrument) for instrument in ('BTCUSD', 'LTCUSD', 'ETHUSD')
+            ])
+
+        for bid, ask in run(client, fetch()):
+            assert list(bid) == ['open', 'high', 'low', 'close'] and \
+                list(ask) == ['open', 'high', 'low', 'close']
+
+    def test_account(self, client):
+        data = run(client, client.get_account())
+
+        assert isinstance(data, dict)
@@ -0,0 +1,133 @@
+import time
+import asyncio
+
+import pytest
+
+from trading212.aio.equity import AsyncTrading212Equity
+from trading212.cfd import Trading212CFD
+from trading212.limiter import TokenBucket
+
+
+@pytest.fixture()
+def client(monkeypatch):
+    monkeypatch.setattr(Trading212CFD, 'get_session', lambda self: None)
+    monkeypatch.setattr(Trading212CFD, 'switch_account', lambda self, **kwargs: None)
+
+    client = Trading212CFD('user', 'pass', limiter=TokenBucket(rate=100))
+    client.account_state.update({
+        'positions': [{'positionId': 'p1'}, {'positionId': 'p2'}],
+        'limitStop': [{'orderId': 'o1'}], 'ifThen': [{'orderId': 'o2'}]
+    })
+    client.requests = []
+
+    def order_open(session, instrument, price, quantity, **kwargs):
+        time.sleep(0.1)
+
+        if instrument == 'BROKEN':
+            raise RuntimeError('rejected')
+
+        client.requests.append((instrument, price, quantity))
+        return {'instrument': instrument}
+
+    monkeypatch.setattr(client, '_account', lambda session: client.account_state.data)
+    monkeypatch.setattr(client, '_order_open', order_open)
+    monkeypatch.setattr(client, '_position_close', lambda session, position_id: position_id)
+    monkeypatch.setattr(client, '_order_delete', lambda session, order_id: order_id)
+
+    return client
+
+
+class TestBulkOrders:
+
+    def test_open_orders(self, client):
+        started = time.monotonic()
+
+        results = client.open_orders([
+            {'direction': 'buy', 'instrument': 'EURUSD', 'price': 1.1, 'quantity': 500},
+            {'direction': 'SELL', 'instrument': 'BROKEN', 'price': 1.1, 'quantity': 500},
+            {'direction': 'sell', 'instrument': 'GBPUSD', 'price': 1.3, 'quantity': 500, 'take_profit': 1.2}
+        ])
+
+        assert time.monotonic() - started < 0.25
+
+        assert [result.key for result in results] == [0, 1, 2]
+        assert results[0].ok and results[0].value == {'instrument': 'EURUSD'}
+        assert isinstance(results[1].error, RuntimeError)
+        assert results[2].ok and results[2].elapsed >= 0.1
+
+        assert sorted(client.requests) == [('EURUSD', 1.1, 500), ('GBPUSD', 1.3, -500)]
+
+    @pytest.mark.parametrize('order', [
+        {'direction': 'hold', 'instrument': 'EURUSD', 'price': 1.1, 'quantity': 500},
+        {'direction': 'buy', 'instrument': 'EURUSD', 'price': 0, 'quantity': 500},
+        {'direction': 'buy', 'instrument': 'EURUSD', 'price': '1.1', 'quantity': 500},
+        {'direction': 'buy', 'instrument': 'EURUSD', 'quantity': 500}
+    ])
+    def test_validated_upfront(self, client, order):
+        valid = {'direction': 'buy', 'instrument': 'EURUSD', 'price': 1.1, 'quantity': 500}
+
+        with pytest.raises(ValueError, match='invalid item - 1'):
+            client.open_orders([valid, order])
+
+        assert client.requests == []
+
+    def test_close_positions_and_cancel_orders(self, client):
+        assert [result.value for result in client.close_positions(['p1', 'p2'])] == ['p1', 'p2']
+        assert [result.value for result in client.cancel_orders(['o2', 'o1'])] == ['o2', 'o1']
+
+        with pytest.raises(ValueError):
+            client.close_positions(['p1', 'p3'])
+
+        with pytest.raises(ValueError):
+            client.cancel_orders(['o1', 'o1'])
+
+        assert client.submit_bulk([]) == []
+
+
+class TestAsyncBulkOrders:
+
+    def test_open_orders(self, monkeypatch):
+        client = AsyncTrading212Equity('user', 'pass', limiter=TokenBucket(rate=100))
+        client.account_state.update({'equityOrders': [{'orderId': 'o1'}]})
+        requests = []
+
+        async def get_session():
+            return None
+
+        async def order_open(session, instrument, quantity, **kwargs):
+            await asyncio.sleep(0.1)
+
+            if instrument == 'BROKEN':
+                raise RuntimeError('rejected')
+
+            requests.append((instrument, quantity, kwargs))
+            return instrument
+
+        async def order_close(session, order_id):
+            return order_id
+
+        monkeypatch.setattr(client, 'get_session', get_session)
+        monkeypatch.setattr(client, '_equity_order_open', order_open)
+        monkeypatch.setattr(client, '_equity_order_close', order_close)
+
+        async def run():
+            with pytest.raises(ValueError):
+                await client.open_orders([{'direction': 'buy', 'instrument': 'AAPL', 'quantity': 1, 'time_valid': 'NOW'}])
+
+            started = time.monotonic()
+
+            results = await client.open_orders([
+                {'direction': 'buy', 'instrument': 'AAPL', 'quantity': 1},
+                {'direction': 'buy', 'instrument': 'BROKEN', 'quantity': 1},
+                {'direction': 'sell', 'instrument': 'MSFT', 'quantity': 2, 'limit_price': 300}
+            ])
+
+            assert time.monotonic() - started < 0.25
+            assert [result.value for result in await client.cancel_orders(['o1'])] == ['o1']
+
+            return results
+
+        results = asyncio.run(run())
+
+        assert [result.ok for result in results] == [True, False, True]
+        assert sorted(requests) == [('AAPL', 1, {}), ('MSFT', -2, {'limit_price': 300})]
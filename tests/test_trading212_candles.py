@@ -0,0 +1,406 @@
+import mmap
+import time
+import asyncio
+
+import pytest
+
+from trading212.aio.client import AsyncTrading212Client
+from trading212.client import Trading212Client
+from trading212.history import CandleHistory
+
+
+def candle_response(payloads):
+    return [{'request': payload, 'candles': []} for payload in payloads]
+
+
+@pytest.fixture()
+def client(monkeypatch):
+    client = Trading212Client('user', 'pass')
+    client.requests = []
+
+    def request(session, method, api_url, **kwargs):
+        client.requests.append(kwargs['json'])
+        return candle_response(kwargs['json'])
+
+    monkeypatch.setattr(client, 'get_session', lambda: None)
+    monkeypatch.setattr(client, '_request', request)
+
+    return client
+
+
+class TestCandlesMany:
+
+    def test_invalid_period(self, client):
+        with pytest.raises(ValueError):
+            client.get_candles_many(['EURUSD'], period=2)
+
+    def test_chunked(self, client):
+        client.candles_chunk_size = 2
+        data = client.get_candles_many(['EURUSD', 'GBPUSD', 'BTCUSD'], period=30, limit=40)
+
+        assert [len(payloads) for payloads in client.requests] == [2, 1]
+        assert list(data) == ['EURUSD', 'GBPUSD', 'BTCUSD']
+
+        for instrument, item in data.items():
+            assert item['request'] == {
+                'instCode': instrument, 'periodType': 'THIRTY_MINUTES',
+                'limit': 40, 'withFakes': False
+            }
+
+    def test_mixed_periods(self, client):
+        data = client.get_candles_many(['EURUSD', ('EURUSD', 1), ('BTCUSD', 1440)])
+
+        assert len(client.requests) == 1
+        assert data['EURUSD']['request']['periodType'] == 'ONE_HOUR'
+        assert data[('EURUSD', 1)]['request']['periodType'] == 'ONE_MINUTE'
+        assert data[('BTCUSD', 1440)]['request']['periodType'] == 'ONE_DAY'
+
+    def test_async_chunked(self, monkeypatch):
+        client = AsyncTrading212Client('user', 'pass')
+        client.candles_chunk_size = 2
+        requests = []
+
+        async def get_session():
+            return None
+
+        async def request(session, method, api_url, **kwargs):
+            requests.append(kwargs['json'])
+            return candle_response(kwargs['json'])
+
+        monkeypatch.setattr(client, 'get_session', get_session)
+        monkeypatch.setattr(client, '_request', request)
+
+        data = asyncio.run(client.get_candles_many(['EURUSD', 'GBPUSD', 'BTCUSD', ('LTCUSD', 5)]))
+
+        assert [len(payloads) for payloads in requests] == [2, 2]
+        assert data[('LTCUSD', 5)]['request']['instCode'] == 'LTCUSD'
+        assert data['GBPUSD']['request']['instCode'] == 'GBPUSD'
+
+
+def make_candles(timestamps, period=60000):
+    return [{
+        'timestamp': timestamp,
+        'bid': {'open': i + 1.0, 'high': i + 2.0, 'low': i + 0.5, 'close': i + 1.5},
+        'ask': {'open': i + 1.1, 'high': i + 2.1, 'low': i + 0.6, 'close': i + 1.6}
+    } for i, timestamp in enumerate(timestamps)]
+
+
+class TestCandleFrame:
+
+    @pytest.fixture()
+    def frame(self):
+        pytest.importorskip('numpy')
+
+        from trading212.frame import CandleFrame
+
+        return CandleFrame.from_response({'candles': make_candles(range(0, 600000, 60000))})
+
+    def test_columns(self, frame):
+        assert len(frame) == 10
+        assert frame['timestamp'][-1] == 540000
+        assert list(frame['bid_open'][:3]) == [1.0, 2.0, 3.0]
+        assert list(frame['ask_close'][:2]) == [1.6, 2.6]
+
+        assert frame['bid_high'].flags['C_CONTIGUOUS']
+        assert frame['bid_high'].base is frame.prices
+
+        with pytest.raises(KeyError):
+            frame.column('volume')
+
+    def test_slicing(self, frame):
+        window = frame[2:5]
+
+        assert len(window) == 3 and list(window.timestamps) == [120000, 180000, 240000]
+        assert window['bid_close'].base is frame.prices
+
+        assert len(frame[-1]) == 1 and frame[-1].timestamps[0] == 540000
+        assert list(frame.between(100000, 240000).timestamps) == [120000, 180000, 240000]
+        assert len(frame.between(end=0)) == 1
+
+    def test_roundtrip(self, frame):
+        assert frame.to_candles() == make_candles(range(0, 600000, 60000))
+
+    def test_empty(self):
+        pytest.importorskip('numpy')
+
+        from trading212.frame import CandleFrame
+
+        assert len(CandleFrame.from_candles([])) == 0
+
+    def test_to_pandas(self, frame):
+        pytest.importorskip('pandas')
+
+        df = frame.to_pandas()
+
+        assert list(df.columns) == list(frame.columns)
+        assert df['bid_open'].iloc[1] == 2.0
+        assert str(df.index[1]) == '1970-01-01 00:01:00+00:00'
+
+    def test_get_candles_as_frame(self, client, monkeypatch):
+        pytest.importorskip('numpy')
+
+        def request(session, method, api_url, **kwargs):
+            return [{'request': kwargs['json'][0], 'candles': make_candles([0, 60000])}]
+
+        monkeypatch.setattr(client, '_request', request)
+
+        frame = client.get_candles('EURUSD', period=1, as_frame=True)
+
+        assert len(frame) == 2 and frame['ask_open'][1] == 2.1
+
+
+class TestResample:
+
+    @pytest.fixture()
+    def frame(self):
+        pytest.importorskip('numpy')
+
+        from trading212.frame import CandleFrame
+
+        return CandleFrame.from_candles(make_candles(range(0, 3600000, 60000)))
+
+    def test_ohlc(self, frame):
+        bars = frame.resample(15)
+
+        assert list(bars.timestamps) == [0, 900000, 1800000, 2700000]
+        assert list(bars['bid_open']) == [1.0, 16.0, 31.0, 46.0]
+        assert list(bars['bid_high']) == [16.0, 31.0, 46.0, 61.0]
+        assert list(bars['bid_low']) == [0.5, 15.5, 30.5, 45.5]
+        assert list(bars['ask_close']) == [15.6, 30.6, 45.6, 60.6]
+
+    def test_gaps(self, frame):
+        window = frame[5:40]
+        bars = window.resample(30)
+
+        assert list(bars.timestamps) == [0, 1800000]
+        assert bars['bid_open'][0] == 6.0 and bars['bid_close'][1] == 40.5
+
+    def test_week_starts_on_monday(self):
+        pytest.importorskip('numpy')
+
+        from trading212.frame import CandleFrame
+
+        day = 86400000
+        frame = CandleFrame.from_candles(make_candles(range(0, 14 * day, day)))
+        bars = frame.resample(10080)
+
+        assert list(bars.timestamps) == [-3 * day, 4 * day, 11 * day]
+        assert list(bars['bid_open']) == [1.0, 5.0, 12.0]
+
+    def test_invalid_period(self, frame):
+        with pytest.raises(ValueError):
+            frame.resample(0)
+
+    def test_get_candles_multi(self, client, monkeypatch):
+        pytest.importorskip('numpy')
+
+        def request(session, method, api_url, **kwargs):
+            client.requests.append(kwargs['json'])
+            return [{'request': kwargs['json'][0], 'candles': make_candles(range(0, 7200000, 60000))}]
+
+        monkeypatch.setattr(client, '_request', request)
+
+        frames = client.get_candles_multi('EURUSD', [1, 15, 60], limit=2)
+
+        assert len(client.requests) == 1
+        assert client.requests[0][0]['periodType'] == 'ONE_MINUTE' and client.requests[0][0]['limit'] == 180
+
+        assert list(frames[1].timestamps) == [7080000, 7140000]
+        assert list(frames[15].timestamps) == [5400000, 6300000]
+        assert list(frames[60].timestamps) == [0, 3600000]
+
+    def test_get_candles_multi_invalid(self, client):
+        with pytest.raises(ValueError):
+            client.get_candles_multi('EURUSD', [1, 0])
+
+        with pytest.raises(ValueError):
+            client.get_candles_multi('EURUSD', [10, 15])
+
+    def test_get_candles_multi_capped(self, client):
+        with pytest.raises(ValueError, match='- 500 - 2$'):
+            client.get_candles_multi('EURUSD', [1, 1440], limit=500)
+
+        assert client.requests == []
+
+        client.candles_max_limit = 100
+        assert client.get_resample_plan([5, 60], 7) == (5, 96)
+
+        with pytest.raises(ValueError):
+            client.get_resample_plan([5, 60], 8)
+
+    def test_get_candles_multi_partial_bucket(self, client, monkeypatch):
+        pytest.importorskip('numpy')
+
+        def request(session, method, api_url, **kwargs):
+            client.requests.append(kwargs['json'])
+            return [{'request': kwargs['json'][0], 'candles': make_candles(range(660000, 7200000, 60000))}]
+
+        monkeypatch.setattr(client, '_request', request)
+
+        frames = client.get_candles_multi('EURUSD', [1, 60], limit=2)
+
+        assert list(frames[60].timestamps) == [3600000]
+        assert frames[60]['bid_open'][0] == 50.0
+
+
+class FakeCandleServer:
+
+    candle_periods = Trading212Client.candle_periods
+
+    def __init__(self, count, period=1):
+        now = int(time.time() * 1000) // 60000 * 60000
+        self.series = make_candles(range(now - (count - 1) * period * 60000, now + 1, period * 60000))
+        self.limits = []
+
+    def add(self, count, period=1):
+        last = self.series[-1]['timestamp']
+        self.series += make_candles(range(last + period * 60000, last + (count + 1) * period * 60000, period * 60000))
+
+    def get_candles(self, instrument, period, limit=500):
+        self.limits.append(limit)
+        return {'request': {'instCode': instrument}, 'candles': self.series[-limit:]}
+
+    def get_candles_many(self, keys, limit=500):
+        self.limits.append(limit)
+        return {key: {'request': {'instCode': key[0]}, 'candles': self.series[-limit:]} for key in keys}
+
+
+class TestCandleHistory:
+
+    def test_initial_and_tail(self):
+        server = FakeCandleServer(1000)
+        history = CandleHistory(server, limit=500)
+
+        assert len(history.update('EURUSD', 1)) == 500
+        assert history.get('EURUSD', 1) == server.series[-500:]
+
+        assert history.update('EURUSD', 1) == []
+        assert server.limits == [500, 2]
+
+    def test_forming_bar_is_replaced(self):
+        server = FakeCandleServer(10)
+        history = CandleHistory(server, limit=500)
+        history.update('EURUSD', 1)
+
+        server.series[-1] = {**server.series[-1], 'bid': {**server.series[-1]['bid'], 'close': 99.0}}
+
+        assert history.update('EURUSD', 1) == [server.series[-1]]
+        assert len(history.get('EURUSD', 1)) == 10
+        assert history.get('EURUSD', 1, limit=1)[0]['bid']['close'] == 99.0
+
+    def test_gap_backfill(self):
+        server = FakeCandleServer(10)
+        history = CandleHistory(server, limit=4, max_backfill=64)
+        history.update('EURUSD', 1)
+
+        server.add(20)
+        history.update('EURUSD', 1)
+
+        assert server.limits == [4, 2, 4, 8, 16, 32]
+        assert history.get('EURUSD', 1) == server.series
+
+    def test_max_size(self):
+        server = FakeCandleServer(10)
+        history = CandleHistory(server, limit=8, max_size=5)
+        history.update('EURUSD', 1)
+
+        assert history.get('EURUSD', 1) == server.series[-5:]
+
+    def test_update_many(self):
+        server = FakeCandleServer(30)
+        history = CandleHistory(server, limit=20)
+
+        results = history.update_many(['EURUSD', ('GBPUSD', 1)], period=1)
+
+        assert list(results) == [('EURUSD', 1), ('GBPUSD', 1)]
+        assert history.get('GBPUSD', 1) == server.series[-20:]
+
+        history.clear('EURUSD')
+
+        assert history.get('EURUSD', 1) == []
+        assert history.last_timestamp('GBPUSD', 1) == server.series[-1]['timestamp']
+
+
+class TestCandleArchive:
+
+    @pytest.fixture()
+    def archive(self, tmp_path):
+        pytest.importorskip('numpy')
+
+        from trading212.archive import CandleArchive
+
+        archive = CandleArchive(str(tmp_path))
+        archive.index_stride = 4
+
+        return archive
+
+    def test_append_and_read(self, archive):
+        np = pytest.importorskip('numpy')
+        candles = make_candles(range(0, 1200000, 60000))
+
+        assert archive.append('EURUSD', 1, candles[:12]) == 12
+        assert archive.append('EURUSD', 1, candles[5:]) == 9
+        assert archive.append('EURUSD', 1, candles[:3]) == 0
+
+        index = archive.get_index('EURUSD', 1)
+
+        assert index['count'] == 20 and index['first'] == 0 and index['last'] == 1140000
+        assert index['sparse'] == [0, 240000, 480000, 720000, 960000]
+
+        records = archive.read('EURUSD', 1)
+
+        assert isinstance(records, np.memmap) and len(records) == 20
+        assert list(records['timestamp']) == [candle['timestamp'] for candle in candles]
+
+        assert list(archive.read('EURUSD', 1, 300000, 540000)['timestamp']) == [300000, 360000, 420000, 480000, 540000]
+        assert list(archive.read('EURUSD', 1, 290000, 310000)['timestamp']) == [300000]
+        assert len(archive.read('EURUSD', 1, 2000000)) == 0
+        assert len(archive.read('GBPUSD', 1)) == 0
+
+    def test_forming_bar_is_overwritten(self, archive):
+        candles = make_candles(range(0, 300000, 60000))
+        archive.append('EURUSD', 1, candles)
+
+        candles[-1]['bid']['close'] = 99.0
+        assert archive.append('EURUSD', 1, candles[-2:]) == 1
+
+        frame = archive.read_frame('EURUSD', 1)
+
+        assert len(frame) == 5 and frame['bid_close'][-1] == 99.0
+        assert frame.to_candles() == candles
+
+    def test_read_frame_is_view(self, archive):
+        archive.append('EURUSD', 1, make_candles(range(0, 600000, 60000)))
+
+        frame = archive.read_frame('EURUSD', 1, 120000, 240000)
+
+        assert list(frame.timestamps) == [120000, 180000, 240000]
+        assert list(frame['ask_open']) == [3.1, 4.1, 5.1]
+
+        for array in (frame.prices, frame.timestamps):
+            while getattr(array, 'base', None) is not None:
+                array = array.base
+
+            assert isinstance(array, mmap.mmap)
+
+    def test_recovers_partial_write(self, archive):
+        archive.append('EURUSD', 1, make_candles(range(0, 180000, 60000)))
+
+        with open(archive.get_filename('EURUSD', 1), 'ab') as f:
+            f.write(b'\0' * 10)
+
+        archive.append('EURUSD', 1, make_candles(range(180000, 240000, 60000)))
+
+        assert list(archive.read('EURUSD', 1)['timestamp']) == [0, 60000, 120000, 180000]
+
+    def test_fetch_path(self, archive, client, monkeypatch):
+        def request(session, method, api_url, **kwargs):
+            return [{'request': kwargs['json'][0], 'candles': make_candles([0, 60000])}]
+
+        monkeypatch.setattr(client, '_request', request)
+        client.candle_archive = archive
+
+        client.get_candles('EURUSD', period=1)
+
+        assert archive.get_index('EURUSD', 1)['count'] == 2
+
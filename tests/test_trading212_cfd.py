@@ -8,13 +8,9 @@ TEST_QUANTITY = os.environ.get('TEST_QUANTITY', 500)
 TEST_INSTRUMENT = os.environ.get('TEST_INSTRUMENT', 'EURUSD')
 
 
-@pytest.fixture(scope='session')
-def client():
-    return Trading212CFD(
-        username=os.environ.get('TRADING212_USERNAME'),
-        password=os.environ.get('TRADING212_PASSWORD'),
-        account='demo'
-    )
+@pytest.fixture(scope='module')
+def client(live_kwargs):
+    return Trading212CFD(account='demo', **live_kwargs)
 
 
 @pytest.fixture()
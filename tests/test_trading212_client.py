@@ -1,4 +1,4 @@
-import os
+from urllib.parse import urlsplit
 
 import pytest
 import requests
@@ -6,13 +6,14 @@ import requests
 from trading212.client import Trading212Client
 
 
-@pytest.fixture(scope='session')
-def client():
-    return Trading212Client(
-        username=os.getenv('TRADING212_USERNAME'),
-        password=os.getenv('TRADING212_PASSWORD'),
-        account='demo'
-    )
+@pytest.fixture(scope='module')
+def client(live_kwargs):
+    return Trading212Client(account='demo', **live_kwargs)
+
+
+@pytest.fixture()
+def rest_url(client):
+    return client.rest_url.format(account_type='demo')
 
 
 @pytest.fixture()
@@ -21,8 +22,7 @@ def cleanup_session(client):
     client.logout()
 
 
-@pytest.mark.usefixtures('cleanup_session')
-class TestClient:
+class TestClientInit:
 
     def test_init(self):
         client = Trading212Client('example_user', 'example_pass')
@@ -36,6 +36,10 @@ class TestClient:
         with pytest.raises(ValueError):
             Trading212Client('user', 'pass', account='invalid')
 
+
+@pytest.mark.usefixtures('cleanup_session')
+class TestClient:
+
     def test_get_session(self, client):
         session = client.get_session()
 
@@ -43,11 +47,13 @@ class TestClient:
         assert session.headers == {
             'Accept-Encoding': 'gzip, deflate',
             'Accept': '*/*',
-            'Connection': 'keep-alive',
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-            'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/85.0.4183.102 Safari/537.36'
+            **client.get_rest_headers()
         }
 
+        assert session.headers['Host'] == urlsplit(client.get_rest_url()).netloc
+        assert session.headers['X-Trader-Client'] == f'application={client._application_name}, ' \
+            f'version={client._application_version}, accountId={client._account_id}'
+
         cookies = session.cookies.get_dict()
 
         assert 'LOGIN_TOKEN' in cookies and \
@@ -62,19 +68,19 @@ class TestClient:
         assert isinstance(client._account_id, str) and \
             client._account_id.isdigit()
 
-    def test_rest_url(self, client):
-        assert client.get_rest_url() == 'https://demo.trading212.com/'
+    def test_rest_url(self, client, rest_url):
+        assert client.get_rest_url() == f'{rest_url}/'
         assert client.get_rest_url(
-            'example') == 'https://demo.trading212.com/example'
+            'example') == f'{rest_url}/example'
         assert client.get_rest_url(
-            '/example') == 'https://demo.trading212.com/example'
+            '/example') == f'{rest_url}/example'
 
-    def test_rest_headers(self, client):
+    def test_rest_headers(self, client, rest_url):
         headers = client.get_rest_headers()
 
-        assert headers['Host'] == 'demo.trading212.com'
-        assert headers['Origin'] == 'https://demo.trading212.com'
-        assert headers['Referer'] == 'https://demo.trading212.com/'
+        assert headers['Host'] == urlsplit(rest_url).netloc
+        assert headers['Origin'] == rest_url
+        assert headers['Referer'] == f'{rest_url}/'
 
         assert 'X-Trader-Client' in headers
 
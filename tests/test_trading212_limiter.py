@@ -0,0 +1,210 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from trading212.aio.client import AsyncTrading212Client
+from trading212.client import Trading212Client
+from trading212.limiter import TokenBucket, get_limiter
+from trading212.scheduler import DeadlineExceeded, QueueFullError, RequestScheduler, get_scheduler
+
+
+class TestTokenBucket:
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_burst_then_throttle(self):
+        limiter = TokenBucket(rate=20, period=1, burst=5)
+
+        assert [limiter.try_acquire() for _ in range(5)] == [0.0] * 5
+
+        wait = limiter.try_acquire()
+        assert 0 < wait <= 0.05
+
+        time.sleep(wait)
+        assert limiter.try_acquire() == 0.0
+        assert limiter.stats()['calls'] == 6
+
+    def test_wait_stats(self):
+        limiter = TokenBucket(rate=10, period=1, burst=1)
+
+        limiter.begin_wait()
+        limiter.begin_wait()
+        assert limiter.queue_depth == 2
+
+        limiter.end_wait(0.1)
+        limiter.end_wait()
+
+        stats = limiter.stats()
+
+        assert stats['queue_depth'] == 0 and stats['waits'] == 1
+        assert stats['wait_time'] == stats['max_wait'] == 0.1
+
+    def test_get_limiter_scope(self):
+        assert get_limiter('account-a') is get_limiter('account-a')
+        assert get_limiter('account-a') is not get_limiter('account-b')
+
+    def test_client_limiter_per_account_type(self):
+        demo, live = Trading212Client('scope', 'pass'), Trading212Client('scope', 'pass', account='live')
+
+        assert demo.limiter is Trading212Client('scope', 'pass').limiter
+        assert demo.limiter is not live.limiter
+        assert AsyncTrading212Client('scope', 'pass', account='live').limiter is live.limiter
+
+
+class TestRequestScheduler:
+
+    def test_invalid_priority(self):
+        with pytest.raises(ValueError):
+            RequestScheduler(TokenBucket()).acquire('invalid')
+
+    def test_priority_order(self):
+        scheduler = RequestScheduler(TokenBucket(rate=20, period=1, burst=1))
+        scheduler.acquire('market_data')
+
+        granted = []
+
+        def worker(lane):
+            scheduler.acquire(lane)
+            granted.append(lane)
+
+        threads = [threading.Thread(target=worker, args=('market_data',)) for _ in range(3)]
+
+        for thread in threads:
+            thread.start()
+
+        time.sleep(0.01)
+        threads.append(threading.Thread(target=worker, args=('trading',)))
+        threads[-1].start()
+
+        for thread in threads:
+            thread.join()
+
+        assert granted.index('trading') <= 1
+        assert scheduler.stats()['market_data']['max_queue_time'] > 0
+
+    def test_priority_order_async(self):
+        scheduler = RequestScheduler(TokenBucket(rate=20, period=1, burst=1))
+        granted = []
+
+        async def worker(lane):
+            await scheduler.acquire_async(lane)
+            granted.append(lane)
+
+        async def run():
+            await asyncio.gather(*[worker(lane) for lane in (
+                'market_data', 'market_data', 'account', 'market_data', 'trading')])
+
+        asyncio.run(run())
+
+        assert granted[:3] == ['market_data', 'trading', 'account']
+
+    def test_bounded_queue(self):
+        scheduler = RequestScheduler(TokenBucket(rate=10, period=1, burst=1), maxsize=1)
+        scheduler.acquire('market_data')
+
+        thread = threading.Thread(target=scheduler.acquire, args=('market_data',))
+        thread.start()
+        time.sleep(0.01)
+
+        with pytest.raises(QueueFullError):
+            scheduler.acquire('market_data')
+
+        thread.join()
+
+        assert scheduler.stats()['market_data']['rejected'] == 1
+
+    def test_bounded_queue_by_default(self):
+        limiter = TokenBucket(rate=1000, period=1, burst=1)
+        scheduler = RequestScheduler(limiter)
+
+        async def run():
+            return await asyncio.gather(
+                *[scheduler.acquire_async('market_data') for _ in range(150)], return_exceptions=True)
+
+        rejected = sum(isinstance(result, QueueFullError) for result in asyncio.run(run()))
+
+        assert scheduler.maxsize == 100
+        assert 0 < rejected <= 50 and scheduler.stats()['market_data']['rejected'] == rejected
+
+    def test_unbounded_queue(self):
+        scheduler = RequestScheduler(TokenBucket(rate=1000, period=1, burst=1), maxsize=None)
+
+        async def run():
+            return await asyncio.gather(*[scheduler.acquire_async('market_data') for _ in range(150)])
+
+        assert len(asyncio.run(run())) == 150
+        assert scheduler.stats()['market_data']['rejected'] == 0
+
+    def test_waits_feed_limiter_stats(self):
+        limiter = TokenBucket(rate=10, period=1, burst=1)
+        scheduler = RequestScheduler(limiter)
+        scheduler.acquire('trading')
+
+        thread = threading.Thread(target=scheduler.acquire, args=('trading',))
+        thread.start()
+        time.sleep(0.02)
+
+        assert limiter.queue_depth == 1
+
+        thread.join()
+        stats = limiter.stats()
+
+        assert stats['calls'] == 2 and stats['waits'] == 1 and stats['queue_depth'] == 0
+        assert stats['wait_time'] == stats['max_wait'] == pytest.approx(0.1, abs=0.03)
+
+    def test_deadline(self):
+        scheduler = RequestScheduler(TokenBucket(rate=2, period=1, burst=1))
+        scheduler.acquire('trading', deadline=time.monotonic() + 1)
+
+        started = time.monotonic()
+
+        with pytest.raises(DeadlineExceeded):
+            scheduler.acquire('trading', deadline=time.monotonic() + 0.1)
+
+        assert time.monotonic() - started < 0.05
+        assert scheduler.acquire('trading', deadline=time.monotonic() + 1) > 0.3
+
+        stats = scheduler.stats()['trading']
+        assert stats['expired'] == 1 and stats['queued'] == 0
+
+    def test_deadline_while_queued_async(self):
+        scheduler = RequestScheduler(TokenBucket(rate=5, period=1, burst=1))
+        scheduler.acquire('trading')
+
+        async def run():
+            first = asyncio.ensure_future(scheduler.acquire_async('trading'))
+            await asyncio.sleep(0)
+
+            with pytest.raises(DeadlineExceeded):
+                await scheduler.acquire_async('account', deadline=time.monotonic() + 0.05)
+
+            await first
+
+        asyncio.run(run())
+
+        assert scheduler.stats()['account'] == {**scheduler.stats()['account'], 'expired': 1, 'queued': 0}
+
+    def test_record(self):
+        scheduler = RequestScheduler(TokenBucket())
+        scheduler.record('trading', 0.25)
+        scheduler.record('trading', 0.5)
+
+        stats = scheduler.stats()['trading']
+
+        assert stats['requests'] == 2 and stats['queued'] == 0
+        assert stats['latency'] == 0.75 and stats['max_latency'] == 0.5
+
+    def test_get_scheduler(self):
+        limiter = TokenBucket()
+
+        assert get_scheduler(limiter) is get_scheduler(limiter)
+        assert get_scheduler(limiter).limiter is limiter
+
+        with pytest.raises(ValueError):
+            get_scheduler(limiter, maxsize=10)
+
+        assert get_scheduler(limiter).maxsize == 100
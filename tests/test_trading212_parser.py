@@ -0,0 +1,101 @@
+import sys
+import subprocess
+
+import pytest
+
+from trading212 import parser
+from trading212.client import Trading212Client
+
+
+def make_login_page(field: str) -> str:
+    return (
+        '<!DOCTYPE html><html><head><title>Login</title></head><body>'
+        '<form action="/en/authenticate" method="post">'
+        '<input type="text" name="login[username]" value="">'
+        f'{field}'
+        '<input type="password" name="login[password]"></form></body></html>'
+    )
+
+
+class TestLoginToken:
+
+    @pytest.mark.parametrize('field', [
+        '<input type="hidden" id="login__token" name="login[_token]" value="abc-123">',
+        "<input value='abc-123' type='hidden' name='login[_token]' />",
+        '<INPUT NAME=login[_token] VALUE=abc-123>',
+    ])
+    def test_scanner(self, field):
+        assert parser.find_login_token(make_login_page(field)) == 'abc-123'
+        assert parser.parse_login_token(make_login_page(field)) == 'abc-123'
+
+    def test_scanner_unescapes_and_ignores_similar_fields(self):
+        page = make_login_page(
+            '<input name="login[_token]x" value="wrong">'
+            '<input data-value="wrong" name="login[_token]" value="a&amp;b">'
+        )
+
+        assert parser.find_login_token(page) == 'a&b'
+
+    def test_fallback(self, monkeypatch):
+        pytest.importorskip('bs4')
+        pytest.importorskip('html5lib')
+
+        page = make_login_page('<input type="hidden" name="login[_token]" value="abc-123">')
+        monkeypatch.setattr(parser, 'login_token_finders', (
+            lambda page: None, parser.find_login_token_lxml, parser.find_login_token_bs4))
+
+        assert parser.parse_login_token(page) == 'abc-123'
+        assert parser.find_login_token_bs4(page) == 'abc-123'
+
+    def test_missing_token(self):
+        with pytest.raises(ValueError):
+            parser.parse_login_token(make_login_page(''))
+
+    def test_optional_modules_not_imported_with_client(self):
+        code = 'import sys, trading212.cfd, trading212.equity; print(sorted({"bs4", "html5lib", "httpx"} & set(sys.modules)))'
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == '[]'
+
+
+def make_session_page(account="'accountId': '1234567', 'accountType': 'DEMO', 'accountTradingType': 'CFD'"):
+    return (
+        f"<html><body><script>window.config = {{{account}}};</script>"
+        '<script src="/assets/app.js?application=WC4&version=5.118.0"></script></body></html>'
+    )
+
+
+class TestSessionMetadata:
+
+    def test_parse(self):
+        assert parser.parse_session_metadata(make_session_page()) == {
+            'account_id': '1234567', 'account_type': 'demo', 'account_trading_type': 'cfd',
+            'application_name': 'WC4', 'application_version': '5.118.0'
+        }
+
+    def test_first_match_wins(self):
+        page = make_session_page() + "<script>{'accountId': '999', 'accountType': 'LIVE'}</script>"
+        metadata = parser.parse_session_metadata(page)
+
+        assert metadata['account_id'] == '1234567' and metadata['account_type'] == 'demo'
+
+    def test_character_classes(self):
+        page = make_session_page("'accountId': '1', 'accountType': 'DE^MO', 'accountTradingType': 'CFD'")
+
+        with pytest.raises(parser.SessionMetadataError, match='missing session metadata - account_type$'):
+            parser.parse_session_metadata(page)
+
+    def test_missing_fields(self):
+        with pytest.raises(ValueError) as e:
+            parser.parse_session_metadata("<script>{'accountId': '1'}</script>")
+
+        assert str(e.value) == ('missing session metadata - account_type, account_trading_type, '
+                                'application_name, application_version')
+
+    def test_client_state(self):
+        client = Trading212Client('user', 'pass', account='live')
+        client._set_session_metadata(make_session_page())
+
+        assert client.get_session_state()['account_id'] == '1234567'
+        assert (client._account_type, client._account_trading_type) == ('demo', 'cfd')
+        assert client.get_rest_url('/rest/v2/account') == 'https://demo.trading212.com/rest/v2/account'
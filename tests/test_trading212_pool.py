@@ -0,0 +1,106 @@
+import time
+import asyncio
+
+import pytest
+
+from trading212.pool import AccountPool, AsyncAccountPool
+
+
+class FakeClient:
+
+    def __init__(self, username, password, account='demo', delay=0.1):
+        self.session_key = f'{username}:{account}:'
+        self.delay = delay
+        self.closed = False
+
+        if password is None:
+            raise ValueError('invalid credentials')
+
+    def get_account(self):
+        time.sleep(self.delay)
+
+        if self.session_key.startswith('broken'):
+            raise RuntimeError('account unavailable')
+
+        return {'id': self.session_key}
+
+    def get_positions(self, start=None, end=None):
+        return [start, end]
+
+
+class FakeAsyncClient(FakeClient):
+
+    async def connect(self):
+        return self
+
+    async def close(self):
+        self.closed = True
+
+    async def get_account(self):
+        await asyncio.sleep(self.delay)
+
+        if self.session_key.startswith('broken'):
+            raise RuntimeError('account unavailable')
+
+        return {'id': self.session_key}
+
+
+class TestAccountPool:
+
+    def test_call_is_concurrent(self):
+        with AccountPool([FakeClient(f'user{i}', 'pass') for i in range(8)]) as pool:
+            started = time.monotonic()
+            results = pool.call('get_account')
+
+            assert time.monotonic() - started < 0.5
+
+        assert len(results) == 8
+        assert results['user3:demo:'].value == {'id': 'user3:demo:'}
+        assert all(result.ok and result.elapsed >= 0.1 for result in results.values())
+
+    def test_errors_are_collected(self):
+        with AccountPool({'a': FakeClient('a', 'pass'), 'b': FakeClient('broken', 'pass')}) as pool:
+            results = pool.call('get_account')
+
+        assert results['a'].ok and results['a'].value == {'id': 'a:demo:'}
+        assert not results['b'].ok and isinstance(results['b'].error, RuntimeError)
+        assert list(AccountPool.get_errors(results)) == ['b']
+
+    def test_arguments_and_keys(self):
+        with AccountPool({'a': FakeClient('a', 'pass'), 'b': FakeClient('b', 'pass')}) as pool:
+            assert pool.call('get_positions', 1, end=2, keys=['b', 'c'])['b'].value == [1, 2]
+            assert list(pool.call(lambda client, suffix: client.session_key + suffix, '!')) == ['a', 'b']
+
+        with pytest.raises(ValueError):
+            pool.add('a', FakeClient('a', 'pass'))
+
+    def test_from_credentials(self):
+        credentials = [{'username': f'user{i}', 'password': 'pass'} for i in range(3)]
+
+        with AccountPool.from_credentials(credentials, client_cls=FakeClient, account='live') as pool:
+            assert list(pool.clients) == ['user0:live:', 'user1:live:', 'user2:live:']
+
+        with pytest.raises(ValueError):
+            AccountPool.from_credentials([{'username': 'user', 'password': None}], client_cls=FakeClient)
+
+
+class TestAsyncAccountPool:
+
+    def test_call_is_concurrent(self):
+        async def run():
+            credentials = [{'username': f'user{i}', 'password': 'pass'} for i in range(7)]
+            credentials.append({'username': 'broken', 'password': 'pass'})
+
+            async with await AsyncAccountPool.from_credentials(credentials, client_cls=FakeAsyncClient) as pool:
+                started = time.monotonic()
+                results = await pool.call('get_account')
+
+                assert time.monotonic() - started < 0.5
+
+            assert all(client.closed for client in pool.clients.values())
+            return results
+
+        results = asyncio.run(run())
+
+        assert len(results) == 8 and results['user6:demo:'].value == {'id': 'user6:demo:'}
+        assert list(AsyncAccountPool.get_errors(results)) == ['broken:demo:']
@@ -0,0 +1,162 @@
+import time
+import asyncio
+
+from trading212.cfd import Trading212CFD
+from trading212.client import Trading212Client
+from trading212.quotes import AsyncQuoteFeed, QuoteFeed
+
+
+def make_candle(price):
+    return {
+        'bid': {'open': price, 'high': price, 'low': price, 'close': price},
+        'ask': {'open': price + 1, 'high': price + 1, 'low': price + 1, 'close': price + 1}
+    }
+
+
+class FakeClient:
+
+    candle_periods = Trading212Client.candle_periods
+
+    def __init__(self):
+        self.prices = {}
+        self.requests = []
+
+    def respond(self, candles):
+        self.requests.append([item['instCode'] for item in candles])
+
+        return {'candles': [
+            {'request': item, 'candles': [make_candle(self.prices[item['instCode']])]}
+            for item in candles
+        ]}
+
+    def batch(self, candles):
+        return self.respond(candles)
+
+
+class FakeAsyncClient(FakeClient):
+
+    async def batch(self, candles):
+        return self.respond(candles)
+
+
+class TestQuoteFeed:
+
+    def test_poll(self):
+        client = FakeClient()
+        client.prices = {'EURUSD': 1, 'GBPUSD': 2, 'BTCUSD': 3}
+
+        feed = QuoteFeed(client, chunk_size=2)
+        feed.subscribe(['EURUSD', 'GBPUSD', 'BTCUSD', 'EURUSD'])
+
+        received = []
+        feed.add_callback(received.append)
+
+        assert [quote.instrument for quote in feed.poll()] == ['EURUSD', 'GBPUSD', 'BTCUSD']
+        assert client.requests == [['EURUSD', 'GBPUSD'], ['BTCUSD']]
+        assert feed.get_quote('EURUSD').ask['open'] == 2
+
+        client.prices['GBPUSD'] = 5
+        feed.poll()
+
+        assert [quote.instrument for quote in received] == ['EURUSD', 'GBPUSD', 'BTCUSD', 'GBPUSD']
+        assert feed.get_quote('GBPUSD').bid['close'] == 5
+
+    def test_max_age(self):
+        client = FakeClient()
+        client.prices = {'EURUSD': 1}
+
+        feed = QuoteFeed(client)
+        feed.subscribe(['EURUSD'])
+        feed.poll()
+
+        assert feed.get_quote('EURUSD', max_age=1) is not None
+        assert feed.get_quote('EURUSD', max_age=0) is None
+        assert feed.get_quote('GBPUSD') is None
+
+        feed.unsubscribe(['EURUSD'])
+        assert feed.get_quote('EURUSD') is None
+
+    def test_background_thread(self):
+        client = FakeClient()
+        client.prices = {'EURUSD': 1}
+
+        feed = QuoteFeed(client, interval=0.01)
+        feed.subscribe(['EURUSD'])
+        feed.start()
+
+        time.sleep(0.05)
+        feed.stop()
+
+        assert not feed.running
+        assert len(client.requests) >= 2
+        assert feed.get_quote('EURUSD') is not None
+
+    def test_client_market_price_from_feed(self):
+        client = Trading212Client('user', 'pass')
+        client.quote_feed = QuoteFeed(FakeClient())
+        client.quote_feed.client.prices = {'EURUSD': 1}
+        client.quote_feed.subscribe(['EURUSD'])
+        client.quote_feed.poll()
+
+        bid, ask = client.get_market_price('EURUSD')
+
+        assert bid['open'] == 1 and ask['open'] == 2
+
+    def test_market_position_price_source(self, monkeypatch):
+        monkeypatch.setattr(Trading212CFD, 'get_session', lambda self: None)
+        monkeypatch.setattr(Trading212CFD, 'switch_account', lambda self, **kwargs: None)
+
+        client = Trading212CFD('user', 'pass')
+        client.quote_feed = QuoteFeed(FakeClient())
+        client.quote_feed.client.prices = {'EURUSD': 1}
+        client.quote_feed.subscribe(['EURUSD'])
+        client.quote_feed.poll()
+
+        requests = []
+
+        def candles(session, instrument, period, **kwargs):
+            requests.append(instrument)
+            return [{'candles': [{**make_candle(10), 'bid': {'open': 9, 'high': 10, 'low': 9, 'close': 10}}]}]
+
+        monkeypatch.setattr(client, '_candles', candles)
+        monkeypatch.setattr(client, '_position_open', lambda session, *args, **kwargs: {'args': args})
+
+        assert client.open_market_position('buy', 'EURUSD', 5) == {'args': ('EURUSD', 2, 5), 'priceSource': 'quote'}
+        assert requests == []
+
+        assert client.open_market_position('sell', 'EURUSD', 5, price=1.5) == \
+            {'args': ('EURUSD', 1.5, -5), 'priceSource': 'caller'}
+        assert requests == []
+
+        client.quote_feed.quotes['EURUSD'] = client.quote_feed.quotes['EURUSD']._replace(timestamp=time.time() - 2)
+
+        assert client.open_market_position('sell', 'EURUSD', 5, max_age=1) == \
+            {'args': ('EURUSD', 10, -5), 'priceSource': 'network'}
+        assert requests == ['EURUSD']
+
+
+class TestAsyncQuoteFeed:
+
+    def test_async_iterator(self):
+        client = FakeAsyncClient()
+        client.prices = {'EURUSD': 1, 'GBPUSD': 2}
+
+        feed = AsyncQuoteFeed(client, interval=0.01)
+        feed.subscribe(['EURUSD', 'GBPUSD'])
+
+        async def run():
+            quotes = []
+            feed.start()
+
+            async for quote in feed:
+                quotes.append(quote.instrument)
+                client.prices[quote.instrument] += 1
+
+                if len(quotes) == 4:
+                    break
+
+            await feed.stop()
+            return quotes
+
+        assert sorted(asyncio.run(run())) == ['EURUSD', 'EURUSD', 'GBPUSD', 'GBPUSD']
+        assert not feed.running
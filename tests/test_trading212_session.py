@@ -0,0 +1,251 @@
+import gc
+import time
+import asyncio
+import threading
+
+import pytest
+
+from trading212.client import Trading212Client
+from trading212.session import AsyncSessionManager, SessionManager
+from trading212.store import MemorySessionStore
+
+
+class Factory:
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            calls = self.calls
+
+        time.sleep(self.delay)
+
+        if self.fail:
+            raise ConnectionError('login failed')
+
+        return f'session-{calls}'
+
+    async def create(self):
+        self.calls += 1
+        calls = self.calls
+
+        await asyncio.sleep(self.delay)
+
+        if self.fail:
+            raise ConnectionError('login failed')
+
+        return f'session-{calls}'
+
+
+class TestSessionManager:
+
+    def test_invalid_margin(self):
+        with pytest.raises(ValueError):
+            SessionManager(Factory(), ttl=10, refresh_margin=10)
+
+    def test_cached(self):
+        factory = Factory()
+        manager = SessionManager(factory, ttl=60, refresh_margin=10)
+
+        assert manager.get() == 'session-1'
+        assert manager.get() == 'session-1'
+        assert factory.calls == 1
+
+    def test_coalesced_refresh(self):
+        factory = Factory(delay=0.05)
+        manager = SessionManager(factory, ttl=60, refresh_margin=10)
+
+        sessions = []
+        threads = [threading.Thread(target=lambda: sessions.append(manager.get())) for _ in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        assert sessions == ['session-1'] * 8
+        assert factory.calls == 1
+
+    def test_background_refresh(self):
+        factory = Factory(delay=0.05)
+        manager = SessionManager(factory, ttl=0.2, refresh_margin=0.15)
+
+        assert manager.get() == 'session-1'
+
+        time.sleep(0.06)
+        assert manager.get() == 'session-1'
+        assert manager.get() == 'session-1'
+
+        time.sleep(0.08)
+        assert manager.get() == 'session-2'
+        assert factory.calls == 2
+
+    def test_background_refresh_failure(self):
+        factory = Factory()
+        manager = SessionManager(factory, ttl=0.2, refresh_margin=0.15, retry_interval=60)
+
+        assert manager.get() == 'session-1'
+
+        factory.fail = True
+        time.sleep(0.06)
+
+        assert manager.get() == 'session-1'
+        time.sleep(0.01)
+        assert manager.get() == 'session-1'
+        assert factory.calls == 2
+
+        time.sleep(0.15)
+
+        with pytest.raises(ConnectionError):
+            manager.get()
+
+    def test_invalidate(self):
+        factory = Factory()
+        manager = SessionManager(factory, ttl=60, refresh_margin=10)
+
+        assert manager.get() == 'session-1'
+
+        manager.invalidate()
+
+        assert manager.session is None
+        assert manager.get() == 'session-2'
+
+    def test_invalidate_during_refresh(self):
+        factory = Factory(delay=0.1)
+        discarded = []
+        manager = SessionManager(factory, ttl=60, refresh_margin=10, on_discard=discarded.append)
+
+        manager.refresh(wait=False)
+        time.sleep(0.02)
+
+        manager.invalidate()
+
+        assert manager.get() == 'session-2'
+        assert manager.session == 'session-2'
+        assert factory.calls == 2
+
+        time.sleep(0.1)
+
+        assert discarded == ['session-1']
+        assert manager.get() == 'session-2'
+
+
+class TestAsyncSessionManager:
+
+    def test_coalesced_refresh(self):
+        factory = Factory(delay=0.02)
+        manager = AsyncSessionManager(factory.create, ttl=60, refresh_margin=10)
+
+        async def run():
+            return await asyncio.gather(*[manager.get() for _ in range(8)])
+
+        assert asyncio.run(run()) == ['session-1'] * 8
+        assert factory.calls == 1
+
+    def test_background_refresh(self):
+        factory = Factory(delay=0.05)
+        manager = AsyncSessionManager(factory.create, ttl=0.2, refresh_margin=0.15)
+
+        async def run():
+            sessions = [await manager.get()]
+
+            await asyncio.sleep(0.06)
+            sessions += [await manager.get(), await manager.get()]
+
+            await asyncio.sleep(0.08)
+            sessions.append(await manager.get())
+
+            return sessions
+
+        assert asyncio.run(run()) == ['session-1', 'session-1', 'session-1', 'session-2']
+        assert factory.calls == 2
+
+    def test_invalidate(self):
+        factory = Factory()
+        manager = AsyncSessionManager(factory.create, ttl=60, refresh_margin=10)
+
+        async def run():
+            first = await manager.get()
+            manager.invalidate()
+
+            return first, await manager.get()
+
+        assert asyncio.run(run()) == ('session-1', 'session-2')
+
+    def test_background_refresh_failure(self):
+        factory = Factory(delay=0.01)
+        manager = AsyncSessionManager(factory.create, ttl=0.2, refresh_margin=0.15, retry_interval=60)
+        errors = []
+
+        async def run():
+            asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+
+            first = await manager.get()
+            factory.fail = True
+
+            await asyncio.sleep(0.06)
+            second = await manager.get()
+
+            await asyncio.sleep(0.03)
+            gc.collect()
+
+            return first, second
+
+        assert asyncio.run(run()) == ('session-1', 'session-1')
+        assert factory.calls == 2 and errors == []
+
+    def test_invalidate_during_refresh(self):
+        factory = Factory(delay=0.02)
+        discarded = []
+        manager = AsyncSessionManager(factory.create, ttl=60, refresh_margin=10, on_discard=discarded.append)
+
+        async def run():
+            pending = asyncio.ensure_future(manager.get())
+            await asyncio.sleep(0)
+
+            manager.invalidate()
+            return await pending, manager.session, await manager.get()
+
+        assert asyncio.run(run()) == ('session-1', None, 'session-2')
+        assert manager.session == 'session-2'
+        assert discarded == ['session-1']
+
+
+class TestClientSession:
+
+    @pytest.fixture()
+    def restored_client(self, session_state):
+        def restored_client(store, username):
+            store.save(f'{username}:demo:', session_state)
+            return Trading212Client(username, 'pass', session_store=store)
+
+        return restored_client
+
+    def test_clear_session_is_per_client(self, restored_client):
+        store = MemorySessionStore()
+        first = restored_client(store, 'first')
+        second = restored_client(store, 'second')
+
+        first_session, second_session = first.get_session(), second.get_session()
+
+        first.clear_session()
+
+        assert first.session_manager.session is None
+        assert second.get_session() is second_session
+        assert store.load('first:demo:') is None
+        assert store.load('second:demo:') is not None
+
+        assert first_session is not second_session
+
+    def test_no_client_limit(self, restored_client):
+        store = MemorySessionStore()
+        clients = [restored_client(store, f'user-{i}') for i in range(200)]
+        sessions = [client.get_session() for client in clients]
+
+        assert all(client.get_session() is session for client, session in zip(clients, sessions))
@@ -0,0 +1,184 @@
+import time
+import asyncio
+
+import aiohttp
+import pytest
+import requests
+
+from trading212.aio.cfd import AsyncTrading212CFD
+from trading212.cassette import Cassette
+from trading212.cfd import Trading212CFD
+from trading212.equity import Trading212Equity
+from trading212.limiter import TokenBucket
+from trading212.pool import AccountPool
+from trading212.scheduler import DeadlineExceeded
+from trading212.simulator import SimulatorConfig, Trading212Simulator
+from trading212.transport import TransportConfig
+
+
+@pytest.fixture()
+def simulator():
+    with Trading212Simulator() as simulator:
+        yield simulator
+
+
+def make_client(cls, simulator, username='user', **kwargs):
+    return cls(username, 'pass', limiter=TokenBucket(rate=1000), **simulator.get_client_kwargs(), **kwargs)
+
+
+class TestSimulator:
+
+    def test_cfd_trading(self, simulator):
+        client = make_client(Trading212CFD, simulator)
+
+        assert (client._account_type, client._account_trading_type) == ('demo', 'cfd')
+        assert client.get_rest_headers()['Host'] == f'127.0.0.1:{simulator.port}'
+
+        data = client.open_market_position('buy', 'EURUSD', 500, limit_distance=0.01, stop_distance=0.02)
+        position = data['account']['positions'].pop()
+
+        assert data['priceSource'] == 'network'
+        assert round(position['limitPrice'] - position['averagePrice'], 2) == 0.01
+        assert client.get_position(position['positionId']) == position
+
+        data = client.modify_position(position['positionId'], take_profit=2.0, stop_loss=0.5, trailing_distance=0.1)
+        assert {key: data['account']['positions'][0][key] for key in ('limitPrice', 'stopPrice', 'trailingStop')} == {
+            'limitPrice': 2.0, 'stopPrice': 0.5, 'trailingStop': 0.1
+        }
+
+        assert client.close_position(position['positionId'])['account']['positions'] == []
+
+        bid, ask = client.get_market_price('EURUSD')
+        order = client.open_limit_order('buy', 'EURUSD', round(ask['open'] * 0.9, 5), 500)['account']['limitStop'][0]
+        assert order['type'] == 'LIMIT'
+
+        data = client.modify_order(order['orderId'], round(ask['open'] * 0.8, 5), 1000, take_profit=2.0)
+        assert data['account']['limitStop'] == [] and data['account']['ifThen'][0]['type'] == 'TRIGGER-LIMIT'
+
+        client.close_order(data['account']['ifThen'][0]['orderId'])
+        client.logout()
+
+        assert simulator.stats()[('logout', 200)] == 1
+
+    def test_equity_switch_and_candles(self, simulator):
+        client = make_client(Trading212Equity, simulator)
+
+        client.open_order('buy', 'AAPL', 2)
+        client.open_order('buy', 'AAPL', 1, limit_price=100, time_valid='GOOD_TILL_CANCEL')
+
+        assert client._account_trading_type == 'equity'
+        assert client.get_account_directory()[('live', 'cfd')]['tradingType'] == 'CFD'
+
+        order = client.get_orders()[0]
+        assert client.modify_order(order['orderId'], 3, limit_price=90)['account']['equityOrders'][0]['quantity'] == 3
+        assert client.cancel_orders([order['orderId']])[0].ok
+
+        candles = client.get_candles_many(['AAPL', ('EURUSD', 5)], 60, limit=10, as_frame=True)
+        assert [len(frame) for frame in candles.values()] == [10, 10]
+        assert client.get_candles('AAPL', 60, limit=2)['candles'][1]['timestamp'] % 3600000 == 0
+
+        with pytest.raises(requests.HTTPError) as e:
+            client.open_order('sell', 'MSFT', 1)
+
+        assert e.value.response.status_code == 400
+
+    def test_live_and_demo_clients(self, simulator):
+        clients = [make_client(Trading212CFD, simulator, account=account) for account in ('live', 'demo')]
+
+        with AccountPool(clients) as pool:
+            assert pool.get_keys() == ['user:live:cfd', 'user:demo:cfd']
+
+    def test_rate_limit(self):
+        with Trading212Simulator(SimulatorConfig(rate_limit=5, rate_period=60)) as simulator:
+            client = make_client(Trading212CFD, simulator)
+            statuses = []
+
+            for _ in range(6):
+                try:
+                    client.get_candles('EURUSD', limit=1)
+                    statuses.append(200)
+
+                except requests.HTTPError as e:
+                    statuses.append(e.response.status_code)
+                    retry_after = e.response.headers['Retry-After']
+
+        assert statuses == [200] * 4 + [429] * 2
+        assert retry_after == '12'
+
+    def test_error_injection_and_latency(self):
+        config = SimulatorConfig(latency=0.02, error_rate=1.0, error_status=500)
+
+        with Trading212Simulator(config) as simulator:
+            with pytest.raises(requests.HTTPError):
+                make_client(Trading212CFD, simulator)
+
+        with Trading212Simulator(SimulatorConfig(latency=0.05)) as simulator:
+            transport = TransportConfig(backoff_factor=0)
+            client = make_client(Trading212CFD, simulator, transport=transport)
+
+            simulator.inject_error('account', status=503, count=2)
+            simulator.inject_error('position_open', status=502)
+
+            started = time.monotonic()
+            assert client.get_account()['positions'] == []
+            assert time.monotonic() - started >= 0.15
+
+            with pytest.raises(requests.HTTPError):
+                client.open_market_position('buy', 'EURUSD', 1, price=1.1)
+
+            assert simulator.stats()[('account', 503)] == 2
+
+            with pytest.raises(ValueError):
+                simulator.inject_error('unknown')
+
+    def test_deadline_covers_quote_fetch(self):
+        with Trading212Simulator(SimulatorConfig(latency=0.1)) as simulator:
+            client = make_client(Trading212CFD, simulator)
+
+            with pytest.raises(DeadlineExceeded):
+                client.open_market_position('buy', 'EURUSD', 1, deadline=0.08)
+
+            assert ('position_open', 200) not in simulator.stats()
+
+            with pytest.raises(requests.Timeout):
+                client.get_candles('EURUSD', limit=1, timeout=0.02)
+
+    def test_unauthorized(self, simulator):
+        response = requests.get(f'{simulator.url}/rest/v2/account')
+        assert response.status_code == 401 and response.json() == {'code': 'Unauthorized'}
+
+    def test_async_client(self, simulator):
+        async def run():
+            async with make_client(AsyncTrading212CFD, simulator, account='live') as client:
+                data = await client.open_market_position('sell', 'EURUSD', 100)
+                return client._account_type, data['account']['positions'][0]['quantity']
+
+        assert asyncio.run(run()) == ('live', -100)
+
+    def test_async_record_and_replay(self, tmp_path):
+        cassette = str(tmp_path / 'async.jsonl')
+
+        async def run(backend, client_kwargs):
+            transport = TransportConfig(backend=backend, cassette=cassette)
+
+            async with AsyncTrading212CFD('user', 'pass', limiter=TokenBucket(rate=1000), transport=transport,
+                                          **client_kwargs) as client:
+                data = await client.open_market_position('buy', 'EURUSD', 100, price=1.1)
+
+                client.candles_chunk_size = 1
+                candles = await client.get_candles_many([f'INSTRUMENT{i}' for i in range(6)], limit=2)
+                assert all(data['request']['instCode'] == key for key, data in candles.items())
+
+                with pytest.raises(aiohttp.ClientResponseError):
+                    await client.close_position('unknown')
+
+                return data['account']['positions'][0]['quantity'], candles
+
+        with Trading212Simulator() as simulator:
+            client_kwargs = simulator.get_client_kwargs()
+            recorded = asyncio.run(run('record', client_kwargs))
+            requests_made = sum(simulator.stats().values())
+
+        assert asyncio.run(run('replay', client_kwargs)) == recorded
+        assert len(Cassette(cassette).load()) == requests_made
+
@@ -0,0 +1,65 @@
+import os
+import stat
+
+import pytest
+
+from trading212.client import Trading212Client
+from trading212.store import FileSessionStore, MemorySessionStore, SessionStore
+
+@pytest.fixture()
+def state(session_state):
+    return {
+        **session_state,
+        'cookies': [{'name': 'LOGIN_TOKEN', 'value': 'token', 'domain': '.trading212.com', 'path': '/'}]
+    }
+
+
+@pytest.fixture(params=['memory', 'file'])
+def store(request, tmp_path):
+    if request.param == 'file':
+        return FileSessionStore(str(tmp_path / 'sessions'))
+
+    return MemorySessionStore()
+
+
+class TestSessionStore:
+
+    def test_abstract(self):
+        class PartialStore(SessionStore):
+            def load(self, key):
+                return None
+
+        with pytest.raises(TypeError):
+            PartialStore()
+
+    def test_roundtrip(self, store, state):
+        assert store.load('user:demo:cfd') is None
+
+        store.save('user:demo:cfd', state)
+        assert store.load('user:demo:cfd') == state
+        assert store.load('user:demo:equity') is None
+
+        store.delete('user:demo:cfd')
+        store.delete('user:demo:cfd')
+        assert store.load('user:demo:cfd') is None
+
+    def test_file_permissions(self, tmp_path, state):
+        store = FileSessionStore(str(tmp_path))
+        store.save('user:demo:cfd', state)
+
+        mode = os.stat(store.get_filename('user:demo:cfd')).st_mode
+        assert stat.S_IMODE(mode) == 0o600
+
+    def test_restore_session(self, store, state):
+        store.save('user:demo:', state)
+        client = Trading212Client('user', 'pass', session_store=store)
+
+        session = client.get_session()
+
+        assert session.cookies.get('LOGIN_TOKEN', domain='.trading212.com') == 'token'
+        assert client._account_id == '123456'
+        assert client._account_trading_type == 'cfd'
+        assert client._application_version == '5.118.0'
+
+        client.clear_session()
+        assert store.load('user:demo:') is None
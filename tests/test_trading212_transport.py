@@ -0,0 +1,356 @@
+import json
+import time
+import asyncio
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode
+
+import aiohttp
+import pytest
+import requests
+
+from trading212.aio.client import AsyncTrading212Client
+from trading212.cassette import Cassette, ReplayError, get_request_key, normalize_body
+from trading212.cfd import Trading212CFD
+from trading212.client import Trading212Client
+from trading212.limiter import TokenBucket
+from trading212.scheduler import DeadlineExceeded
+from trading212.decoder import get_loads
+from trading212.store import MemorySessionStore
+from trading212.transport import TransportConfig, create_session, get_cookie_jar
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+
+    def respond(self):
+        server = self.server
+        server.requests.append((self.command, self.headers.get('Connection')))
+        server.received.append((self.path, self.headers))
+
+        status = server.statuses.pop(0) if server.statuses else 200
+        body = json.dumps({'status': status}).encode()
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', 'CUSTOMER_SESSION=abc; Path=/')
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    server.requests, server.statuses, server.received = [], [], []
+    server.url = f'http://127.0.0.1:{server.server_port}/'
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(cls, **kwargs):
+    return cls('user', 'pass', limiter=TokenBucket(rate=100), **kwargs)
+
+
+class TestTransport:
+
+    def test_adapters(self):
+        session = create_session(TransportConfig(pool_maxsize=7, retries=4))
+        adapter = session.get_adapter('https://demo.trading212.com')
+
+        assert adapter is session.get_adapter('http://127.0.0.1')
+        assert adapter._pool_maxsize == 7
+        assert adapter.max_retries.total == 4
+        assert adapter.max_retries.allowed_methods == frozenset(['GET'])
+
+    def test_get_is_retried(self, server):
+        client = make_client(Trading212Client, transport=TransportConfig(backoff_factor=0))
+        session = create_session(client.transport)
+
+        server.statuses = [503, 503]
+        assert client._request(session, 'get', server.url) == {'status': 200}
+
+        server.statuses = [503]
+
+        with pytest.raises(requests.HTTPError):
+            client._request(session, 'post', server.url)
+
+        assert [method for method, _ in server.requests] == ['GET', 'GET', 'GET', 'POST']
+
+    def test_timeout_and_keep_alive(self):
+        client = make_client(Trading212Client, transport=TransportConfig(timeout=3, keep_alive=False))
+
+        assert client.get_transport_kwargs({'headers': {'Host': 'x'}}) == {
+            'headers': {'Host': 'x', 'Connection': 'close'}, 'timeout': 3
+        }
+        assert client.get_transport_kwargs({'timeout': 1})['timeout'] == 1
+
+    def test_http2_session(self, server):
+        httpx = pytest.importorskip('httpx')
+        pytest.importorskip('h2')
+
+        client = make_client(Trading212Client, transport=TransportConfig(http2=True))
+        session = create_session(client.transport)
+
+        assert isinstance(session, httpx.Client)
+
+        server.statuses = [401]
+
+        with pytest.raises(httpx.HTTPStatusError):
+            client._request(session, 'get', server.url)
+
+        assert client._request(session, 'post', server.url, json={}) == {'status': 200}
+        assert {cookie.name: cookie.value for cookie in get_cookie_jar(session)} == {'CUSTOMER_SESSION': 'abc'}
+
+        session.close()
+
+    def test_async_get_is_retried(self, server):
+        client = make_client(AsyncTrading212Client, transport=TransportConfig(backoff_factor=0, keep_alive=False))
+
+        async def run():
+            session = aiohttp.ClientSession()
+
+            try:
+                server.statuses = [502, 504]
+                assert await client._request(session, 'get', server.url) == {'status': 200}
+
+                server.statuses = [503]
+
+                with pytest.raises(aiohttp.ClientResponseError):
+                    await client._request(session, 'post', server.url)
+
+            finally:
+                await session.close()
+
+        asyncio.run(run())
+
+        assert server.requests == [('GET', 'close')] * 3 + [('POST', 'close')]
+
+    def test_async_rejects_http2(self):
+        with pytest.raises(ValueError):
+            make_client(AsyncTrading212Client, transport=TransportConfig(http2=True))
+
+
+class TestRoutes:
+
+    @pytest.fixture()
+    def restored_client(self, session_state):
+        def restored_client(cls, account='demo', **kwargs):
+            store = MemorySessionStore()
+            store.save(f'user:{account}:', {**session_state, 'account_type': account})
+
+            return make_client(cls, account=account, session_store=store, **kwargs)
+
+        return restored_client
+
+    @staticmethod
+    def use_server(client, server):
+        client._route_urls = {route: server.url + path for route, path in client.routes.items()}
+
+    def test_route_table(self):
+        client = make_client(Trading212Client)
+
+        assert client.get_route_url('account') == 'https://demo.trading212.com/rest/v2/account'
+        assert client.get_route_url('position_close', 'p1') == client.get_rest_url(
+            '/rest/v2/trading/open-positions/close/p1')
+
+        assert all(client.get_route_url(route, 'x').startswith(client.get_rest_url()) for route in client.routes)
+
+    def test_recomputed_on_session_state(self):
+        client = make_client(Trading212Client)
+        headers = client.get_rest_headers()
+        headers['Host'] = 'example.com'
+
+        assert client.get_rest_headers()['Host'] == 'demo.trading212.com'
+        assert headers['X-Trader-Client'] == 'application=None, version=None, accountId=None'
+
+        client._set_session_state({
+            'account_id': '654321', 'account_type': 'live', 'account_trading_type': 'equity',
+            'application_name': 'WC4', 'application_version': '5.118.0'
+        })
+
+        assert client.get_rest_headers()['Host'] == 'live.trading212.com'
+        assert client.get_rest_headers()['X-Trader-Client'] == 'application=WC4, version=5.118.0, accountId=654321'
+        assert client.get_route_url('switch') == 'https://live.trading212.com/rest/v2/account/switch'
+
+    def test_headers_installed_on_session(self, server, restored_client):
+        client = restored_client(Trading212Client, transport=TransportConfig(keep_alive=False))
+        client.get_session()
+        self.use_server(client, server)
+
+        assert client.get_account() == {'status': 200}
+        client._position_close(client.get_session(), 'p1')
+
+        (account_path, headers), (close_path, _) = server.received
+
+        assert (account_path, close_path) == ('/rest/v2/account', '/rest/v2/trading/open-positions/close/p1')
+        assert headers['X-Trader-Client'] == 'application=WC4, version=5.118.0, accountId=123456'
+        assert headers['Host'] == 'demo.trading212.com' and headers['Connection'] == 'close'
+
+    def test_async_headers_installed_on_session(self, server, restored_client):
+        client = restored_client(AsyncTrading212Client)
+
+        async def run():
+            async with client:
+                self.use_server(client, server)
+                return await client.get_notifications()
+
+        assert asyncio.run(run()) == {'status': 200}
+        assert server.received[0][1]['X-Trader-Client'] == 'application=WC4, version=5.118.0, accountId=123456'
+
+
+class TestCassette:
+
+    def test_record_and_replay(self, server, tmp_path):
+        cassette = str(tmp_path / 'cassettes' / 'client.jsonl')
+        client = make_client(Trading212Client, transport=TransportConfig(backend='record', cassette=cassette))
+
+        server.statuses = [404]
+
+        with pytest.raises(requests.HTTPError):
+            client._request(create_session(client.transport), 'get', server.url + 'account?from=1')
+
+        assert client._request(create_session(client.transport), 'get', server.url + 'account?from=1') == {'status': 200}
+        assert client._request(create_session(client.transport), 'post', server.url, json={'a': 1, 'b': 2}) == {
+            'status': 200
+        }
+
+        assert [(item['method'], item['status']) for item in Cassette(cassette).load()] == [
+            ('GET', 404), ('GET', 200), ('POST', 200)
+        ]
+
+        server.shutdown()
+
+        client.transport = TransportConfig(backend='replay', cassette=cassette, replay_latency=0.05)
+        session = create_session(client.transport)
+
+        with pytest.raises(requests.HTTPError):
+            client._request(session, 'get', server.url + 'account?from=1')
+
+        started = time.monotonic()
+
+        assert client._request(session, 'get', server.url + 'account?from=1') == {'status': 200}
+        assert client._request(session, 'get', server.url + 'account?from=1') == {'status': 200}
+        assert client._request(session, 'post', server.url, data='{"b": 2, "a": 1}') == {'status': 200}
+        assert time.monotonic() - started >= 0.15
+
+        assert session.cookies.get('CUSTOMER_SESSION') == '-'
+        assert len(server.requests) == 3
+
+        for method, url, kwargs in (
+                ('get', server.url + 'account?from=2', {}), ('get', server.url + 'account', {}),
+                ('post', server.url, {'json': {'a': 2}}), ('delete', server.url, {})):
+            with pytest.raises(ReplayError):
+                client._request(session, method, url, **kwargs)
+
+    def test_request_key(self):
+        login = {'login[username]': 'user', 'login[password]': 'secret', 'login[_token]': 'abc', 'x': '1'}
+
+        assert normalize_body(urlencode(login)) == 'login%5B_token%5D=-&login%5Bpassword%5D=-&login%5Busername%5D=-&x=1'
+        assert get_request_key('post', 'https://a/b?y=2&x=1', urlencode(login)) == get_request_key(
+            'POST', 'https://a/b?x=1&y=2', urlencode({**login, 'login[password]': 'other'}))
+
+        assert get_request_key('post', 'https://a/b', '{"a": 1}') != get_request_key('post', 'https://a/b', '{"a": 2}')
+
+    def test_invalid_backends(self, tmp_path):
+        with pytest.raises(ValueError):
+            create_session(TransportConfig(backend='replay'))
+
+        with pytest.raises(ValueError):
+            create_session(TransportConfig(backend='socket', cassette=str(tmp_path / 'c.jsonl')))
+
+        with pytest.raises(ValueError):
+            create_session(TransportConfig(backend='record', cassette=str(tmp_path / 'c.jsonl'), http2=True))
+
+        with pytest.raises(ValueError):
+            make_client(AsyncTrading212Client, transport=TransportConfig(backend='replay'))
+
+        with pytest.raises(ValueError):
+            make_client(AsyncTrading212Client, transport=TransportConfig(backend='socket', cassette='c.jsonl'))
+
+
+class TestTimeouts:
+
+    def test_deadline_bounds_connect_timeout(self, server):
+        client = make_client(Trading212Client, transport=TransportConfig(timeout=5))
+        session = requests.Session()
+        timeouts = []
+
+        def request(method, **kwargs):
+            timeouts.append(kwargs['timeout'])
+            return requests.Session.request(session, method, **kwargs)
+
+        session.request = request
+
+        client._request(session, 'get', server.url)
+        client._request(session, 'get', server.url, timeout=1, deadline=0.5)
+
+        assert timeouts[0] == 5
+        assert timeouts[1][1] == 1 and 0.4 < timeouts[1][0] <= 0.5
+
+    def test_trading_deadline_fails_fast(self, monkeypatch):
+        monkeypatch.setattr(Trading212CFD, 'get_session', lambda self: None)
+        monkeypatch.setattr(Trading212CFD, 'switch_account', lambda self, **kwargs: None)
+
+        client = Trading212CFD('user', 'pass', limiter=TokenBucket(rate=1, period=1, burst=1))
+        client.limiter.try_acquire()
+
+        started = time.monotonic()
+
+        with pytest.raises(DeadlineExceeded):
+            client.close_position('p1', deadline=0.2)
+
+        assert time.monotonic() - started < 0.1
+        assert client.scheduler.stats()['trading']['expired'] == 1
+
+    def test_async_deadline(self, server):
+        client = AsyncTrading212Client('user', 'pass', limiter=TokenBucket(rate=1, period=1, burst=1))
+        client.limiter.try_acquire()
+
+        async def run():
+            async with aiohttp.ClientSession() as session:
+                with pytest.raises(DeadlineExceeded):
+                    await client._request(session, 'get', server.url, deadline=0.1)
+
+        asyncio.run(run())
+
+        assert server.requests == []
+
+
+class TestDecoder:
+
+    def test_get_loads(self):
+        assert get_loads('json')(b'{"a": [1, 2.5]}') == {'a': [1, 2.5]}
+
+        with pytest.raises(ValueError):
+            get_loads('yaml')
+
+    def test_orjson(self):
+        pytest.importorskip('orjson')
+
+        assert get_loads() is get_loads('orjson')
+        assert get_loads('orjson')('{"a": "\\u00e9"}'.encode()) == {'a': 'é'}
+
+    def test_client_decoder_hook(self, server):
+        client = make_client(Trading212Client)
+        decoded = []
+
+        def json_loads(data):
+            decoded.append(data)
+            return get_loads('json')(data)
+
+        client.json_loads = json_loads
+
+        assert client._request(requests.Session(), 'get', server.url) == {'status': 200}
+        assert decoded == [b'{"status": 200}']
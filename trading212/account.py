@@ -0,0 +1,42 @@
+import time
+
+
+class AccountState:
+
+    indexes = {
+        'positions': ('positionId', ('positions',)),
+        'orders': ('orderId', ('limitStop', 'ifThen', 'equityOrders'))
+    }
+
+    def __init__(self):
+        self.data = {}
+        self.positions = {}
+        self.orders = {}
+        self.updated = None
+
+    @property
+    def age(self) -> float:
+        return float('inf') if self.updated is None else time.monotonic() - self.updated
+
+    def update(self, data: dict) -> dict:
+        data = {**self.data, **data}
+
+        for index, (id_field, keys) in self.indexes.items():
+            setattr(self, index, {
+                item[id_field]: item
+                for key in keys for item in data.get(key) or () if id_field in item
+            })
+
+        self.data = data
+        self.updated = time.monotonic()
+
+        return data
+
+    def clear(self):
+        self.data = {}
+        self.positions = {}
+        self.orders = {}
+        self.updated = None
+
+    def lookup(self, index: str, key: str):
+        return getattr(self, index).get(key)
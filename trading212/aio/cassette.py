@@ -0,0 +1,115 @@
+import json
+import time
+import asyncio
+
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+import aiohttp
+
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from ..cassette import get_cassette
+
+
+def get_request_body(kwargs):
+    if kwargs.get('json') is not None:
+        return json.dumps(kwargs['json'])
+
+    if isinstance(data := kwargs.get('data'), dict):
+        return urlencode(data)
+
+    return data
+
+
+def get_request_url(url: str, params=None) -> str:
+    return str(URL(url).with_query(params)) if params else url
+
+
+class ReplayResponse:
+
+    def __init__(self, method: str, url: str, interaction: dict):
+        self.method = method.upper()
+        self.url = URL(url)
+        self.status = interaction['status']
+        self.reason = interaction['reason']
+        self.headers = CIMultiDictProxy(CIMultiDict(interaction['headers']))
+
+        self._body = interaction['body'].encode('utf-8', 'surrogateescape')
+
+    @property
+    def cookies(self) -> SimpleCookie:
+        cookies = SimpleCookie()
+
+        for header in self.headers.getall('Set-Cookie', ()):
+            cookies.load(header)
+
+        return cookies
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: str = 'utf-8') -> str:
+        return self._body.decode(encoding)
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                aiohttp.RequestInfo(self.url, self.method, self.headers, self.url), (),
+                status=self.status, message=self.reason, headers=self.headers)
+
+    def release(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+
+class AsyncCassetteTransport:
+
+    def __init__(self, backend: str, cassette: str, latency: float = 0.0):
+        if backend not in ('record', 'replay'):
+            raise ValueError(f'invalid transport backend - {backend}')
+
+        if cassette is None:
+            raise ValueError(f'{backend} transport requires a cassette path')
+
+        self.backend = backend
+        self.cassette = get_cassette(cassette, record=backend == 'record')
+        self.latency = latency
+
+    async def request(self, session, method: str, url: str, **kwargs):
+        request_url, request_body = get_request_url(url, kwargs.get('params')), get_request_body(kwargs)
+
+        if self.backend == 'replay':
+            return await self.replay(session, method, request_url, request_body)
+
+        started = time.monotonic()
+        response = await session.request(method, url, **kwargs)
+
+        try:
+            body = await response.read()
+
+        except BaseException:
+            response.release()
+            raise
+
+        self.cassette.record(
+            method, request_url, request_body, response.status, response.reason,
+            response.headers.items(), body, time.monotonic() - started)
+
+        return response
+
+    async def replay(self, session, method: str, url: str, body=None) -> ReplayResponse:
+        response = ReplayResponse(method, url, self.cassette.play(method, url, body))
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        session.cookie_jar.update_cookies(response.cookies, response.url)
+
+        return response
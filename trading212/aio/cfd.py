@@ -0,0 +1,94 @@
+import time
+
+from functools import partial
+
+from ..cfd import validate_limit_order, validate_position_side
+from .client import AsyncTrading212Client
+
+
+class AsyncTrading212CFD(AsyncTrading212Client):
+
+    trading_type = 'cfd'
+
+    def __init__(self, username, password, account='demo', **kwargs):
+        AsyncTrading212Client.__init__(self, username, password, account, **kwargs)
+
+        self._target_account_type = account
+
+    async def connect(self):
+        await self.get_session()
+
+        if (self._account_type, self._account_trading_type) != \
+                (self._target_account_type.lower(), self.trading_type):
+            await self.switch_account(
+                account_type=self._target_account_type, trading_type=self.trading_type)
+
+        return self
+
+    async def get_positions(self, start: int = None, end: int = None, **kwargs) -> dict:
+        start = int(time.time()) - 60 * 60 * 24 if start is None else start
+        end = int(time.time()) if end is None else end
+
+        return await self._position(await self.get_session(), start=start, end=end, **kwargs)
+
+    async def get_position_history(self, position_id: str, **kwargs) -> dict:
+        return await self._position_history(await self.get_session(), position_id, **kwargs)
+
+    async def open_market_position(self, direction: str, instrument: str, quantity: float,
+                                   price: float = None, max_age: float = None, **kwargs) -> dict:
+        direction = validate_position_side(direction)
+        kwargs = self.start_deadline(kwargs)
+        price_source = 'caller'
+
+        if price is None:
+            bid, ask, price_source = await self.get_market_price_source(
+                instrument, max_age, **self.get_request_options(kwargs))
+            price = ask['close'] if direction == 'buy' else bid['close']
+
+        if direction == 'buy':
+            quantity = abs(quantity)
+
+        if direction == 'sell':
+            quantity = abs(quantity) * -1
+
+        data = await self._position_open(await self.get_session(), instrument, price, quantity, **kwargs)
+        return {**data, 'priceSource': price_source}
+
+    async def open_limit_order(self, direction: str, instrument: str, price: float, quantity: float, **kwargs) -> dict:
+        direction = validate_position_side(direction)
+
+        if direction == 'buy':
+            quantity = abs(quantity)
+
+        if direction == 'sell':
+            quantity = abs(quantity) * -1
+
+        return await self._order_open(await self.get_session(), instrument, price, quantity, **kwargs)
+
+    async def modify_position(self, position_id: str, **kwargs) -> dict:
+        return await self._position_modify(await self.get_session(), position_id, **kwargs)
+
+    async def modify_order(self, order_id: str, price: float, quantity: float, **kwargs) -> dict:
+        return await self._order_modify(await self.get_session(), order_id, price, quantity, **kwargs)
+
+    async def close_position(self, position_id: str, **kwargs) -> dict:
+        return await self._position_close(await self.get_session(), position_id, **kwargs)
+
+    async def close_order(self, order_id: str, **kwargs) -> dict:
+        return await self._order_delete(await self.get_session(), order_id, **kwargs)
+
+    async def open_orders(self, orders: list) -> list:
+        orders = self.validate_bulk(orders, validate_limit_order)
+        return await self.submit_bulk([partial(self.open_limit_order, **order) for order in orders])
+
+    async def close_positions(self, position_ids: list, **kwargs) -> list:
+        kwargs = self.start_deadline(kwargs)
+        await self._validate_account_ids('positions', 'positionId', position_ids)
+        return await self.submit_bulk([
+            partial(self.close_position, position_id, **kwargs) for position_id in position_ids
+        ])
+
+    async def cancel_orders(self, order_ids: list, **kwargs) -> list:
+        kwargs = self.start_deadline(kwargs)
+        await self._validate_account_ids('orders', 'orderId', order_ids)
+        return await self.submit_bulk([partial(self.close_order, order_id, **kwargs) for order_id in order_ids])
@@ -0,0 +1,393 @@
+import time
+import asyncio
+import http.cookies
+
+import aiohttp
+
+from ..limiter import get_limiter
+from ..pool import run_timed_async
+from ..quotes import AsyncQuoteFeed
+from ..rest import validate_account_type
+from ..session import AsyncSessionManager
+from .cassette import AsyncCassetteTransport
+from .rest import AsyncTrading212Rest
+
+
+class AsyncTrading212Client(AsyncTrading212Rest):
+
+    session_ttl = 300
+    session_refresh_margin = 60
+
+    quote_max_age = 5
+    account_max_age = 30
+
+    candles_chunk_size = 50
+
+    bulk_max_workers = 8
+
+    def __init__(self, username, password, account='demo', limiter=None, session_store=None,
+                 connection_limit=None, transport=None, base_url=None, rest_url=None):
+        # demo and live accounts are rate limited separately, so they must not share a bucket
+        if limiter is None:
+            limiter = get_limiter((username, validate_account_type(account)))
+
+        AsyncTrading212Rest.__init__(self, account, limiter, transport, base_url, rest_url)
+
+        if self.transport.http2:
+            raise ValueError('http2 transport is not supported by the async client')
+
+        if self.transport.backend != 'http':
+            self.cassette_transport = AsyncCassetteTransport(
+                self.transport.backend, self.transport.cassette, self.transport.replay_latency)
+
+        self.__username = username
+        self.__password = password
+
+        self.session_store = session_store
+        self.session_key = f'{username}:{self._account_type}:{getattr(self, "trading_type", "")}'
+
+        self._restored_session = None
+
+        self._connection_limit = self.transport.pool_maxsize if connection_limit is None else connection_limit
+        self._connector = None
+        self._retired_sessions = []
+
+        self.session_manager = AsyncSessionManager(
+            self._create_session, ttl=self.session_ttl, refresh_margin=self.session_refresh_margin,
+            on_discard=self._retire_session)
+
+        self.quote_feed = None
+
+    async def __aenter__(self):
+        try:
+            return await self.connect()
+
+        except Exception:
+            await self.close()
+            raise
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def connect(self):
+        await self.get_session()
+        return self
+
+    async def close(self):
+        await self.unsubscribe_quotes()
+
+        self._retire_session(self.session_manager.session)
+        self.session_manager.invalidate()
+
+        await self._close_retired_sessions()
+
+        if self._connector is not None:
+            await self._connector.close()
+
+        self._connector = None
+
+    def _retire_session(self, session):
+        if session is not None:
+            self._retired_sessions.append((time.monotonic(), session))
+
+    async def _close_retired_sessions(self, max_age: float = 0):
+        now = time.monotonic()
+
+        while self._retired_sessions and now - self._retired_sessions[0][0] >= max_age:
+            await self._retired_sessions.pop(0)[1].close()
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        return await self.session_manager.get()
+
+    async def _create_session(self) -> aiohttp.ClientSession:
+        generation = self.session_manager.generation
+
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=self._connection_limit,
+                **({'keepalive_timeout': self.transport.keep_alive_timeout}
+                   if self.transport.keep_alive else {'force_close': True})
+            )
+
+        session = aiohttp.ClientSession(
+            connector=self._connector,
+            connector_owner=False,
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+            headers={
+                'Accept-Encoding': 'gzip, deflate',
+                'Accept': '*/*',
+                'Connection': 'keep-alive' if self.transport.keep_alive else 'close',
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+                'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/85.0.4183.102 Safari/537.36'
+            }
+        )
+
+        if self.session_manager.session is not None or not self._restore_session(session):
+            try:
+                await self._authenticate(session, self.__username, self.__password)
+                html = await self._account_session(session)
+
+            except Exception:
+                await session.close()
+                raise
+
+            # a login that raced with clear_session must not overwrite the state of its replacement
+            if generation == self.session_manager.generation:
+                self._set_session_metadata(html)
+                self._save_session(session)
+
+        await self._close_retired_sessions(self.session_refresh_margin)
+        self._retire_session(self.session_manager.session)
+
+        return self.install_rest_headers(session)
+
+    def _restore_session(self, session) -> bool:
+        if self.session_store is None:
+            return False
+
+        if not (state := self.session_store.load(self.session_key)):
+            return False
+
+        cookies = http.cookies.SimpleCookie()
+
+        for cookie in state['cookies']:
+            cookies[cookie['name']] = cookie['value']
+            cookies[cookie['name']]['domain'] = cookie['domain']
+            cookies[cookie['name']]['path'] = cookie['path']
+
+        session.cookie_jar.update_cookies(cookies)
+
+        self._set_session_state(state)
+        self._restored_session = session
+
+        return True
+
+    def _save_session(self, session):
+        if self.session_store is None:
+            return
+
+        self.session_store.save(self.session_key, {
+            **self.get_session_state(),
+            'cookies': [
+                {'name': c.key, 'value': c.value, 'domain': c['domain'], 'path': c['path']}
+                for c in session.cookie_jar
+            ]
+        })
+
+    def clear_session(self):
+        self._retire_session(self.session_manager.session)
+        self.session_manager.invalidate()
+        self.account_state.clear()
+        self.clear_init_info()
+
+        if self.session_store is not None:
+            self.session_store.delete(self.session_key)
+
+    async def _request(self, session, method, api_url, text=False, **kwargs):
+        kwargs = self.start_deadline(kwargs)
+
+        try:
+            return await AsyncTrading212Rest._request(self, session, method, api_url, text=text, **kwargs)
+
+        except aiohttp.ClientResponseError as e:
+            if session is not self._restored_session or e.status not in (401, 403):
+                raise
+
+        self._restored_session = None
+        self.clear_session()
+        session = await self.get_session()
+
+        return await AsyncTrading212Rest._request(self, session, method, api_url, text=text, **kwargs)
+
+    async def batch(self, **kwargs) -> dict:
+        if len(kwargs) == 1:
+            if kwargs.get('candles', False):
+                return await self._batch_rest(await self.get_session(), **kwargs)
+
+        if len(kwargs) <= 2:
+            if kwargs.get('highLow', False) or \
+                    kwargs.get('deviations', False):
+
+                return await self._batch_v2(await self.get_session(), **kwargs)
+
+        return {}
+
+    async def get_init_info(self, refresh: bool = False, **kwargs) -> dict:
+        session = await self.get_session()
+        init_info = None if refresh else self._get_cached_init_info(session)
+
+        if init_info is None:
+            init_info = self._cache_init_info(session, await self._init_info(session, **kwargs))
+
+        return init_info
+
+    async def get_accounts(self) -> dict:
+        init_info = await self.get_init_info()
+
+        return {
+            'demo': init_info['customer']['demoAccounts'],
+            'live': init_info['customer']['liveAccounts']
+        }
+
+    async def get_account_directory(self, refresh: bool = False) -> dict:
+        if refresh or not self.account_directory:
+            await self.get_init_info(refresh=refresh)
+
+        return self.account_directory
+
+    async def get_instrument_settings(self, instrument: list, **kwargs) -> list:
+        return await self._instrument_settings(await self.get_session(), instrument, **kwargs)
+
+    async def get_candles(self, instrument: str, period: int = 60, as_frame: bool = False, **kwargs):
+        data = (await self._candles(await self.get_session(), instrument, period, **kwargs))[0]
+        self._archive_candles(instrument, period, data)
+
+        return self.get_candle_frame(data) if as_frame else data
+
+    async def get_candles_many(self, instruments: list, period: int = 60, as_frame: bool = False,
+                               **kwargs) -> dict:
+        payloads = self.get_candle_payloads(instruments, period, **kwargs)
+        keys, session = list(payloads), await self.get_session()
+        options = self.start_deadline(self.get_request_options(kwargs))
+
+        chunks = [keys[i:i + self.candles_chunk_size] for i in range(0, len(keys), self.candles_chunk_size)]
+        data = await asyncio.gather(*[
+            self._candles_many(session, [payloads[key] for key in chunk], **options) for chunk in chunks
+        ])
+
+        results = {key: item for chunk, items in zip(chunks, data) for key, item in zip(chunk, items)}
+
+        for key, data in results.items():
+            self._archive_candles(*((key, period) if isinstance(key, str) else key), data)
+
+        if as_frame:
+            return {key: self.get_candle_frame(data) for key, data in results.items()}
+
+        return results
+
+    async def get_candles_multi(self, instrument: str, periods: list, limit: int = 500,
+                                base_period: int = None) -> dict:
+        base_period, fetch_limit = self.get_resample_plan(periods, limit, base_period)
+        frame = await self.get_candles(instrument, base_period, as_frame=True, limit=fetch_limit)
+
+        return self.resample_frame(frame, base_period, periods, limit)
+
+    async def get_market_price(self, instrument: str, max_age: float = None, **kwargs) -> tuple:
+        bid, ask, _ = await self.get_market_price_source(instrument, max_age, **kwargs)
+        return bid, ask
+
+    async def get_market_price_source(self, instrument: str, max_age: float = None, **kwargs) -> tuple:
+        if quote := self.get_quote(instrument, max_age):
+            return quote.bid, quote.ask, 'quote'
+
+        data = (await self._candles(await self.get_session(), instrument, 5, limit=1, **self.get_request_options(kwargs)))[0]
+        return data['candles'][0]['bid'], data['candles'][0]['ask'], 'network'
+
+    def subscribe_quotes(self, instruments: list, callback=None, interval: float = 1.0) -> AsyncQuoteFeed:
+        if self.quote_feed is None:
+            self.quote_feed = AsyncQuoteFeed(self, interval=interval)
+
+        self.quote_feed.subscribe(instruments)
+
+        if callback is not None:
+            self.quote_feed.add_callback(callback)
+
+        self.quote_feed.start()
+        return self.quote_feed
+
+    async def unsubscribe_quotes(self, instruments: list = None):
+        if self.quote_feed is None:
+            return
+
+        if instruments is None:
+            await self.quote_feed.stop()
+            self.quote_feed = None
+
+        else:
+            self.quote_feed.unsubscribe(instruments)
+
+    def get_quote(self, instrument: str, max_age: float = None):
+        if self.quote_feed is None:
+            return None
+
+        return self.quote_feed.get_quote(
+            instrument, self.quote_max_age if max_age is None else max_age)
+
+    async def get_notifications(self, **kwargs) -> dict:
+        return await self._notifications(await self.get_session(), **kwargs)
+
+    async def get_price_increments(self, instrument_codes: list, **kwargs) -> dict:
+        return await self._price_increments(await self.get_session(), instrument_codes, **kwargs)
+
+    async def get_price_alerts(self, **kwargs) -> dict:
+        return await self._price_alerts(await self.get_session(), **kwargs)
+
+    async def get_account(self, **kwargs) -> dict:
+        data = await self._account(await self.get_session(), **kwargs)
+        self.account_state.update(data)
+
+        return data
+
+    async def get_account_state(self, max_age: float = None, **kwargs) -> dict:
+        max_age = self.account_max_age if max_age is None else max_age
+
+        if self.account_state.age > max_age:
+            await self.get_account(**kwargs)
+
+        return self.account_state.data
+
+    async def get_position(self, position_id: str, **kwargs) -> dict:
+        return await self._lookup_account('positions', 'positionId', position_id, **kwargs)
+
+    async def get_order(self, order_id: str, **kwargs) -> dict:
+        return await self._lookup_account('orders', 'orderId', order_id, **kwargs)
+
+    async def _validate_account_ids(self, index, id_field, keys):
+        if len(set(keys)) != len(keys):
+            raise ValueError(f'duplicate {id_field} - {keys}')
+
+        for key in keys:
+            await self._lookup_account(index, id_field, key)
+
+    async def submit_bulk(self, calls: list) -> list:
+        semaphore = asyncio.Semaphore(self.bulk_max_workers)
+
+        async def run(i, call):
+            async with semaphore:
+                return await run_timed_async(i, call)
+
+        return list(await asyncio.gather(*(run(i, call) for i, call in enumerate(calls))))
+
+    async def _lookup_account(self, index, id_field, key, **kwargs):
+        kwargs = self.start_deadline(self.get_request_options(kwargs))
+        refreshed = self.account_state.age > self.account_max_age
+
+        if refreshed:
+            await self.get_account(**kwargs)
+
+        item = self.account_state.lookup(index, key)
+
+        if item is None and not refreshed:
+            await self.get_account(**kwargs)
+            item = self.account_state.lookup(index, key)
+
+        if item is None:
+            raise ValueError(f'{id_field} not found - {key}')
+
+        return item
+
+    async def logout(self):
+        return await self._logout(await self.get_session())
+
+    async def switch_account(self, account_type='demo', trading_type='equity') -> dict:
+        key = (account_type.lower(), trading_type.lower())
+        account = (await self.get_account_directory()).get(key)
+
+        if account is None:
+            account = (await self.get_account_directory(refresh=True)).get(key)
+
+        if account is None:
+            raise ValueError(
+                f'account not found - {account_type} - {trading_type}')
+
+        return await self._switch(await self.get_session(), account['id'])
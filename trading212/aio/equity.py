@@ -0,0 +1,80 @@
+from functools import partial
+
+from ..equity import validate_order, validate_order_side
+from .client import AsyncTrading212Client
+
+
+class AsyncTrading212Equity(AsyncTrading212Client):
+
+    trading_type = 'equity'
+
+    def __init__(self, username, password, account='demo', **kwargs):
+        AsyncTrading212Client.__init__(self, username, password, account, **kwargs)
+
+        self._target_account_type = account
+
+    async def connect(self):
+        await self.get_session()
+
+        if (self._account_type, self._account_trading_type) != \
+                (self._target_account_type.lower(), self.trading_type):
+            await self.switch_account(
+                account_type=self._target_account_type, trading_type=self.trading_type)
+
+        return self
+
+    async def get_orders(self):
+        return (await self.get_account_state()).get('equityOrders')
+
+    async def open_order(self, direction, instrument: str, quantity: float, **kwargs) -> dict:
+        direction = validate_order_side(direction)
+
+        if direction == 'buy':
+            quantity = abs(quantity)
+
+        elif direction == 'sell':
+            quantity = abs(quantity) * -1
+
+        return await self._equity_order_open(await self.get_session(), instrument, quantity, **kwargs)
+
+    async def modify_order(self, order_id: str, quantity, **kwargs) -> dict:
+        kwargs = self.start_deadline(kwargs)
+        order = await self.get_order(order_id, **self.get_request_options(kwargs))
+        limit_price = kwargs.get('limit_price', False)
+        stop_price = kwargs.get('stop_price', False)
+
+        if order['type'] == 'LIMIT' and limit_price:
+            return await self._equity_order_modify(
+                await self.get_session(), order_id, quantity,
+                limit_price=limit_price,
+                **self.get_request_options(kwargs)
+            )
+
+        if order['type'] == 'STOP' and stop_price:
+            return await self._equity_order_modify(
+                await self.get_session(), order_id, quantity,
+                stop_price=stop_price,
+                **self.get_request_options(kwargs)
+            )
+
+        if order['type'] == 'STOP_LIMIT' and limit_price and stop_price:
+            return await self._equity_order_modify(
+                await self.get_session(), order_id, quantity,
+                limit_price=limit_price,
+                stop_price=stop_price,
+                **self.get_request_options(kwargs)
+            )
+
+        raise ValueError('invalid request')
+
+    async def close_order(self, order_id: str, **kwargs) -> dict:
+        return await self._equity_order_close(await self.get_session(), order_id, **kwargs)
+
+    async def open_orders(self, orders: list) -> list:
+        orders = self.validate_bulk(orders, validate_order)
+        return await self.submit_bulk([partial(self.open_order, **order) for order in orders])
+
+    async def cancel_orders(self, order_ids: list, **kwargs) -> list:
+        kwargs = self.start_deadline(kwargs)
+        await self._validate_account_ids('orders', 'orderId', order_ids)
+        return await self.submit_bulk([partial(self.close_order, order_id, **kwargs) for order_id in order_ids])
@@ -0,0 +1,97 @@
+import time
+import asyncio
+
+import aiohttp
+
+from ..rest import Trading212Rest
+from ..scheduler import get_remaining
+
+
+def encode_params(params):
+    items = []
+
+    for key, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        items.extend((key, str(v)) for v in values)
+
+    return items
+
+
+class AsyncTrading212Rest(Trading212Rest):
+
+    cassette_transport = None
+
+    async def call_api(self, session, method, priority='account', deadline=None, **kwargs):
+        kwargs = self.get_transport_kwargs(kwargs)
+        await self.scheduler.acquire_async(priority, deadline)
+
+        if params := kwargs.pop('params', None):
+            kwargs['params'] = encode_params(params)
+
+        if not isinstance(kwargs['timeout'], aiohttp.ClientTimeout):
+            kwargs['timeout'] = aiohttp.ClientTimeout(
+                total=kwargs['timeout'], connect=None if deadline is None else get_remaining(deadline))
+
+        if self.cassette_transport is not None:
+            return await self.cassette_transport.request(session, method.upper(), **kwargs)
+
+        return await session.request(method.upper(), **kwargs)
+
+    async def _request(self, session, method, api_url, text=False, priority='account', deadline=None, **kwargs):
+        retries = self.transport.retries if method == 'get' else 0
+        deadline = self.get_deadline(deadline)
+
+        for attempt in range(retries + 1):
+            started = time.monotonic()
+
+            try:
+                async with await self.call_api(
+                        session, method, priority=priority, deadline=deadline, url=api_url, **kwargs) as r:
+                    if r.status not in self.transport.retry_statuses or attempt == retries:
+                        r.raise_for_status()
+
+                        if text:
+                            return await r.text()
+
+                        return self._update_account_state(priority, self.json_loads(await r.read()))
+
+            except aiohttp.ClientConnectionError:
+                if attempt == retries:
+                    raise
+
+            finally:
+                self.scheduler.record(priority, time.monotonic() - started)
+
+            await asyncio.sleep(self.transport.backoff_factor * 2 ** attempt)
+
+    async def _account_session(self, session):
+        cookies = {cookie.key: cookie.value for cookie in session.cookie_jar}
+        form_data = self.get_account_session_form(cookies)
+
+        headers = {
+            **self.get_generic_headers(),
+            'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8'
+        }
+
+        return await self._request(
+            session, 'post', self.get_rest_url(),
+            text=True,
+            data=form_data,
+            headers=headers
+        )
+
+    async def _authenticate(self, session, username, password):
+        api_url = self.base_url + '/en/authenticate'
+        token = await self._get_login_token(session)
+
+        return await self._request(
+            session, 'post', api_url,
+            data=self.get_login_form(username, password, token),
+            headers=self.get_login_headers()
+        )
+
+    async def _get_login_token(self, session):
+        api_url = self.base_url + '/en/login'
+
+        return self.parse_login_token(
+            await self._request(session, 'get', api_url, text=True))
@@ -0,0 +1,121 @@
+import os
+import re
+import json
+import bisect
+import threading
+
+import numpy as np
+
+from .frame import CandleFrame
+
+RECORD_DTYPE = np.dtype(
+    [('timestamp', '<i8')] + [(column, '<f8') for column in CandleFrame.columns])
+
+
+class CandleArchive:
+
+    index_stride = 4096
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        os.makedirs(self.path, exist_ok=True)
+
+        self._lock = threading.Lock()
+
+    def get_filename(self, instrument: str, period: int) -> str:
+        return os.path.join(self.path, re.sub(r'[^A-Za-z0-9_.-]', '_', instrument), f'{period}.bin')
+
+    def get_index(self, instrument: str, period: int) -> dict:
+        try:
+            with open(self.get_filename(instrument, period) + '.json', 'r') as f:
+                return json.load(f)
+
+        except FileNotFoundError:
+            return {'count': 0, 'first': None, 'last': None, 'sparse': []}
+
+    def _save_index(self, filename, index):
+        with open(filename + '.json.tmp', 'w') as f:
+            json.dump(index, f)
+
+        os.replace(filename + '.json.tmp', filename + '.json')
+
+    @staticmethod
+    def to_records(candles: list) -> np.ndarray:
+        frame = CandleFrame.from_candles(candles)
+        records = np.empty(len(frame), dtype=RECORD_DTYPE)
+
+        records['timestamp'] = frame.timestamps
+
+        for i, column in enumerate(frame.columns):
+            records[column] = frame.prices[i]
+
+        records.sort(order='timestamp', kind='stable')
+        _, last = np.unique(records['timestamp'][::-1], return_index=True)
+
+        return records[len(records) - 1 - last]
+
+    def append(self, instrument: str, period: int, candles: list) -> int:
+        records = self.to_records(candles)
+        filename = self.get_filename(instrument, period)
+
+        with self._lock:
+            index = self.get_index(instrument, period)
+            count = index['count']
+
+            if count:
+                records = records[records['timestamp'] >= index['last']]
+
+            if not len(records):
+                return 0
+
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+            with open(filename, 'r+b' if os.path.exists(filename) else 'w+b') as f:
+                if count and records['timestamp'][0] == index['last']:
+                    count -= 1
+
+                f.truncate(count * RECORD_DTYPE.itemsize)
+                f.seek(count * RECORD_DTYPE.itemsize)
+                f.write(records.tobytes())
+
+            timestamps = records['timestamp']
+            sparse = index['sparse']
+
+            for position in range(len(sparse) * self.index_stride, count + len(records), self.index_stride):
+                sparse.append(int(timestamps[position - count]))
+
+            self._save_index(filename, {
+                'count': count + len(records),
+                'first': index['first'] if index['count'] else int(timestamps[0]),
+                'last': int(timestamps[-1]),
+                'sparse': sparse
+            })
+
+        return len(records)
+
+    def _search(self, timestamps, sparse, value, side):
+        block = max(bisect.bisect_left(sparse, value) - 1, 0)
+        lo = block * self.index_stride
+        hi = min(lo + 2 * self.index_stride, len(timestamps))
+
+        return lo + int(np.searchsorted(timestamps[lo:hi], value, side=side))
+
+    def read(self, instrument: str, period: int, start: int = None, end: int = None) -> np.ndarray:
+        index = self.get_index(instrument, period)
+
+        if not index['count']:
+            return np.empty(0, dtype=RECORD_DTYPE)
+
+        records = np.memmap(
+            self.get_filename(instrument, period), dtype=RECORD_DTYPE, mode='r', shape=(index['count'],))
+
+        lo = 0 if start is None else self._search(records['timestamp'], index['sparse'], start, 'left')
+        hi = len(records) if end is None else self._search(records['timestamp'], index['sparse'], end, 'right')
+
+        return records[lo:max(lo, hi)]
+
+    def read_frame(self, instrument: str, period: int, start: int = None, end: int = None) -> CandleFrame:
+        records = self.read(instrument, period, start, end)
+        prices = records.view(np.float64).reshape(-1, len(RECORD_DTYPE.names))[:, 1:].T
+
+        return CandleFrame(records['timestamp'], prices)
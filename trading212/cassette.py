@@ -0,0 +1,203 @@
+import io
+import os
+import json
+import time
+import hashlib
+import threading
+import http.client
+
+from urllib.parse import parse_qsl, urlencode
+
+import requests
+
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+SKIPPED_HEADERS = frozenset(['content-encoding', 'content-length', 'transfer-encoding'])
+
+REDACTED_FIELDS = frozenset([
+    'login[username]', 'login[password]', 'login[_token]',
+    'login[twoFactorAuthCode]', 'login[twoFactorBackupCode]',
+    'rememberMeCookie', 'sessionCookie', 'customerSessionCookie', 'rand'
+])
+
+
+class ReplayError(requests.ConnectionError):
+    pass
+
+
+def normalize_query(url: str) -> str:
+    return urlencode(sorted(parse_qsl(url.partition('?')[2], keep_blank_values=True)))
+
+
+def normalize_body(body) -> str:
+    if not body:
+        return ''
+
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', 'surrogateescape')
+
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(',', ':'))
+
+    except ValueError:
+        pass
+
+    if fields := parse_qsl(body, keep_blank_values=True):
+        return urlencode(sorted((name, '-' if name in REDACTED_FIELDS else value) for name, value in fields))
+
+    return body
+
+
+def sanitize_header(name: str, value: str) -> str:
+    if name.lower() != 'set-cookie':
+        return value
+
+    cookie, separator, attributes = value.partition(';')
+    return f'{cookie.partition("=")[0]}=-{separator}{attributes}'
+
+
+def get_request_key(method: str, url: str, body=None) -> str:
+    request = [method.upper(), url.partition('?')[0], normalize_query(url), normalize_body(body)]
+    return hashlib.sha256(json.dumps(request).encode()).hexdigest()
+
+
+class RecordedMessage:
+
+    def __init__(self, headers: list):
+        self.msg = http.client.HTTPMessage()
+
+        for name, value in headers:
+            self.msg[name] = value
+
+    @staticmethod
+    def isclosed() -> bool:
+        return True
+
+    def close(self):
+        pass
+
+
+class Cassette:
+
+    def __init__(self, path: str, record: bool = False):
+        self.path = os.path.expanduser(path)
+
+        self._lock = threading.Lock()
+        self._interactions = {}
+        self._cursors = {}
+
+        if record:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            os.close(os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600))
+
+        else:
+            for interaction in self.load():
+                self._index(interaction)
+
+    def load(self) -> list:
+        try:
+            with open(self.path, 'r') as f:
+                return [json.loads(line) for line in f if line.strip()]
+
+        except FileNotFoundError:
+            return []
+
+    def _index(self, interaction):
+        key = get_request_key(interaction['method'], interaction['url'], interaction['request'])
+        self._interactions.setdefault(key, []).append(interaction)
+
+    def record(self, method: str, url: str, request_body, status: int, reason: str, headers, body: bytes,
+               elapsed: float) -> dict:
+        interaction = {
+            'method': method.upper(),
+            'url': url,
+            'request': normalize_body(request_body),
+            'status': status,
+            'reason': reason,
+            'headers': [
+                [name, sanitize_header(name, value)] for name, value in headers if name.lower() not in SKIPPED_HEADERS
+            ],
+            'body': body.decode('utf-8', 'surrogateescape'),
+            'elapsed': elapsed
+        }
+
+        with self._lock:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(interaction) + '\n')
+
+            self._index(interaction)
+
+        return interaction
+
+    def play(self, method: str, url: str, body=None) -> dict:
+        key = get_request_key(method, url, body)
+
+        with self._lock:
+            if not (interactions := self._interactions.get(key)):
+                raise ReplayError(f'no recorded response - {method.upper()} {url} - {key}')
+
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+
+        return interactions[min(cursor, len(interactions) - 1)]
+
+
+_cassettes = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette(path: str, record: bool = False) -> Cassette:
+    key = (os.path.abspath(os.path.expanduser(path)), record)
+
+    with _cassettes_lock:
+        if key not in _cassettes:
+            _cassettes[key] = Cassette(path, record=record)
+
+        return _cassettes[key]
+
+
+class RecordingAdapter(HTTPAdapter):
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        HTTPAdapter.__init__(self, **kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        started = time.monotonic()
+        response = HTTPAdapter.send(self, request, **kwargs)
+
+        self.cassette.record(
+            request.method, request.url, request.body, response.status_code, response.reason,
+            response.raw.headers.iteritems(), response.content, time.monotonic() - started)
+
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+
+    def __init__(self, cassette: Cassette, latency: float = 0.0):
+        HTTPAdapter.__init__(self)
+
+        self.cassette = cassette
+        self.latency = latency
+
+    def send(self, request, **kwargs):
+        interaction = self.cassette.play(request.method, request.url, request.body)
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        return self.build_response(request, self.get_raw_response(interaction))
+
+    @staticmethod
+    def get_raw_response(interaction) -> HTTPResponse:
+        return HTTPResponse(
+            body=io.BytesIO(interaction['body'].encode('utf-8', 'surrogateescape')),
+            headers=interaction['headers'],
+            status=interaction['status'],
+            reason=interaction['reason'],
+            preload_content=False,
+            decode_content=False,
+            original_response=RecordedMessage(interaction['headers'])
+        )
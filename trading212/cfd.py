@@ -1,5 +1,7 @@
 import time
 
+from functools import partial
+
 from .client import Trading212Client
 
 
@@ -10,38 +12,59 @@ def validate_position_side(value):
     return value.lower()
 
 
+def validate_limit_order(order: dict) -> dict:
+    if not order['instrument']:
+        raise ValueError(f'invalid instrument - {order["instrument"]}')
+
+    if order['price'] <= 0:
+        raise ValueError(f'invalid price - {order["price"]}')
+
+    if not order['quantity']:
+        raise ValueError(f'invalid quantity - {order["quantity"]}')
+
+    return {**order, 'direction': validate_position_side(order['direction'])}
+
+
 class Trading212CFD(Trading212Client):
 
     trading_type = 'cfd'
 
-    def __init__(self, username, password, account='demo'):
-        Trading212Client.__init__(self, username, password)
+    def __init__(self, username, password, account='demo', **kwargs):
+        Trading212Client.__init__(self, username, password, account, **kwargs)
+        self.get_session()
 
-        self.switch_account(
-            account_type=account, trading_type=self.trading_type)
+        if (self._account_type, self._account_trading_type) != (account.lower(), self.trading_type):
+            self.switch_account(
+                account_type=account, trading_type=self.trading_type)
 
-    def get_positions(self, start: int = None, end: int = None) -> dict:
+    def get_positions(self, start: int = None, end: int = None, **kwargs) -> dict:
         start = int(time.time()) - 60 * 60 * 24 if start is None else start
         end = int(time.time()) if end is None else end
 
-        return self._position(self.get_session(), start=start, end=end)
+        return self._position(self.get_session(), start=start, end=end, **kwargs)
 
-    def get_position_history(self, position_id: str) -> dict:
-        return self._position_history(self.get_session(), position_id)
+    def get_position_history(self, position_id: str, **kwargs) -> dict:
+        return self._position_history(self.get_session(), position_id, **kwargs)
 
-    def open_market_position(self, direction: str, instrument: str, quantity: float, **kwargs) -> dict:
+    def open_market_position(self, direction: str, instrument: str, quantity: float,
+                             price: float = None, max_age: float = None, **kwargs) -> dict:
         direction = validate_position_side(direction)
-        bid, ask = self.get_market_price(instrument)
+        kwargs = self.start_deadline(kwargs)
+        price_source = 'caller'
+
+        if price is None:
+            bid, ask, price_source = self.get_market_price_source(
+                instrument, max_age, **self.get_request_options(kwargs))
+            price = ask['close'] if direction == 'buy' else bid['close']
 
         if direction == 'buy':
-            price = ask['open']
             quantity = abs(quantity)
 
         if direction == 'sell':
-            price = bid['open']
             quantity = abs(quantity) * -1
 
-        return self._position_open(self.get_session(), instrument, price, quantity, **kwargs)
+        data = self._position_open(self.get_session(), instrument, price, quantity, **kwargs)
+        return {**data, 'priceSource': price_source}
 
     def open_limit_order(self, direction: str, instrument: str, price: float, quantity: float, **kwargs) -> dict:
         direction = validate_position_side(direction)
@@ -60,8 +83,22 @@ class Trading212CFD(Trading212Client):
     def modify_order(self, order_id: str, price: float, quantity: float, **kwargs) -> dict:
         return self._order_modify(self.get_session(), order_id, price, quantity, **kwargs)
 
-    def close_position(self, position_id: str) -> dict:
-        return self._position_close(self.get_session(), position_id)
+    def close_position(self, position_id: str, **kwargs) -> dict:
+        return self._position_close(self.get_session(), position_id, **kwargs)
+
+    def close_order(self, order_id: str, **kwargs) -> dict:
+        return self._order_delete(self.get_session(), order_id, **kwargs)
+
+    def open_orders(self, orders: list) -> list:
+        orders = self.validate_bulk(orders, validate_limit_order)
+        return self.submit_bulk([partial(self.open_limit_order, **order) for order in orders])
+
+    def close_positions(self, position_ids: list, **kwargs) -> list:
+        kwargs = self.start_deadline(kwargs)
+        self._validate_account_ids('positions', 'positionId', position_ids)
+        return self.submit_bulk([partial(self.close_position, position_id, **kwargs) for position_id in position_ids])
 
-    def close_order(self, order_id: str) -> dict:
-        return self._order_delete(self.get_session(), order_id)
+    def cancel_orders(self, order_ids: list, **kwargs) -> list:
+        kwargs = self.start_deadline(kwargs)
+        self._validate_account_ids('orders', 'orderId', order_ids)
+        return self.submit_bulk([partial(self.close_order, order_id, **kwargs) for order_id in order_ids])
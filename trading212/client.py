@@ -1,9 +1,13 @@
-import re
+from concurrent.futures import ThreadPoolExecutor
 
-import cachetools.func
 import requests
 
-from .rest import Trading212Rest
+from .limiter import get_limiter
+from .pool import run_timed
+from .quotes import QuoteFeed
+from .rest import Trading212Rest, validate_account_type
+from .session import SessionManager
+from .transport import create_session, get_cookie_jar, get_http_errors
 
 
 class Trading212Client(Trading212Rest):
@@ -17,39 +21,123 @@ class Trading212Client(Trading212Rest):
         10080: 'ONE_WEEK', 0: 'ONE_MONTH'
     }
 
-    def __init__(self, username, password, account='demo'):
-        Trading212Rest.__init__(self, account)
+    session_ttl = 300
+    session_refresh_margin = 60
+
+    quote_max_age = 5
+    account_max_age = 30
+
+    candles_chunk_size = 50
+
+    bulk_max_workers = 8
+
+    def __init__(self, username, password, account='demo', limiter=None, session_store=None, transport=None,
+                 base_url=None, rest_url=None):
+        # demo and live accounts are rate limited separately, so they must not share a bucket
+        if limiter is None:
+            limiter = get_limiter((username, validate_account_type(account)))
+
+        Trading212Rest.__init__(self, account, limiter, transport, base_url, rest_url)
 
         self.__username = username
         self.__password = password
 
-    @cachetools.func.ttl_cache(ttl=300)
+        self.session_store = session_store
+        self.session_key = f'{username}:{self._account_type}:{getattr(self, "trading_type", "")}'
+
+        self._restored_session = None
+
+        self.session_manager = SessionManager(
+            self._create_session, ttl=self.session_ttl, refresh_margin=self.session_refresh_margin,
+            on_discard=self._discard_session)
+
+        self.quote_feed = None
+
     def get_session(self) -> requests.Session:
-        session = requests.Session()
+        return self.session_manager.get()
+
+    @staticmethod
+    def _discard_session(session):
+        session.close()
+
+    def _create_session(self) -> requests.Session:
+        generation = self.session_manager.generation
+        session = create_session(self.transport)
 
         session.headers = {
             'Accept-Encoding': 'gzip, deflate',
             'Accept': '*/*',
-            'Connection': 'keep-alive',
+            'Connection': 'keep-alive' if self.transport.keep_alive else 'close',
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
             'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/85.0.4183.102 Safari/537.36'
         }
 
+        if self.session_manager.session is None and self._restore_session(session):
+            return self.install_rest_headers(session)
+
         self._authenticate(session, self.__username, self.__password)
         html = self._account_session(session)
 
-        self._account_id = re.search(
-            r'\'accountId\':\s\'([0-9]+)\'', html).group(1)
-        self._account_type = re.search(
-            r'\'accountType\':\s\'([aA-zZ]+)\'', html).group(1).lower()
-        self._account_trading_type = re.search(
-            r'\'accountTradingType\':\s\'([aA-zZ]+)\'', html).group(1).lower()
-        self._application_name = re.search(
-            r'application=([aA-zZ0-9]+)', html).group(1)
-        self._application_version = re.search(
-            r'version=([aA-zZ0-9\.]+)', html).group(1)
+        # a login that raced with clear_session must not overwrite the state of its replacement
+        if generation == self.session_manager.generation:
+            self._set_session_metadata(html)
+            self._save_session(session)
+
+        return self.install_rest_headers(session)
+
+    def _restore_session(self, session) -> bool:
+        if self.session_store is None:
+            return False
+
+        if not (state := self.session_store.load(self.session_key)):
+            return False
+
+        for cookie in state['cookies']:
+            session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie['domain'], path=cookie['path'])
+
+        self._set_session_state(state)
+        self._restored_session = session
+
+        return True
+
+    def _save_session(self, session):
+        if self.session_store is None:
+            return
 
-        return session
+        self.session_store.save(self.session_key, {
+            **self.get_session_state(),
+            'cookies': [
+                {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path}
+                for c in get_cookie_jar(session)
+            ]
+        })
+
+    def clear_session(self):
+        self.session_manager.invalidate()
+        self.account_state.clear()
+        self.clear_init_info()
+
+        if self.session_store is not None:
+            self.session_store.delete(self.session_key)
+
+    def _request(self, session, method, api_url, text=False, **kwargs):
+        kwargs = self.start_deadline(kwargs)
+
+        try:
+            return Trading212Rest._request(self, session, method, api_url, text=text, **kwargs)
+
+        except get_http_errors() as e:
+            if session is not self._restored_session or \
+                    e.response.status_code not in (401, 403):
+                raise
+
+        self._restored_session = None
+        self.clear_session()
+        session = self.get_session()
+
+        return Trading212Rest._request(self, session, method, api_url, text=text, **kwargs)
 
     def batch(self, **kwargs) -> dict:
         if len(kwargs) == 1:
@@ -64,61 +152,175 @@ class Trading212Client(Trading212Rest):
 
         return {}
 
-    def get_init_info(self) -> dict:
-        return self._init_info(self.get_session())
+    def get_init_info(self, refresh: bool = False, **kwargs) -> dict:
+        session = self.get_session()
+        init_info = None if refresh else self._get_cached_init_info(session)
+
+        if init_info is None:
+            init_info = self._cache_init_info(session, self._init_info(session, **kwargs))
+
+        return init_info
 
     def get_accounts(self) -> dict:
-        session = self.get_session()
-        init_info = self._init_info(session)
+        init_info = self.get_init_info()
 
         return {
             'demo': init_info['customer']['demoAccounts'],
             'live': init_info['customer']['liveAccounts']
         }
 
-    def get_instrument_settings(self, instrument: list) -> list:
-        return self._instrument_settings(self.get_session(), instrument)
+    def get_account_directory(self, refresh: bool = False) -> dict:
+        if refresh or not self.account_directory:
+            self.get_init_info(refresh=refresh)
+
+        return self.account_directory
+
+    def get_instrument_settings(self, instrument: list, **kwargs) -> list:
+        return self._instrument_settings(self.get_session(), instrument, **kwargs)
+
+    def get_candles(self, instrument: str, period: int = 60, as_frame: bool = False, **kwargs):
+        data = self._candles(self.get_session(), instrument, period, **kwargs)[0]
+        self._archive_candles(instrument, period, data)
+
+        return self.get_candle_frame(data) if as_frame else data
+
+    def get_candles_many(self, instruments: list, period: int = 60, as_frame: bool = False, **kwargs) -> dict:
+        payloads = self.get_candle_payloads(instruments, period, **kwargs)
+        keys, results, options = list(payloads), {}, self.start_deadline(self.get_request_options(kwargs))
+
+        for i in range(0, len(keys), self.candles_chunk_size):
+            chunk = keys[i:i + self.candles_chunk_size]
+            data = self._candles_many(self.get_session(), [payloads[key] for key in chunk], **options)
+            results.update(zip(chunk, data))
 
-    def get_candles(self, instrument: str, period: int = 60, **kwargs) -> dict:
-        return self._candles(self.get_session(), instrument, period, **kwargs)[0]
+        for key, data in results.items():
+            self._archive_candles(*((key, period) if isinstance(key, str) else key), data)
 
-    def get_market_price(self, instrument: str) -> dict:
-        data = self.get_candles(instrument=instrument, period=5, limit=1)
-        return data['candles'][0]['bid'], data['candles'][0]['ask']
+        if as_frame:
+            return {key: self.get_candle_frame(data) for key, data in results.items()}
 
-    def get_notifications(self) -> dict:
-        return self._notifications(self.get_session())
+        return results
 
-    def get_price_increments(self, instrument_codes: list) -> dict:
-        return self._price_increments(self.get_session(), instrument_codes)
+    def get_candles_multi(self, instrument: str, periods: list, limit: int = 500, base_period: int = None) -> dict:
+        base_period, fetch_limit = self.get_resample_plan(periods, limit, base_period)
+        frame = self.get_candles(instrument, base_period, as_frame=True, limit=fetch_limit)
 
-    def get_price_alerts(self) -> dict:
-        return self._price_alerts(self.get_session())
+        return self.resample_frame(frame, base_period, periods, limit)
 
-    def get_account(self) -> dict:
-        return self._account(self.get_session())
+    def get_market_price(self, instrument: str, max_age: float = None, **kwargs) -> tuple:
+        bid, ask, _ = self.get_market_price_source(instrument, max_age, **kwargs)
+        return bid, ask
+
+    def get_market_price_source(self, instrument: str, max_age: float = None, **kwargs) -> tuple:
+        if quote := self.get_quote(instrument, max_age):
+            return quote.bid, quote.ask, 'quote'
+
+        data = self._candles(self.get_session(), instrument, 5, limit=1, **self.get_request_options(kwargs))[0]
+        return data['candles'][0]['bid'], data['candles'][0]['ask'], 'network'
+
+    def subscribe_quotes(self, instruments: list, callback=None, interval: float = 1.0) -> QuoteFeed:
+        if self.quote_feed is None:
+            self.quote_feed = QuoteFeed(self, interval=interval)
+
+        self.quote_feed.subscribe(instruments)
+
+        if callback is not None:
+            self.quote_feed.add_callback(callback)
+
+        self.quote_feed.start()
+        return self.quote_feed
+
+    def unsubscribe_quotes(self, instruments: list = None):
+        if self.quote_feed is None:
+            return
+
+        if instruments is None:
+            self.quote_feed.stop()
+            self.quote_feed = None
+
+        else:
+            self.quote_feed.unsubscribe(instruments)
+
+    def get_quote(self, instrument: str, max_age: float = None):
+        if self.quote_feed is None:
+            return None
+
+        return self.quote_feed.get_quote(
+            instrument, self.quote_max_age if max_age is None else max_age)
+
+    def get_notifications(self, **kwargs) -> dict:
+        return self._notifications(self.get_session(), **kwargs)
+
+    def get_price_increments(self, instrument_codes: list, **kwargs) -> dict:
+        return self._price_increments(self.get_session(), instrument_codes, **kwargs)
+
+    def get_price_alerts(self, **kwargs) -> dict:
+        return self._price_alerts(self.get_session(), **kwargs)
+
+    def get_account(self, **kwargs) -> dict:
+        data = self._account(self.get_session(), **kwargs)
+        self.account_state.update(data)
+
+        return data
+
+    def get_account_state(self, max_age: float = None, **kwargs) -> dict:
+        max_age = self.account_max_age if max_age is None else max_age
+
+        if self.account_state.age > max_age:
+            self.get_account(**kwargs)
+
+        return self.account_state.data
+
+    def get_position(self, position_id: str, **kwargs) -> dict:
+        return self._lookup_account('positions', 'positionId', position_id, **kwargs)
+
+    def get_order(self, order_id: str, **kwargs) -> dict:
+        return self._lookup_account('orders', 'orderId', order_id, **kwargs)
+
+    def _validate_account_ids(self, index, id_field, keys):
+        if len(set(keys)) != len(keys):
+            raise ValueError(f'duplicate {id_field} - {keys}')
+
+        for key in keys:
+            self._lookup_account(index, id_field, key)
+
+    def submit_bulk(self, calls: list) -> list:
+        if not calls:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(self.bulk_max_workers, len(calls))) as executor:
+            return list(executor.map(run_timed, range(len(calls)), calls))
+
+    def _lookup_account(self, index, id_field, key, **kwargs):
+        kwargs = self.start_deadline(self.get_request_options(kwargs))
+        refreshed = self.account_state.age > self.account_max_age
+
+        if refreshed:
+            self.get_account(**kwargs)
+
+        item = self.account_state.lookup(index, key)
+
+        if item is None and not refreshed:
+            self.get_account(**kwargs)
+            item = self.account_state.lookup(index, key)
+
+        if item is None:
+            raise ValueError(f'{id_field} not found - {key}')
+
+        return item
 
     def logout(self):
         return self._logout(self.get_session())
 
     def switch_account(self, account_type='demo', trading_type='equity') -> dict:
-        session = self.get_session()
-        init_info = self._init_info(session)
-
-        accounts = {
-            'demo': init_info['customer']['demoAccounts'],
-            'live': init_info['customer']['liveAccounts']
-        }
+        key = (account_type.lower(), trading_type.lower())
+        account = self.get_account_directory().get(key)
 
-        if account_type.lower() == 'demo':
-            for account in accounts['demo']:
-                if account['tradingType'].lower() == trading_type.lower():
-                    return self._switch(self.get_session(), account['id'])
+        if account is None:
+            account = self.get_account_directory(refresh=True).get(key)
 
-        if account_type.lower() == 'live':
-            for account in accounts['live']:
-                if account['tradingType'].lower() == trading_type.lower():
-                    return self._switch(self.get_session(), account['id'])
+        if account is None:
+            raise ValueError(
+                f'account not found - {account_type} - {trading_type}')
 
-        raise ValueError(
-            f'account not found - {account_type} - {trading_type}')
+        return self._switch(self.get_session(), account['id'])
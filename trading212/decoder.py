@@ -0,0 +1,34 @@
+import json
+
+try:
+    import orjson
+
+except ImportError:
+    orjson = None
+
+
+def loads_stdlib(data):
+    return json.loads(data)
+
+
+def loads_orjson(data):
+    return orjson.loads(data)
+
+
+def get_loads(name: str = None):
+    if name is None:
+        return loads_stdlib if orjson is None else loads_orjson
+
+    if name == 'orjson':
+        if orjson is None:
+            raise ImportError('orjson decoder requires orjson - pip install trading212-web-api[speedups]')
+
+        return loads_orjson
+
+    if name == 'json':
+        return loads_stdlib
+
+    raise ValueError(f'invalid decoder - {name}')
+
+
+loads = get_loads()
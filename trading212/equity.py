@@ -1,3 +1,5 @@
+from functools import partial
+
 from .client import Trading212Client
 
 
@@ -8,18 +10,33 @@ def validate_order_side(value):
     return value.lower()
 
 
+def validate_order(order: dict) -> dict:
+    if not order['instrument']:
+        raise ValueError(f'invalid instrument - {order["instrument"]}')
+
+    if not order['quantity']:
+        raise ValueError(f'invalid quantity - {order["quantity"]}')
+
+    if order.get('time_valid', 'DAY').upper() not in Trading212Client.time_valid_choices:
+        raise ValueError(f'invalid time validity - {order["time_valid"]}')
+
+    return {**order, 'direction': validate_order_side(order['direction'])}
+
+
 class Trading212Equity(Trading212Client):
 
     trading_type = 'equity'
 
-    def __init__(self, username, password, account='demo'):
-        Trading212Client.__init__(self, username, password)
+    def __init__(self, username, password, account='demo', **kwargs):
+        Trading212Client.__init__(self, username, password, account, **kwargs)
+        self.get_session()
 
-        self.switch_account(
-            account_type=account, trading_type=self.trading_type)
+        if (self._account_type, self._account_trading_type) != (account.lower(), self.trading_type):
+            self.switch_account(
+                account_type=account, trading_type=self.trading_type)
 
     def get_orders(self):
-        return self.get_account().get('equityOrders')
+        return self.get_account_state().get('equityOrders')
 
     def open_order(self, direction, instrument: str, quantity: float, **kwargs) -> dict:
         direction = validate_order_side(direction)
@@ -33,36 +50,43 @@ class Trading212Equity(Trading212Client):
         return self._equity_order_open(self.get_session(), instrument, quantity, **kwargs)
 
     def modify_order(self, order_id: str, quantity, **kwargs) -> dict:
-        account = self.get_account()
-        orders = {order['orderId']: order for order in account['equityOrders']}
-
-        if order_id not in orders:
-            raise ValueError(f'orderId not found - {order_id}')
-
-        order = orders[order_id]
+        kwargs = self.start_deadline(kwargs)
+        order = self.get_order(order_id, **self.get_request_options(kwargs))
         limit_price = kwargs.get('limit_price', False)
         stop_price = kwargs.get('stop_price', False)
 
         if order['type'] == 'LIMIT' and limit_price:
             return self._equity_order_modify(
                 self.get_session(), order_id, quantity,
-                limit_price=limit_price
+                limit_price=limit_price,
+                **self.get_request_options(kwargs)
             )
 
         if order['type'] == 'STOP' and stop_price:
             return self._equity_order_modify(
                 self.get_session(), order_id, quantity,
-                stop_price=stop_price
+                stop_price=stop_price,
+                **self.get_request_options(kwargs)
             )
 
         if order['type'] == 'STOP_LIMIT' and limit_price and stop_price:
             return self._equity_order_modify(
                 self.get_session(), order_id, quantity,
                 limit_price=limit_price,
-                stop_price=stop_price
+                stop_price=stop_price,
+                **self.get_request_options(kwargs)
             )
 
         raise ValueError('invalid request')
 
-    def close_order(self, order_id: str) -> dict:
-        return self._equity_order_close(self.get_session(), order_id)
+    def close_order(self, order_id: str, **kwargs) -> dict:
+        return self._equity_order_close(self.get_session(), order_id, **kwargs)
+
+    def open_orders(self, orders: list) -> list:
+        orders = self.validate_bulk(orders, validate_order)
+        return self.submit_bulk([partial(self.open_order, **order) for order in orders])
+
+    def cancel_orders(self, order_ids: list, **kwargs) -> list:
+        kwargs = self.start_deadline(kwargs)
+        self._validate_account_ids('orders', 'orderId', order_ids)
+        return self.submit_bulk([partial(self.close_order, order_id, **kwargs) for order_id in order_ids])
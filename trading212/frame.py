@@ -0,0 +1,114 @@
+import numpy as np
+
+CANDLE_SIDES = ('bid', 'ask')
+CANDLE_FIELDS = ('open', 'high', 'low', 'close')
+
+WEEK_MINUTES = 10080
+WEEK_OFFSET = 4 * 24 * 60 * 60 * 1000
+
+
+class CandleFrame:
+
+    timestamp_field = 'timestamp'
+
+    sides = CANDLE_SIDES
+    fields = CANDLE_FIELDS
+    columns = tuple(f'{side}_{field}' for side in CANDLE_SIDES for field in CANDLE_FIELDS)
+
+    def __init__(self, timestamps, prices):
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+
+        if prices.shape != (len(self.columns), len(timestamps)):
+            raise ValueError(f'invalid shape - {prices.shape}')
+
+        self.timestamps = timestamps
+        self.prices = prices
+
+    @classmethod
+    def from_candles(cls, candles: list):
+        count = len(candles)
+
+        timestamps = np.fromiter(
+            (candle[cls.timestamp_field] for candle in candles), dtype=np.int64, count=count)
+
+        prices = np.fromiter(
+            (candle[side][field] for candle in candles for side in cls.sides for field in cls.fields),
+            dtype=np.float64, count=count * len(cls.columns)
+        )
+
+        return cls(timestamps, np.ascontiguousarray(prices.reshape(count, len(cls.columns)).T))
+
+    @classmethod
+    def from_response(cls, data: dict):
+        return cls.from_candles(data['candles'])
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.column(key)
+
+        if isinstance(key, int):
+            key = slice(key, key + 1 or None)
+
+        return CandleFrame(self.timestamps[key], self.prices[:, key])
+
+    def __repr__(self) -> str:
+        return f'<CandleFrame rows={len(self)}>'
+
+    def column(self, name: str):
+        if name == 'timestamp':
+            return self.timestamps
+
+        if name not in self.columns:
+            raise KeyError(name)
+
+        return self.prices[self.columns.index(name)]
+
+    def between(self, start: int = None, end: int = None):
+        lo = 0 if start is None else np.searchsorted(self.timestamps, start, side='left')
+        hi = len(self) if end is None else np.searchsorted(self.timestamps, end, side='right')
+
+        return self[int(lo):int(hi)]
+
+    def resample(self, period: int):
+        if period <= 0:
+            raise ValueError(f'invalid period - {period}')
+
+        if not len(self):
+            return self
+
+        size = period * 60000
+        offset = WEEK_OFFSET if period % WEEK_MINUTES == 0 else 0
+
+        buckets = (self.timestamps - offset) // size
+        starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+        ends = np.append(starts[1:], len(self)) - 1
+
+        prices = np.empty((len(self.columns), len(starts)), dtype=np.float64)
+
+        for side in range(0, len(self.columns), len(self.fields)):
+            prices[side] = self.prices[side][starts]
+            prices[side + 1] = np.maximum.reduceat(self.prices[side + 1], starts)
+            prices[side + 2] = np.minimum.reduceat(self.prices[side + 2], starts)
+            prices[side + 3] = self.prices[side + 3][ends]
+
+        return CandleFrame(buckets[starts] * size + offset, prices)
+
+    def to_candles(self) -> list:
+        return [{
+            self.timestamp_field: int(timestamp),
+            **{side: {
+                field: float(self.prices[self.columns.index(f'{side}_{field}'), i])
+                for field in self.fields
+            } for side in self.sides}
+        } for i, timestamp in enumerate(self.timestamps)]
+
+    def to_pandas(self):
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.prices.T, columns=list(self.columns), copy=False,
+            index=pd.to_datetime(self.timestamps, unit='ms', utc=True))
@@ -0,0 +1,137 @@
+import time
+import bisect
+import threading
+
+
+class BaseCandleHistory:
+
+    timestamp_field = 'timestamp'
+
+    def __init__(self, client, limit: int = 500, max_backfill: int = 5000, max_size: int = None):
+        self.client = client
+        self.limit = limit
+        self.max_backfill = max_backfill
+        self.max_size = max_size
+
+        self._candles = {}
+        self._timestamps = {}
+        self._lock = threading.Lock()
+
+    def get(self, instrument: str, period: int, limit: int = None) -> list:
+        candles = self._candles.get((instrument, period), [])
+        return list(candles if limit is None else candles[-limit:])
+
+    def get_frame(self, instrument: str, period: int, limit: int = None):
+        return self.client.get_candle_frame({'candles': self.get(instrument, period, limit)})
+
+    def last_timestamp(self, instrument: str, period: int):
+        timestamps = self._timestamps.get((instrument, period))
+        return timestamps[-1] if timestamps else None
+
+    def clear(self, instrument: str = None, period: int = None):
+        with self._lock:
+            for key in list(self._candles):
+                if instrument in (None, key[0]) and period in (None, key[1]):
+                    del self._candles[key], self._timestamps[key]
+
+    def get_tail_limit(self, instrument: str, period: int) -> int:
+        if (last := self.last_timestamp(instrument, period)) is None:
+            return self.limit
+
+        if not period:
+            return 2
+
+        missing = (time.time() * 1000 - last) // (period * 60000)
+        return int(min(max(missing + 2, 2), self.limit))
+
+    def _overlaps(self, instrument, period, candles) -> bool:
+        last = self.last_timestamp(instrument, period)
+        return last is None or not candles or candles[0][self.timestamp_field] <= last
+
+    def _merge(self, instrument, period, candles) -> list:
+        if not candles:
+            return []
+
+        key = (instrument, period)
+        candles = sorted(candles, key=lambda candle: candle[self.timestamp_field])
+        timestamps = [candle[self.timestamp_field] for candle in candles]
+
+        with self._lock:
+            stored = self._candles.get(key, [])
+            stored_timestamps = self._timestamps.get(key, [])
+
+            start = bisect.bisect_left(stored_timestamps, timestamps[0])
+            end = bisect.bisect_right(stored_timestamps, timestamps[-1])
+
+            changed = [
+                candle for candle in candles
+                if candle not in stored[start:end]
+            ]
+
+            stored = stored[:start] + candles + stored[end:]
+            stored_timestamps = stored_timestamps[:start] + timestamps + stored_timestamps[end:]
+
+            if self.max_size is not None:
+                stored, stored_timestamps = stored[-self.max_size:], stored_timestamps[-self.max_size:]
+
+            self._candles[key], self._timestamps[key] = stored, stored_timestamps
+
+        return changed
+
+
+class CandleHistory(BaseCandleHistory):
+
+    def update(self, instrument: str, period: int = 60) -> list:
+        limit = self.get_tail_limit(instrument, period)
+
+        while True:
+            candles = self.client.get_candles(instrument, period, limit=limit)['candles']
+
+            if self._overlaps(instrument, period, candles) or limit >= self.max_backfill:
+                return self._merge(instrument, period, candles)
+
+            limit = min(limit * 2, self.max_backfill)
+
+    def update_many(self, instruments: list, period: int = 60) -> dict:
+        keys = [(item, period) if isinstance(item, str) else item for item in instruments]
+        limit = max([self.get_tail_limit(*key) for key in keys], default=0)
+
+        results = {}
+
+        for key, data in self.client.get_candles_many(keys, limit=limit).items():
+            if self._overlaps(*key, data['candles']):
+                results[key] = self._merge(*key, data['candles'])
+
+            else:
+                results[key] = self.update(*key)
+
+        return results
+
+
+class AsyncCandleHistory(BaseCandleHistory):
+
+    async def update(self, instrument: str, period: int = 60) -> list:
+        limit = self.get_tail_limit(instrument, period)
+
+        while True:
+            candles = (await self.client.get_candles(instrument, period, limit=limit))['candles']
+
+            if self._overlaps(instrument, period, candles) or limit >= self.max_backfill:
+                return self._merge(instrument, period, candles)
+
+            limit = min(limit * 2, self.max_backfill)
+
+    async def update_many(self, instruments: list, period: int = 60) -> dict:
+        keys = [(item, period) if isinstance(item, str) else item for item in instruments]
+        limit = max([self.get_tail_limit(*key) for key in keys], default=0)
+
+        results = {}
+
+        for key, data in (await self.client.get_candles_many(keys, limit=limit)).items():
+            if self._overlaps(*key, data['candles']):
+                results[key] = self._merge(*key, data['candles'])
+
+            else:
+                results[key] = await self.update(*key)
+
+        return results
@@ -0,0 +1,84 @@
+import time
+import threading
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float = 3, period: float = 1, burst: int = None):
+        if rate <= 0 or period <= 0:
+            raise ValueError(f'invalid rate - {rate}/{period}')
+
+        self.rate = rate
+        self.period = period
+        self.burst = rate if burst is None else burst
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+        self._calls = 0
+        self._waits = 0
+        self._waiting = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate / self.period)
+        self._updated = now
+
+    def _record_wait(self, wait: float):
+        self._waits += 1
+        self._wait_time += wait
+        self._max_wait = max(self._max_wait, wait)
+
+    def begin_wait(self):
+        with self._lock:
+            self._waiting += 1
+
+    def end_wait(self, wait: float = None):
+        with self._lock:
+            self._waiting -= 1
+
+            if wait is not None:
+                self._record_wait(wait)
+
+    def try_acquire(self) -> float:
+        with self._lock:
+            self._refill()
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self._calls += 1
+                return 0.0
+
+            return (1 - self._tokens) * self.period / self.rate
+
+    @property
+    def queue_depth(self) -> int:
+        return self._waiting
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._refill()
+
+            return {
+                'calls': self._calls,
+                'waits': self._waits,
+                'wait_time': self._wait_time,
+                'max_wait': self._max_wait,
+                'queue_depth': self._waiting,
+                'tokens': max(self._tokens, 0.0)
+            }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(key, rate: float = 3, period: float = 1, burst: int = None) -> TokenBucket:
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = TokenBucket(rate=rate, period=period, burst=burst)
+
+        return _limiters[key]
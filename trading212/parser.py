@@ -0,0 +1,100 @@
+import re
+import html
+
+LOGIN_TOKEN_NAME = 'login[_token]'
+
+INPUT_TAG = re.compile(r'<input\b[^>]*?\sname\s*=\s*["\']?login\[_token\](?=["\'\s/>])[^>]*>', re.IGNORECASE)
+VALUE_ATTRIBUTE = re.compile(r'\svalue\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))', re.IGNORECASE)
+
+
+def find_login_token(page: str):
+    if not (tag := INPUT_TAG.search(page)):
+        return None
+
+    if not (value := VALUE_ATTRIBUTE.search(tag.group(0))):
+        return None
+
+    return html.unescape(next(group for group in value.groups() if group is not None))
+
+
+def find_login_token_lxml(page: str):
+    try:
+        import lxml.etree
+        import lxml.html
+
+    except ImportError:
+        return None
+
+    try:
+        values = lxml.html.fromstring(page).xpath(f'//input[@name="{LOGIN_TOKEN_NAME}"]/@value')
+
+    except (ValueError, lxml.etree.LxmlError):
+        return None
+
+    return values[0] if values else None
+
+
+def find_login_token_bs4(page: str):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page, 'html5lib')
+
+    if e := soup.find('input', attrs={'name': LOGIN_TOKEN_NAME}):
+        return e['value']
+
+    return None
+
+
+login_token_finders = (find_login_token, find_login_token_lxml, find_login_token_bs4)
+
+
+def parse_login_token(page: str) -> str:
+    for finder in login_token_finders:
+        if token := finder(page):
+            return token
+
+    raise ValueError('unable to find login token')
+
+
+class SessionMetadataError(ValueError):
+    pass
+
+
+SESSION_METADATA_FIELDS = (
+    'account_id', 'account_type', 'account_trading_type', 'application_name', 'application_version'
+)
+
+ACCOUNT_METADATA = re.compile(
+    r"'account(?:"
+    r"Id':\s'(?P<account_id>[0-9]+)"
+    r"|Type':\s'(?P<account_type>[A-Za-z]+)"
+    r"|TradingType':\s'(?P<account_trading_type>[A-Za-z]+)"
+    r")'"
+)
+
+APPLICATION_METADATA = {
+    'application_name': re.compile(r'application=([A-Za-z0-9_-]+)'),
+    'application_version': re.compile(r'version=([A-Za-z0-9._-]+)')
+}
+
+
+def parse_session_metadata(page: str) -> dict:
+    metadata = {}
+
+    for match in ACCOUNT_METADATA.finditer(page):
+        metadata.setdefault(match.lastgroup, match.group(match.lastgroup))
+
+        if len(metadata) == ACCOUNT_METADATA.groups:
+            break
+
+    for field, pattern in APPLICATION_METADATA.items():
+        if match := pattern.search(page):
+            metadata[field] = match.group(1)
+
+    if missing := [field for field in SESSION_METADATA_FIELDS if field not in metadata]:
+        raise SessionMetadataError(f'missing session metadata - {", ".join(missing)}')
+
+    metadata['account_type'] = metadata['account_type'].lower()
+    metadata['account_trading_type'] = metadata['account_trading_type'].lower()
+
+    return metadata
@@ -0,0 +1,179 @@
+import time
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
+
+
+class PoolResult(NamedTuple):
+    key: Any
+    value: Any
+    error: Exception
+    elapsed: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def run_timed(key, func) -> PoolResult:
+    started = time.monotonic()
+
+    try:
+        return PoolResult(key, func(), None, time.monotonic() - started)
+
+    except Exception as e:
+        return PoolResult(key, None, e, time.monotonic() - started)
+
+
+async def run_timed_async(key, func) -> PoolResult:
+    started = time.monotonic()
+
+    try:
+        return PoolResult(key, await func(), None, time.monotonic() - started)
+
+    except Exception as e:
+        return PoolResult(key, None, e, time.monotonic() - started)
+
+
+def get_call(method, args, kwargs):
+    if callable(method):
+        return lambda client: method(client, *args, **kwargs)
+
+    return lambda client: getattr(client, method)(*args, **kwargs)
+
+
+class BaseAccountPool:
+
+    def __init__(self, clients=None):
+        self.clients = {}
+
+        if isinstance(clients, dict):
+            clients = clients.items()
+
+        for item in clients or ():
+            if isinstance(item, tuple):
+                self.add(*item)
+
+            else:
+                self.add(item.session_key, item)
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def __getitem__(self, key):
+        return self.clients[key]
+
+    def add(self, key, client):
+        if key in self.clients:
+            raise ValueError(f'duplicate client - {key}')
+
+        self.clients[key] = client
+
+    def remove(self, key):
+        return self.clients.pop(key)
+
+    def get_keys(self, keys=None) -> list:
+        return list(self.clients) if keys is None else [key for key in keys if key in self.clients]
+
+    @staticmethod
+    def get_errors(results: dict) -> dict:
+        return {key: result.error for key, result in results.items() if not result.ok}
+
+
+class AccountPool(BaseAccountPool):
+
+    def __init__(self, clients=None, max_workers: int = None):
+        BaseAccountPool.__init__(self, clients)
+
+        self.max_workers = max_workers
+        self._executor = None
+
+    @classmethod
+    def from_credentials(cls, credentials: list, client_cls=None, max_workers: int = None, **kwargs):
+        if client_cls is None:
+            from .client import Trading212Client as client_cls
+
+        pool = cls(max_workers=max_workers or max(len(credentials), 1))
+        clients = pool._map(list(range(len(credentials))), lambda i: client_cls(**{**kwargs, **credentials[i]}))
+
+        for result in clients.values():
+            if not result.ok:
+                pool.close()
+                raise result.error
+
+            pool.add(result.value.session_key, result.value)
+
+        return pool
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers or max(len(self.clients), 1),
+                thread_name_prefix='trading212-pool')
+
+        return self._executor
+
+    def call(self, method, *args, keys: list = None, **kwargs) -> dict:
+        call = get_call(method, args, kwargs)
+        return self._map(self.get_keys(keys), lambda key: call(self.clients[key]))
+
+    def _map(self, keys, func) -> dict:
+        results = self.get_executor().map(lambda key: run_timed(key, lambda: func(key)), keys)
+        return {result.key: result for result in results}
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+
+        self._executor = None
+
+
+class AsyncAccountPool(BaseAccountPool):
+
+    @classmethod
+    async def from_credentials(cls, credentials: list, client_cls=None, **kwargs):
+        if client_cls is None:
+            from .aio.client import AsyncTrading212Client as client_cls
+
+        pool = cls([client_cls(**{**kwargs, **item}) for item in credentials])
+
+        try:
+            await pool.connect()
+
+        except Exception:
+            await pool.close()
+            raise
+
+        return pool
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def connect(self):
+        errors = self.get_errors(await self.call('connect'))
+
+        if errors:
+            raise next(iter(errors.values()))
+
+        return self
+
+    async def call(self, method, *args, keys: list = None, **kwargs) -> dict:
+        call = get_call(method, args, kwargs)
+
+        results = await asyncio.gather(*(
+            run_timed_async(key, lambda key=key: call(self.clients[key])) for key in self.get_keys(keys)
+        ))
+        return {result.key: result for result in results}
+
+    async def close(self):
+        await self.call('close')
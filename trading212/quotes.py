@@ -0,0 +1,219 @@
+import time
+import asyncio
+import threading
+
+from typing import NamedTuple
+
+
+class Quote(NamedTuple):
+    instrument: str
+    bid: dict
+    ask: dict
+    timestamp: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.timestamp
+
+
+class BaseQuoteFeed:
+
+    def __init__(self, client, interval: float = 1.0, period: int = 5, chunk_size: int = 50):
+        if period not in client.candle_periods:
+            raise ValueError(f'invalid period - {period}')
+
+        self.client = client
+        self.interval = interval
+        self.period = period
+        self.chunk_size = chunk_size
+
+        self.instruments = []
+        self.quotes = {}
+        self.last_error = None
+
+        self._callbacks = []
+
+    def subscribe(self, instruments: list):
+        for instrument in instruments:
+            if instrument not in self.instruments:
+                self.instruments.append(instrument)
+
+    def unsubscribe(self, instruments: list):
+        for instrument in instruments:
+            if instrument in self.instruments:
+                self.instruments.remove(instrument)
+
+            self.quotes.pop(instrument, None)
+
+    def add_callback(self, callback):
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        self._callbacks.remove(callback)
+
+    def get_quote(self, instrument: str, max_age: float = None):
+        quote = self.quotes.get(instrument)
+
+        if quote is None or (max_age is not None and quote.age > max_age):
+            return None
+
+        return quote
+
+    def get_batches(self) -> list:
+        payloads = [{
+            'instCode': instrument,
+            'periodType': self.client.candle_periods[self.period],
+            'limit': 1,
+            'withFakes': False
+        } for instrument in list(self.instruments)]
+
+        return [payloads[i:i + self.chunk_size] for i in range(0, len(payloads), self.chunk_size)]
+
+    def _update(self, data) -> list:
+        received, updated = time.time(), []
+
+        for item in data.get('candles', []):
+            instrument = item['request']['instCode']
+
+            if not item.get('candles') or instrument not in self.instruments:
+                continue
+
+            candle = item['candles'][-1]
+            previous = self.quotes.get(instrument)
+            quote = Quote(instrument, candle['bid'], candle['ask'], received)
+
+            self.quotes[instrument] = quote
+
+            if previous is None or (previous.bid, previous.ask) != (quote.bid, quote.ask):
+                updated.append(quote)
+
+        return updated
+
+    def _notify(self, quotes):
+        for quote in quotes:
+            for callback in list(self._callbacks):
+                callback(quote)
+
+
+class QuoteFeed(BaseQuoteFeed):
+
+    def __init__(self, client, **kwargs):
+        BaseQuoteFeed.__init__(self, client, **kwargs)
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def poll(self) -> list:
+        updated = []
+
+        for batch in self.get_batches():
+            updated += self._update(self.client.batch(candles=batch))
+
+        self._notify(updated)
+        return updated
+
+    def start(self):
+        if self.running:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+
+            try:
+                self.poll()
+                self.last_error = None
+
+            except Exception as e:
+                self.last_error = e
+
+            self._stop.wait(max(self.interval - (time.monotonic() - started), 0))
+
+
+class AsyncQuoteFeed(BaseQuoteFeed):
+
+    def __init__(self, client, maxsize: int = 1000, **kwargs):
+        BaseQuoteFeed.__init__(self, client, **kwargs)
+
+        self.maxsize = maxsize
+
+        self._queues = []
+        self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def poll(self) -> list:
+        updated = []
+
+        for batch in self.get_batches():
+            updated += self._update(await self.client.batch(candles=batch))
+
+        self._notify(updated)
+        return updated
+
+    def _notify(self, quotes):
+        BaseQuoteFeed._notify(self, quotes)
+
+        for queue in self._queues:
+            for quote in quotes:
+                if queue.full():
+                    queue.get_nowait()
+
+                queue.put_nowait(quote)
+
+    def start(self):
+        if not self.running:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        while True:
+            started = time.monotonic()
+
+            try:
+                await self.poll()
+                self.last_error = None
+
+            except Exception as e:
+                self.last_error = e
+
+            await asyncio.sleep(max(self.interval - (time.monotonic() - started), 0))
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        queue = asyncio.Queue(maxsize=self.maxsize)
+        self._queues.append(queue)
+
+        try:
+            while True:
+                yield await queue.get()
+
+        finally:
+            self._queues.remove(queue)
@@ -1,8 +1,14 @@
 import time
 import random
 
-from bs4 import BeautifulSoup
-from ratelimit import limits, sleep_and_retry
+from urllib.parse import urlsplit
+
+from .account import AccountState
+from .decoder import loads
+from .limiter import TokenBucket
+from .parser import parse_login_token, parse_session_metadata
+from .scheduler import get_deadline, get_remaining, get_scheduler
+from .transport import TransportConfig, get_cookie_jar, get_timeout
 
 
 def validate_account_type(account):
@@ -14,6 +20,7 @@ def validate_account_type(account):
 
 class Trading212Rest:
     base_url = 'https://www.trading212.com'
+    rest_url = 'https://{account_type}.trading212.com'
 
     date_format = r'%Y-%m-%dT%H:%M:%S.000'
 
@@ -25,59 +32,174 @@ class Trading212Rest:
 
     time_valid_choices = ('DAY', 'GOOD_TILL_CANCEL')
 
-    def __init__(self, account='demo'):
+    candles_max_limit = 5000
+
+    queue_maxsize = 100
+
+    routes = {
+        'account': 'rest/v2/account',
+        'batch_rest': 'charting/rest/batch',
+        'batch_v2': 'charting/v2/batch',
+        'candles': 'charting/rest/v2/candles',
+        'init_info': 'rest/v3/init-info',
+        'instrument_settings': 'rest/v2/account/instruments/settings',
+        'logout': 'rest/v1/logout',
+        'notifications': 'rest/v2/notifications',
+        'price_increments': 'rest/v2/instruments/price-increments',
+        'price_alerts': 'rest/v2/price-alerts',
+        'switch': 'rest/v2/account/switch',
+        'position': 'user-reports/rest/position',
+        'position_history': 'user-reports/rest/positionHistory/{}',
+        'position_open': 'rest/v2/trading/open-positions',
+        'position_modify': 'rest/v2/pending-orders/associated/{}',
+        'position_close': 'rest/v2/trading/open-positions/close/{}',
+        'order_open': 'rest/v2/pending-orders/entry-dep-limit-stop/{}',
+        'order_modify': 'rest/v2/pending-orders/entry-dep-limit-stop/{}',
+        'order_delete': 'rest/v2/pending-orders/entry/{}',
+        'equity_order_open': 'rest/public/v2/equity/order',
+        'equity_order': 'rest/public/v2/equity/order/{}'
+    }
+
+    json_loads = staticmethod(loads)
+
+    def __init__(self, account='demo', limiter=None, transport=None, base_url=None, rest_url=None):
+        if base_url is not None:
+            self.base_url = base_url.rstrip('/')
+
+        if rest_url is not None:
+            self.rest_url = rest_url.rstrip('/')
+
+        self.limiter = TokenBucket() if limiter is None else limiter
+        self.transport = TransportConfig() if transport is None else transport
+        self.scheduler = get_scheduler(self.limiter, self.queue_maxsize)
+        self.candle_archive = None
+        self.account_state = AccountState()
+        self.account_directory = {}
+        self._init_info_cache = (None, None)
+
         self._account_id = None
         self._account_type = validate_account_type(account)
         self._account_trading_type = None
         self._application_name = None
         self._application_version = None
 
-    @classmethod
-    @sleep_and_retry
-    @limits(calls=3, period=1)
-    def call_api(cls, session, method, **kwargs):
-        return getattr(session, method)(**kwargs)
+        self._precompute_session()
 
-    def get_rest_url(self, api_endpoint: str = '') -> str:
-        return '/'.join([f'https://{self._account_type}.trading212.com', api_endpoint.strip('/')])
+    def call_api(self, session, method, priority='account', deadline=None, **kwargs):
+        kwargs = self.get_transport_kwargs(kwargs)
+
+        started = time.monotonic()
+        self.scheduler.acquire(priority, deadline)
+
+        if deadline is not None:
+            kwargs['timeout'] = get_timeout(session, kwargs['timeout'], get_remaining(deadline))
+
+        try:
+            return session.request(method.upper(), **kwargs)
+
+        finally:
+            self.scheduler.record(priority, time.monotonic() - started)
+
+    def get_transport_kwargs(self, kwargs) -> dict:
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.transport.timeout
+
+        if not self.transport.keep_alive:
+            kwargs['headers'] = {**kwargs.get('headers', {}), 'Connection': 'close'}
+
+        return kwargs
 
     @staticmethod
-    def get_generic_headers() -> dict:
+    def get_request_options(kwargs) -> dict:
+        return {key: kwargs[key] for key in ('timeout', 'deadline') if kwargs.get(key) is not None}
+
+    @staticmethod
+    def get_deadline(deadline: float = None):
+        return get_deadline(deadline)
+
+    @staticmethod
+    def start_deadline(kwargs) -> dict:
+        if kwargs.get('deadline') is not None:
+            kwargs['deadline'] = get_deadline(kwargs['deadline'])
+
+        return kwargs
+
+    def _request(self, session, method, api_url, text=False, priority='account', deadline=None, **kwargs):
+        r = self.call_api(
+            session, method, priority=priority, deadline=self.get_deadline(deadline), url=api_url, **kwargs)
+
+        r.raise_for_status()
+
+        if text:
+            return r.text
+
+        return self._update_account_state(priority, self.json_loads(r.content))
+
+    def _update_account_state(self, priority, data):
+        if priority == 'trading' and isinstance(data, dict) and isinstance(data.get('account'), dict):
+            self.account_state.update(data['account'])
+
+        return data
+
+    def get_rest_url(self, api_endpoint: str = '') -> str:
+        return f'{self._rest_url}/{api_endpoint.strip("/")}'
+
+    def get_route_url(self, route: str, *args) -> str:
+        url = self._route_urls[route]
+        return url.format(*args) if args else url
+
+    def get_generic_headers(self) -> dict:
         return {
             'Connection': 'keep-alive',
-            'Host': 'www.trading212.com',
-            'Origin': 'https://www.trading212.com',
-            'Referer': 'https://www.trading212.com/',
+            'Host': urlsplit(self.base_url).netloc,
+            'Origin': self.base_url,
+            'Referer': f'{self.base_url}/',
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
             'AppleWebKit/537.36 (KHTML, like Gecko) '
             'Chrome/86.0.4240.198 Safari/537.36'
         }
 
-    def get_rest_headers(self) -> dict:
+    def get_login_headers(self) -> dict:
         return {
+            'Host': urlsplit(self.base_url).netloc,
+            'Origin': self.base_url,
+            'Referer': f'{self.base_url}/en/login',
+            'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8'
+        }
+
+    def get_rest_headers(self) -> dict:
+        return dict(self._rest_headers)
+
+    def _precompute_session(self):
+        self._rest_url = self.rest_url.format(account_type=self._account_type)
+        self._route_urls = {route: f'{self._rest_url}/{path}' for route, path in self.routes.items()}
+
+        self._rest_headers = {
             **self.get_generic_headers(),
-            'Host': f'{self._account_type}.trading212.com',
-            'Origin': f'https://{self._account_type}.trading212.com',
-            'Referer': f'https://{self._account_type}.trading212.com/',
+            'Connection': 'keep-alive' if self.transport.keep_alive else 'close',
+            'Host': urlsplit(self._rest_url).netloc,
+            'Origin': self._rest_url,
+            'Referer': f'{self._rest_url}/',
             'X-Trader-Client': f'application={self._application_name}, '
             f'version={self._application_version}, '
             f'accountId={self._account_id}'
         }
 
-    def _account(self, session):
-        api_url = self.get_rest_url('/rest/v2/account')
+    def install_rest_headers(self, session):
+        session.headers.update(self._rest_headers)
+        return session
 
-        r = self.call_api(
-            session, 'get', url=api_url,
-            headers=self.get_rest_headers()
-        )
-
-        r.raise_for_status()
-        return r.json()
-
-    def _account_session(self, session):
-        cookies = session.cookies.get_dict()
+    @staticmethod
+    def get_login_form(username, password, token) -> dict:
+        return {
+            'login[username]': username, 'login[password]': password,
+            'login[rememberMe]': 1, 'login[_token]': token,
+            'login[twoFactorAuthCode]': '', 'login[twoFactorBackupCode]': '',
+            'login[twoFactorAuthRememberDevice]': ''
+        }
 
+    @staticmethod
+    def get_account_session_form(cookies) -> dict:
         if cookies.get('TRADING212_SESSION_DEMO', False):
             session_cookie = cookies['TRADING212_SESSION_DEMO']
 
@@ -87,212 +209,281 @@ class Trading212Rest:
         else:
             raise ValueError('unable to find session cookie')
 
-        form_data = {
+        return {
             'rememberMeCookie': cookies['LOGIN_TOKEN'],
             'sessionCookie': session_cookie,
             'customerSessionCookie': cookies['CUSTOMER_SESSION'],
             'rand': random.randrange(1400000000, 1500000000)
         }
 
-        headers = {
-            **self.get_generic_headers(),
-            'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8'
+    @staticmethod
+    def parse_login_token(html) -> str:
+        return parse_login_token(html)
+
+    def _set_session_metadata(self, html):
+        self._set_session_state(parse_session_metadata(html))
+
+    def get_session_state(self) -> dict:
+        return {
+            'account_id': self._account_id,
+            'account_type': self._account_type,
+            'account_trading_type': self._account_trading_type,
+            'application_name': self._application_name,
+            'application_version': self._application_version,
+            'accounts': [
+                [account_type, trading_type, account]
+                for (account_type, trading_type), account in self.account_directory.items()
+            ]
         }
 
-        r = self.call_api(
-            session, 'post',
-            url=self.get_rest_url(),
-            data=form_data,
-            headers=headers
-        )
+    def _set_session_state(self, state):
+        self._account_id = state['account_id']
+        self._account_type = state['account_type']
+        self._account_trading_type = state['account_trading_type']
+        self._application_name = state['application_name']
+        self._application_version = state['application_version']
 
-        r.raise_for_status()
-        return r.text
+        self._precompute_session()
 
-    @classmethod
-    def _authenticate(cls, session, username, password):
-        api_url = cls.base_url + '/en/authenticate'
+        if state.get('accounts'):
+            self.account_directory = {
+                (account_type, trading_type): account
+                for account_type, trading_type, account in state['accounts']
+            }
 
-        form_data = {
-            'login[username]': username, 'login[password]': password,
-            'login[rememberMe]': 1, 'login[_token]': cls._get_login_token(session),
-            'login[twoFactorAuthCode]': '', 'login[twoFactorBackupCode]': '',
-            'login[twoFactorAuthRememberDevice]': ''
-        }
+    def _account(self, session, **kwargs):
+        api_url = self.get_route_url('account')
+
+        return self._request(session, 'get', api_url, **self.get_request_options(kwargs))
+
+    def _account_session(self, session):
+        cookies = {cookie.name: cookie.value for cookie in get_cookie_jar(session)}
+        form_data = self.get_account_session_form(cookies)
 
         headers = {
-            'Host': 'www.trading212.com',
-            'Origin': 'https://www.trading212.com',
-            'Referer': 'https://www.trading212.com/en/login',
+            **self.get_generic_headers(),
             'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8'
         }
 
-        r = cls.call_api(
-            session, 'post',
-            url=api_url,
+        return self._request(
+            session, 'post', self.get_rest_url(),
+            text=True,
             data=form_data,
             headers=headers
         )
 
-        r.raise_for_status()
-        return r.json()
+    def _authenticate(self, session, username, password):
+        api_url = self.base_url + '/en/authenticate'
+        token = self._get_login_token(session)
 
-    @classmethod
-    def _get_login_token(cls, session):
-        api_url = cls.base_url + '/en/login'
-
-        r = cls.call_api(session, 'get', url=api_url)
-        r.raise_for_status()
-
-        soup = BeautifulSoup(r.text, 'html5lib')
+        return self._request(
+            session, 'post', api_url,
+            data=self.get_login_form(username, password, token),
+            headers=self.get_login_headers()
+        )
 
-        if e := soup.find('input', attrs={'name': 'login[_token]'}):
-            return e['value']
+    def _get_login_token(self, session):
+        api_url = self.base_url + '/en/login'
 
-        raise ValueError('unable to find login token')
+        return self.parse_login_token(
+            self._request(session, 'get', api_url, text=True))
 
     def _batch_rest(self, session, **kwargs):
-        api_url = self.get_rest_url('/charting/rest/batch')
+        api_url = self.get_route_url('batch_rest')
 
-        r = self.call_api(
-            session, 'post',
-            url=api_url,
-            headers=self.get_rest_headers(),
+        return self._request(
+            session, 'post', api_url,
+            priority='market_data',
             json=kwargs
         )
 
-        r.raise_for_status()
-        return r.json()
-
     def _batch_v2(self, session, **kwargs):
-        api_url = self.get_rest_url('/charting/v2/batch')
+        api_url = self.get_route_url('batch_v2')
 
-        r = self.call_api(
-            session, 'post',
-            url=api_url,
-            headers=self.get_rest_headers(),
+        return self._request(
+            session, 'post', api_url,
+            priority='market_data',
             json=kwargs
         )
 
-        r.raise_for_status()
-        return r.json()
-
-    def _candles(self, session, instrument, period, **kwargs):
-        api_url = self.get_rest_url('/charting/rest/v2/candles')
-
+    def get_candle_payload(self, instrument, period, **kwargs) -> dict:
         if period not in self.candle_periods:
             raise ValueError(f'invalid period - {period}')
 
-        payload = {
+        return {
             'instCode': instrument,
             'periodType': self.candle_periods[period],
             'limit': kwargs.get('limit', 500),
             'withFakes': kwargs.get('fakes', False)
         }
 
-        r = self.call_api(
-            session, 'post',
-            url=api_url,
-            headers=self.get_rest_headers(),
-            json=[payload]
-        )
+    def get_candle_payloads(self, instruments, period, **kwargs) -> dict:
+        payloads = {}
 
-        r.raise_for_status()
-        return r.json()
+        for item in instruments:
+            instrument, item_period = (item, period) if isinstance(item, str) else item
+            payloads[item] = self.get_candle_payload(instrument, item_period, **kwargs)
 
-    def _init_info(self, session):
-        api_url = self.get_rest_url('/rest/v3/init-info')
+        return payloads
 
-        r = self.call_api(
-            session, 'get', url=api_url,
-            headers=self.get_rest_headers()
+    def _archive_candles(self, instrument, period, data):
+        if self.candle_archive is not None and data.get('candles'):
+            self.candle_archive.append(instrument, period, data['candles'])
+
+    @staticmethod
+    def get_candle_frame(data):
+        from .frame import CandleFrame
+
+        return CandleFrame.from_response(data)
+
+    @staticmethod
+    def validate_bulk(items: list, validate) -> list:
+        validated = []
+
+        for i, item in enumerate(items):
+            try:
+                validated.append(validate(item))
+
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f'invalid item - {i} - {e!r}') from e
+
+        return validated
+
+    @staticmethod
+    def index_accounts(init_info) -> dict:
+        return {
+            (account_type, account['tradingType'].lower()): account
+            for account_type in ('demo', 'live')
+            for account in init_info['customer'][f'{account_type}Accounts']
+        }
+
+    def _get_cached_init_info(self, session):
+        cached_session, init_info = self._init_info_cache
+        return init_info if cached_session is session else None
+
+    def _cache_init_info(self, session, init_info):
+        self._init_info_cache = (session, init_info)
+        self.account_directory = self.index_accounts(init_info)
+
+        return init_info
+
+    def clear_init_info(self):
+        self._init_info_cache = (None, None)
+
+    def get_resample_plan(self, periods, limit, base_period=None) -> tuple:
+        base_period = min(periods) if base_period is None else base_period
+
+        for period in (base_period, *periods):
+            if not period or period not in self.candle_periods:
+                raise ValueError(f'invalid period - {period}')
+
+            if period % base_period:
+                raise ValueError(f'period not divisible by base period - {period} - {base_period}')
+
+        fetch_limit = (limit + 1) * max(periods) // base_period
+
+        if fetch_limit > self.candles_max_limit:
+            max_limit = self.candles_max_limit * base_period // max(periods) - 1
+            raise ValueError(f'limit exceeds candles max limit - {limit} - {max_limit}')
+
+        return base_period, fetch_limit
+
+    @staticmethod
+    def resample_frame(frame, base_period, periods, limit) -> dict:
+        frames = {}
+
+        for period in periods:
+            bars = frame if period == base_period else frame.resample(period)
+
+            # the fetch window rarely starts on a bucket boundary, so the first bucket may be partial
+            if len(bars) and bars.timestamps[0] < frame.timestamps[0]:
+                bars = bars[1:]
+
+            frames[period] = bars[-limit:]
+
+        return frames
+
+    def _candles(self, session, instrument, period, **kwargs):
+        return self._candles_many(
+            session, [self.get_candle_payload(instrument, period, **kwargs)], **self.get_request_options(kwargs))
+
+    def _candles_many(self, session, payloads, **kwargs):
+        api_url = self.get_route_url('candles')
+
+        return self._request(
+            session, 'post', api_url,
+            priority='market_data',
+            **self.get_request_options(kwargs),
+            json=payloads
         )
 
-        r.raise_for_status()
-        return r.json()
+    def _init_info(self, session, **kwargs):
+        api_url = self.get_route_url('init_info')
 
-    def _instrument_settings(self, session, instruments):
-        api_url = self.get_rest_url('/rest/v2/account/instruments/settings')
+        return self._request(session, 'get', api_url, **self.get_request_options(kwargs))
 
-        r = self.call_api(
-            session, 'post',
-            url=api_url,
-            headers=self.get_rest_headers(),
+    def _instrument_settings(self, session, instruments, **kwargs):
+        api_url = self.get_route_url('instrument_settings')
+
+        return self._request(
+            session, 'post', api_url,
+            **self.get_request_options(kwargs),
             json=instruments
         )
 
-        r.raise_for_status()
-        return r.json()
-
     def _logout(self, session):
-        api_url = self.get_rest_url('/rest/v1/logout')
+        api_url = self.get_route_url('logout')
 
-        r = self.call_api(
-            session, 'put',
-            url=api_url,
-            headers=self.get_rest_headers(),
+        self.clear_session()
+
+        return self._request(
+            session, 'put', api_url,
+            text=True,
             json={}
         )
 
-        self.get_session.cache_clear()
+    def _notifications(self, session, **kwargs):
+        api_url = self.get_route_url('notifications')
 
-        r.raise_for_status()
-        return r.text
-
-    def _notifications(self, session):
-        api_url = self.get_rest_url('/rest/v2/notifications')
-
-        r = self.call_api(
-            session, 'get', url=api_url,
-            headers=self.get_rest_headers()
+        return self._request(
+            session, 'get', api_url,
+            priority='market_data',
+            **self.get_request_options(kwargs)
         )
 
-        r.raise_for_status()
-        return r.json()
-
-    def _price_increments(self, session, instrument_codes):
-        api_url = self.get_rest_url('/rest/v2/instruments/price-increments')
+    def _price_increments(self, session, instrument_codes, **kwargs):
+        api_url = self.get_route_url('price_increments')
         params = {'instrumentCodes': instrument_codes}
 
-        r = self.call_api(
-            session, 'get',
-            url=api_url,
-            headers=self.get_rest_headers(),
+        return self._request(
+            session, 'get', api_url,
+            priority='market_data',
+            **self.get_request_options(kwargs),
             params=params
         )
 
-        r.raise_for_status()
-        return r.json()
-
-    def _price_alerts(self, session):
-        api_url = self.get_rest_url('/rest/v2/price-alerts')
+    def _price_alerts(self, session, **kwargs):
+        api_url = self.get_route_url('price_alerts')
 
-        r = self.call_api(
-            session, 'get', url=api_url,
-            headers=self.get_rest_headers()
+        return self._request(
+            session, 'get', api_url,
+            priority='market_data',
+            **self.get_request_options(kwargs)
         )
 
-        r.raise_for_status()
-        return r.json()
-
     def _switch(self, session, account_id):
-        api_url = self.get_rest_url('/rest/v2/account/switch')
+        api_url = self.get_route_url('switch')
         payload = {'accountId': account_id}
 
-        r = self.call_api(
-            session, 'post',
-            url=api_url,
-            headers=self.get_rest_headers(),
+        self.clear_session()
+
+        return self._request(
+            session, 'post', api_url,
             json=payload
         )
 
-        self.get_session.cache_clear()
-
-        r.raise_for_status()
-        return r.json()
-
-    def _position(self, session, start, end):
-        api_url = self.get_rest_url('/user-reports/rest/position')
+    def _position(self, session, start, end, **kwargs):
+        api_url = self.get_route_url('position')
 
         params = {
             'from': time.strftime(self.date_format, time.localtime(start)),
@@ -300,31 +491,24 @@ class Trading212Rest:
             'includeOpen': True
         }
 
-        r = self.call_api(
-            session, 'get',
-            url=api_url,
-            headers=self.get_rest_headers(),
+        return self._request(
+            session, 'get', api_url,
+            priority='market_data',
+            **self.get_request_options(kwargs),
             params=params
         )
 
-        r.raise_for_status()
-        return r.json()
-
-    def _position_history(self, session, position_id):
-        api_url = self.get_rest_url(
-            f'/user-reports/rest/positionHistory/{position_id}')
+    def _position_history(self, session, position_id, **kwargs):
+        api_url = self.get_route_url('position_history', position_id)
 
-        r = self.call_api(
-            session, 'get',
-            url=api_url,
-            headers=self.get_rest_headers()
+        return self._request(
+            session, 'get', api_url,
+            priority='market_data',
+            **self.get_request_options(kwargs)
         )
 
-        r.raise_for_status()
-        return r.json()
-
     def _position_open(self, session, instrument, price, quantity, **kwargs):
-        api_url = self.get_rest_url('/rest/v2/trading/open-positions')
+        api_url = self.get_route_url('position_open')
 
         payload = {
             'instrumentCode': instrument,
@@ -339,19 +523,15 @@ class Trading212Rest:
         if stop_loss_distance := kwargs.get('stop_distance', False):
             payload['stopDistance'] = stop_loss_distance
 
-        r = self.call_api(
-            session, 'post',
-            url=api_url,
-            headers=self.get_rest_headers(),
+        return self._request(
+            session, 'post', api_url,
+            priority='trading',
+            **self.get_request_options(kwargs),
             json=payload
         )
 
-        r.raise_for_status()
-        return r.json()
-
     def _position_modify(self, session, position_id, **kwargs):
-        api_url = self.get_rest_url(
-            f'/rest/v2/pending-orders/associated/{position_id}')
+        api_url = self.get_route_url('position_modify', position_id)
 
         payload = {'notify': 'NONE'}
 
@@ -369,35 +549,27 @@ class Trading212Rest:
             payload['ts'] = {
                 'distance': trailing_distance}
 
-        r = self.call_api(
-            session, 'put',
-            url=api_url,
-            headers=self.get_rest_headers(),
+        return self._request(
+            session, 'put', api_url,
+            priority='trading',
+            **self.get_request_options(kwargs),
             json=payload
         )
 
-        r.raise_for_status()
-        return r.json()
+    def _position_close(self, session, position_id, **kwargs):
+        api_url = self.get_route_url('position_close', position_id)
 
-    def _position_close(self, session, position_id):
-        api_url = self.get_rest_url(
-            f'/rest/v2/trading/open-positions/close/{position_id}')
-
-        r = self.call_api(
-            session, 'delete',
-            url=api_url,
-            headers=self.get_rest_headers(),
+        return self._request(
+            session, 'delete', api_url,
+            priority='trading',
+            **self.get_request_options(kwargs),
             json={
                 'targetPrice': None
             }
         )
 
-        r.raise_for_status()
-        return r.json()
-
     def _order_open(self, session, instrument, price, quantity, **kwargs):
-        api_url = self.get_rest_url(
-            f'rest/v2/pending-orders/entry-dep-limit-stop/{instrument}')
+        api_url = self.get_route_url('order_open', instrument)
 
         payload = {
             'notify': 'NONE',
@@ -413,19 +585,15 @@ class Trading212Rest:
         if stop_loss := kwargs.get('stop_loss', False):
             payload['stopLoss'] = stop_loss
 
-        r = self.call_api(
-            session, 'post',
-            url=api_url,
-            headers=self.get_rest_headers(),
+        return self._request(
+            session, 'post', api_url,
+            priority='trading',
+            **self.get_request_options(kwargs),
             json=payload
         )
 
-        r.raise_for_status()
-        return r.json()
-
     def _order_modify(self, session, order_id, price, quantity, **kwargs):
-        api_url = self.get_rest_url(
-            f'rest/v2/pending-orders/entry-dep-limit-stop/{order_id}')
+        api_url = self.get_route_url('order_modify', order_id)
 
         payload = {
             'notify': 'NONE',
@@ -439,32 +607,25 @@ class Trading212Rest:
         if stop_loss := kwargs.get('stop_loss', False):
             payload['stopLoss'] = stop_loss
 
-        r = self.call_api(
-            session, 'put',
-            url=api_url,
-            headers=self.get_rest_headers(),
+        return self._request(
+            session, 'put', api_url,
+            priority='trading',
+            **self.get_request_options(kwargs),
             json=payload
         )
 
-        r.raise_for_status()
-        return r.json()
+    def _order_delete(self, session, order_id, **kwargs):
+        api_url = self.get_route_url('order_delete', order_id)
 
-    def _order_delete(self, session, order_id):
-        api_url = self.get_rest_url(
-            f'rest/v2/pending-orders/entry/{order_id}')
-
-        r = self.call_api(
-            session, 'delete',
-            url=api_url,
-            headers=self.get_rest_headers(),
+        return self._request(
+            session, 'delete', api_url,
+            priority='trading',
+            **self.get_request_options(kwargs),
             json={}
         )
 
-        r.raise_for_status()
-        return r.json()
-
     def _equity_order_open(self, session, instrument, quantity, **kwargs):
-        api_url = self.get_rest_url('rest/public/v2/equity/order')
+        api_url = self.get_route_url('equity_order_open')
 
         payload = {
             'instrumentCode': instrument,
@@ -489,19 +650,15 @@ class Trading212Rest:
             payload['orderType'] = 'LIMIT'
             payload['timeValidity'] = time_valid.upper()
 
-        r = self.call_api(
-            session, 'post',
-            url=api_url,
-            headers=self.get_rest_headers(),
+        return self._request(
+            session, 'post', api_url,
+            priority='trading',
+            **self.get_request_options(kwargs),
             json=payload
         )
 
-        r.raise_for_status()
-        return r.json()
-
     def _equity_order_modify(self, session, order_id, quantity, **kwargs):
-        api_url = self.get_rest_url(
-            f'rest/public/v2/equity/order/{order_id}')
+        api_url = self.get_route_url('equity_order', order_id)
 
         payload = {'quantity': quantity}
 
@@ -511,26 +668,19 @@ class Trading212Rest:
         if stop_price := kwargs.get('stop_price', False):
             payload['stopPrice'] = stop_price
 
-        r = self.call_api(
-            session, 'put',
-            url=api_url,
-            headers=self.get_rest_headers(),
+        return self._request(
+            session, 'put', api_url,
+            priority='trading',
+            **self.get_request_options(kwargs),
             json=payload
         )
 
-        r.raise_for_status()
-        return r.json()
-
-    def _equity_order_close(self, session, order_id):
-        api_url = self.get_rest_url(
-            f'rest/public/v2/equity/order/{order_id}')
+    def _equity_order_close(self, session, order_id, **kwargs):
+        api_url = self.get_route_url('equity_order', order_id)
 
-        r = self.call_api(
-            session, 'delete',
-            url=api_url,
-            headers=self.get_rest_headers(),
+        return self._request(
+            session, 'delete', api_url,
+            priority='trading',
+            **self.get_request_options(kwargs),
             json={}
         )
-
-        r.raise_for_status()
-        return r.json()
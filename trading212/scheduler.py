@@ -0,0 +1,198 @@
+import time
+import asyncio
+import weakref
+import threading
+import collections
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class Deadline(float):
+    pass
+
+
+def get_deadline(deadline: float = None):
+    if deadline is None or isinstance(deadline, Deadline):
+        return deadline
+
+    return Deadline(time.monotonic() + deadline)
+
+
+def get_remaining(deadline: float) -> float:
+    remaining = deadline - time.monotonic()
+
+    if remaining <= 0:
+        raise DeadlineExceeded('request deadline exceeded')
+
+    return remaining
+
+
+class RequestScheduler:
+
+    lanes = ('trading', 'account', 'market_data')
+
+    def __init__(self, limiter, maxsize: int = 100):
+        self.limiter = limiter
+        self.maxsize = maxsize
+
+        self._cond = threading.Condition()
+        self._queues = {lane: collections.deque() for lane in self.lanes}
+        self._metrics = {lane: {
+            'requests': 0, 'rejected': 0, 'expired': 0,
+            'queue_time': 0.0, 'max_queue_time': 0.0,
+            'latency': 0.0, 'max_latency': 0.0
+        } for lane in self.lanes}
+
+    def _enqueue(self, lane):
+        if lane not in self._queues:
+            raise ValueError(f'invalid priority - {lane}')
+
+        ticket = object()
+
+        with self._cond:
+            if self.maxsize is not None and len(self._queues[lane]) >= self.maxsize:
+                self._metrics[lane]['rejected'] += 1
+                raise QueueFullError(f'request queue full - {lane}')
+
+            self._queues[lane].append(ticket)
+
+        return ticket
+
+    def _dequeue(self, lane, ticket):
+        with self._cond:
+            if ticket in self._queues[lane]:
+                self._queues[lane].remove(ticket)
+                self._cond.notify_all()
+
+    def _poll(self, ticket):
+        for queue in self._queues.values():
+            if not queue:
+                continue
+
+            if queue[0] is not ticket:
+                return None
+
+            if wait := self.limiter.try_acquire():
+                return wait
+
+            queue.popleft()
+            self._cond.notify_all()
+
+            return 0.0
+
+    def _get_wait(self, lane, wait, deadline, idle=None):
+        if deadline is None:
+            return idle if wait is None else wait
+
+        remaining = deadline - time.monotonic()
+
+        if remaining <= 0 or (wait is not None and wait > remaining):
+            with self._cond:
+                self._metrics[lane]['expired'] += 1
+
+            raise DeadlineExceeded(f'request deadline exceeded - {lane}')
+
+        if wait is None:
+            return remaining if idle is None else min(idle, remaining)
+
+        return wait
+
+    def _granted(self, lane, started, waited):
+        queue_time = time.monotonic() - started
+
+        if waited:
+            self.limiter.end_wait(queue_time)
+
+        with self._cond:
+            metrics = self._metrics[lane]
+            metrics['queue_time'] += queue_time
+            metrics['max_queue_time'] = max(metrics['max_queue_time'], queue_time)
+
+        return queue_time
+
+    def acquire(self, lane: str = 'account', deadline: float = None) -> float:
+        started, waited = time.monotonic(), False
+        ticket = self._enqueue(lane)
+
+        try:
+            with self._cond:
+                while (wait := self._poll(ticket)) != 0.0:
+                    if not waited:
+                        self.limiter.begin_wait()
+                        waited = True
+
+                    self._cond.wait(self._get_wait(lane, wait, deadline))
+
+        except BaseException:
+            self._dequeue(lane, ticket)
+
+            if waited:
+                self.limiter.end_wait()
+
+            raise
+
+        return self._granted(lane, started, waited)
+
+    async def acquire_async(self, lane: str = 'account', deadline: float = None) -> float:
+        started, waited = time.monotonic(), False
+        ticket = self._enqueue(lane)
+
+        try:
+            while True:
+                with self._cond:
+                    wait = self._poll(ticket)
+
+                if wait == 0.0:
+                    break
+
+                if not waited:
+                    self.limiter.begin_wait()
+                    waited = True
+
+                await asyncio.sleep(
+                    self._get_wait(lane, wait, deadline, self.limiter.period / self.limiter.rate))
+
+        except BaseException:
+            self._dequeue(lane, ticket)
+
+            if waited:
+                self.limiter.end_wait()
+
+            raise
+
+        return self._granted(lane, started, waited)
+
+    def record(self, lane: str, latency: float):
+        with self._cond:
+            metrics = self._metrics[lane]
+            metrics['requests'] += 1
+            metrics['latency'] += latency
+            metrics['max_latency'] = max(metrics['max_latency'], latency)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                lane: {**metrics, 'queued': len(self._queues[lane])}
+                for lane, metrics in self._metrics.items()
+            }
+
+
+_schedulers = weakref.WeakKeyDictionary()
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(limiter, maxsize: int = 100) -> RequestScheduler:
+    with _schedulers_lock:
+        if limiter not in _schedulers:
+            _schedulers[limiter] = RequestScheduler(limiter, maxsize=maxsize)
+
+        elif _schedulers[limiter].maxsize != maxsize:
+            raise ValueError(f'queue size conflicts with shared scheduler - {maxsize} - {_schedulers[limiter].maxsize}')
+
+        return _schedulers[limiter]
@@ -0,0 +1,180 @@
+import time
+import asyncio
+import threading
+
+from concurrent.futures import Future
+
+
+class SessionManager:
+
+    def __init__(self, factory, ttl: float = 300, refresh_margin: float = 60, retry_interval: float = 10,
+                 on_discard=None):
+        if refresh_margin >= ttl:
+            raise ValueError(f'invalid refresh margin - {refresh_margin}')
+
+        self.factory = factory
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        self.on_discard = on_discard
+
+        self._lock = threading.Lock()
+        self._session = None
+        self._expiry = 0.0
+        self._retry_at = 0.0
+        self._pending = None
+        self._generation = 0
+
+    @property
+    def session(self):
+        return self._session
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self):
+        now = time.monotonic()
+        session, expiry = self._session, self._expiry
+
+        if session is not None and now < expiry:
+            if now >= expiry - self.refresh_margin and now >= self._retry_at:
+                self.refresh(wait=False)
+
+            return session
+
+        return self.refresh()
+
+    def refresh(self, wait: bool = True):
+        with self._lock:
+            owner = self._pending is None
+
+            if owner:
+                self._pending = Future()
+
+            future, generation = self._pending, self._generation
+
+        if owner and wait:
+            self._run(future, generation)
+
+        elif owner:
+            threading.Thread(target=self._run, args=(future, generation), daemon=True).start()
+
+        if wait:
+            return future.result()
+
+    def _run(self, future, generation):
+        try:
+            session = self.factory()
+
+        except BaseException as e:
+            with self._lock:
+                if self._pending is future:
+                    self._pending = None
+                    self._retry_at = time.monotonic() + self.retry_interval
+
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            installed = generation == self._generation
+
+            if installed:
+                self._session = session
+                self._expiry = time.monotonic() + self.ttl
+
+            if self._pending is future:
+                self._pending = None
+
+        if not installed and self.on_discard is not None:
+            self.on_discard(session)
+
+        future.set_result(session)
+
+    def invalidate(self):
+        with self._lock:
+            self._session = None
+            self._expiry = 0.0
+            self._retry_at = 0.0
+            self._pending = None
+            self._generation += 1
+
+
+class AsyncSessionManager:
+
+    def __init__(self, factory, ttl: float = 300, refresh_margin: float = 60, retry_interval: float = 10,
+                 on_discard=None):
+        if refresh_margin >= ttl:
+            raise ValueError(f'invalid refresh margin - {refresh_margin}')
+
+        self.factory = factory
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        self.on_discard = on_discard
+
+        self._session = None
+        self._expiry = 0.0
+        self._retry_at = 0.0
+        self._pending = None
+        self._generation = 0
+
+    @property
+    def session(self):
+        return self._session
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    async def get(self):
+        now = time.monotonic()
+
+        if self._session is not None and now < self._expiry:
+            if now >= self._expiry - self.refresh_margin and now >= self._retry_at:
+                self._start()
+
+            return self._session
+
+        return await self.refresh()
+
+    def refresh(self) -> asyncio.Future:
+        return asyncio.shield(self._start())
+
+    def _start(self) -> asyncio.Task:
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self._run(self._generation))
+            self._pending.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+        return self._pending
+
+    async def _run(self, generation):
+        try:
+            session = await self.factory()
+
+        except BaseException:
+            if generation == self._generation:
+                self._retry_at = time.monotonic() + self.retry_interval
+
+            raise
+
+        else:
+            if generation == self._generation:
+                self._session = session
+                self._expiry = time.monotonic() + self.ttl
+
+            elif self.on_discard is not None:
+                self.on_discard(session)
+
+            return session
+
+        finally:
+            if self._pending is asyncio.current_task():
+                self._pending = None
+
+    def invalidate(self):
+        self._session = None
+        self._expiry = 0.0
+        self._retry_at = 0.0
+        self._pending = None
+        self._generation += 1
@@ -0,0 +1,658 @@
+import re
+import json
+import math
+import time
+import random
+import hashlib
+import secrets
+import threading
+import http.cookies
+
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from typing import NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+from .limiter import TokenBucket
+from .rest import Trading212Rest
+
+PERIOD_MINUTES = {name: minutes or 43200 for minutes, name in Trading212Rest.candle_periods.items()}
+
+SIMULATOR_ROUTES = {
+    **Trading212Rest.routes,
+    'login': 'en/login',
+    'authenticate': 'en/authenticate',
+    'account_session': ''
+}
+
+ENDPOINTS = (
+    ('GET', 'login', 'login_page'),
+    ('POST', 'authenticate', 'authenticate'),
+    ('POST', 'account_session', 'account_session'),
+    ('GET', 'init_info', 'init_info'),
+    ('POST', 'switch', 'switch'),
+    ('PUT', 'logout', 'logout'),
+    ('GET', 'account', 'account'),
+    ('POST', 'candles', 'candles'),
+    ('POST', 'batch_rest', 'batch_rest'),
+    ('POST', 'batch_v2', 'batch_v2'),
+    ('POST', 'instrument_settings', 'instrument_settings'),
+    ('GET', 'notifications', 'notifications'),
+    ('GET', 'price_alerts', 'price_alerts'),
+    ('GET', 'position', 'position'),
+    ('POST', 'position_open', 'position_open'),
+    ('PUT', 'position_modify', 'position_modify'),
+    ('DELETE', 'position_close', 'position_close'),
+    ('POST', 'order_open', 'order_open'),
+    ('PUT', 'order_modify', 'order_modify'),
+    ('DELETE', 'order_delete', 'order_delete'),
+    ('POST', 'equity_order_open', 'equity_order_open'),
+    ('PUT', 'equity_order', 'equity_order_modify'),
+    ('DELETE', 'equity_order', 'equity_order_close')
+)
+
+PUBLIC_ROUTES = frozenset(['login', 'authenticate', 'account_session'])
+
+
+def compile_route(path: str):
+    return re.compile('/' + re.escape(path).replace(r'\{\}', '([^/]+)') + '$')
+
+
+class SimulatorConfig(NamedTuple):
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    rate_limit: float = None
+    rate_period: float = 1.0
+    application_name: str = 'WC4'
+    application_version: str = '5.118.0'
+    seed: int = 0
+
+
+class SimulatorError(Exception):
+
+    def __init__(self, status: int, code: str):
+        Exception.__init__(self, f'{status} - {code}')
+        self.status = status
+        self.code = code
+
+
+class SimulatorRequest(NamedTuple):
+    method: str
+    route: str
+    args: tuple
+    query: dict
+    body: bytes
+    cookies: dict
+    user: dict
+
+    def json(self):
+        try:
+            return json.loads(self.body or b'null')
+
+        except ValueError:
+            raise SimulatorError(400, 'InvalidJson')
+
+    def form(self) -> dict:
+        return {key: values[0] for key, values in parse_qs(self.body.decode()).items()}
+
+
+class SimulatedBroker:
+
+    def __init__(self, config: SimulatorConfig):
+        self.config = config
+        self.lock = threading.Lock()
+
+        self._ids = count(1000001)
+        self._login_tokens = set()
+        self._sessions = {}
+        self._users = {}
+
+    def get_user(self, username: str) -> dict:
+        if username not in self._users:
+            accounts = [
+                {'id': next(self._ids), 'type': account_type, 'tradingType': trading_type, 'currency': 'USD',
+                 'positions': [], 'limitStop': [], 'ifThen': [], 'equityOrders': []}
+                for account_type in ('demo', 'live') for trading_type in ('CFD', 'EQUITY')
+            ]
+
+            self._users[username] = {
+                'id': next(self._ids),
+                'accounts': {account['id']: account for account in accounts},
+                'current': accounts[0]['id']
+            }
+
+        return self._users[username]
+
+    def get_session_user(self, cookies: dict):
+        username = self._sessions.get(cookies.get('CUSTOMER_SESSION'))
+        return None if username is None else self._users[username]
+
+    @staticmethod
+    def get_account(user: dict, trading_type: str = None) -> dict:
+        account = user['accounts'][user['current']]
+
+        if trading_type is not None and account['tradingType'] != trading_type:
+            raise SimulatorError(400, 'InvalidAccountType')
+
+        return account
+
+    @staticmethod
+    def get_account_data(account: dict) -> dict:
+        keys = ('positions', 'limitStop', 'ifThen') if account['tradingType'] == 'CFD' else \
+            ('positions', 'equityOrders')
+
+        return {'id': account['id'], **{key: [dict(item) for item in account[key]] for key in keys}}
+
+    def get_trading_response(self, account: dict) -> dict:
+        return {'account': self.get_account_data(account)}
+
+    def get_price(self, instrument: str, timestamp: float) -> float:
+        digest = hashlib.sha256(f'{self.config.seed}:{instrument}'.encode()).digest()
+        base, phase = 1 + digest[0] * 0.8 + digest[1] / 256, digest[2] / 256 * 2 * math.pi
+
+        hours = timestamp / 3600000
+        return base * (1 + 0.01 * math.sin(hours / 24 + phase) + 0.002 * math.sin(hours * 3 + phase))
+
+    def get_quote(self, instrument: str) -> tuple:
+        bid = self.get_price(instrument, time.time() * 1000)
+        return round(bid, 5), round(bid * 1.0002, 5)
+
+    def get_candle(self, instrument: str, timestamp: int, period: int) -> dict:
+        step = period * 60000
+        prices = [self.get_price(instrument, timestamp + step * i / 4) for i in range(5)]
+        bid = {
+            'open': prices[0], 'high': max(prices) * 1.0005, 'low': min(prices) * 0.9995, 'close': prices[-1]
+        }
+
+        return {
+            'timestamp': timestamp,
+            'bid': {field: round(price, 5) for field, price in bid.items()},
+            'ask': {field: round(price * 1.0002, 5) for field, price in bid.items()}
+        }
+
+    def next_id(self) -> str:
+        return str(next(self._ids))
+
+    @staticmethod
+    def find(items: list, id_field: str, key: str) -> dict:
+        for item in items:
+            if item[id_field] == key:
+                return item
+
+        raise SimulatorError(404, 'NotFound')
+
+    def login_page(self, request):
+        token = secrets.token_hex(16)
+        self._login_tokens.add(token)
+
+        return 200, 'text', (
+            '<html><body><form method="post" action="/en/authenticate">'
+            f'<input type="hidden" id="login__token" name="login[_token]" value="{token}"/>'
+            '</form></body></html>'
+        )
+
+    def authenticate(self, request):
+        form = request.form()
+
+        if form.get('login[_token]') not in self._login_tokens:
+            raise SimulatorError(403, 'InvalidToken')
+
+        if not form.get('login[username]') or not form.get('login[password]'):
+            raise SimulatorError(401, 'InvalidCredentials')
+
+        self._login_tokens.discard(form['login[_token]'])
+
+        user = self.get_user(form['login[username]'])
+        session = secrets.token_hex(16)
+        self._sessions[session] = form['login[username]']
+
+        cookies = {
+            'JSESSIONID': secrets.token_hex(16),
+            'LOGIN_TOKEN': secrets.token_hex(16),
+            'CUSTOMER_SESSION': session,
+            f'TRADING212_SESSION_{self.get_account(user)["type"].upper()}': secrets.token_hex(16)
+        }
+
+        return 200, 'json', {}, cookies
+
+    def account_session(self, request):
+        if (username := self._sessions.get(request.form().get('customerSessionCookie'))) is None:
+            raise SimulatorError(401, 'Unauthorized')
+
+        account = self.get_account(self._users[username])
+
+        return 200, 'text', (
+            '<html><head><script>window.__config = {'
+            f"'accountId': '{account['id']}', "
+            f"'accountType': '{account['type'].upper()}', "
+            f"'accountTradingType': '{account['tradingType']}'"
+            '};</script>'
+            f'<script src="/assets/app.js?application={self.config.application_name}'
+            f'&version={self.config.application_version}"></script>'
+            '</head><body></body></html>'
+        )
+
+    def init_info(self, request):
+        accounts = request.user['accounts'].values()
+
+        return 200, 'json', {'customer': {
+            'id': request.user['id'],
+            **{
+                f'{account_type}Accounts': [
+                    {key: account[key] for key in ('id', 'tradingType', 'currency')}
+                    for account in accounts if account['type'] == account_type
+                ]
+                for account_type in ('demo', 'live')
+            }
+        }}
+
+    def switch(self, request):
+        if (account_id := request.json().get('accountId')) not in request.user['accounts']:
+            raise SimulatorError(404, 'AccountNotFound')
+
+        request.user['current'] = account_id
+        return 200, 'json', {'accountId': account_id}
+
+    def logout(self, request):
+        self._sessions.pop(request.cookies.get('CUSTOMER_SESSION'), None)
+        return 200, 'text', ''
+
+    def account(self, request):
+        return 200, 'json', self.get_account_data(self.get_account(request.user))
+
+    def candles(self, request):
+        return 200, 'json', self.get_candles(request.json())
+
+    def get_candles(self, payloads: list) -> list:
+        now, data = int(time.time() * 1000), []
+
+        for payload in payloads:
+            if (period := PERIOD_MINUTES.get(payload.get('periodType'))) is None:
+                raise SimulatorError(400, 'InvalidPeriod')
+
+            step = period * 60000
+            last = now - now % step
+
+            data.append({'request': payload, 'candles': [
+                self.get_candle(payload['instCode'], last - step * i, period)
+                for i in reversed(range(min(payload.get('limit', 500), Trading212Rest.candles_max_limit)))
+            ]})
+
+        return data
+
+    def batch_rest(self, request):
+        return 200, 'json', {'candles': self.get_candles(request.json().get('candles', []))}
+
+    def batch_v2(self, request):
+        payload, now, data = request.json(), time.time() * 1000, {}
+
+        for item in payload.get('deviations', []):
+            price, previous = self.get_price(item['ticker'], now), self.get_price(item['ticker'], now - 86400000)
+            data.setdefault('deviations', []).append({
+                'request': item, 'delta': round(price - previous, 5), 'percent': round((price / previous - 1) * 100, 2)
+            })
+
+        for item in payload.get('highLow', []):
+            prices = [self.get_price(item['ticker'], now - 3600000 * i) for i in range(24)]
+            data.setdefault('highLow', []).append({
+                'request': item, 'high': round(max(prices), 5), 'low': round(min(prices), 5)
+            })
+
+        return 200, 'json', data
+
+    def instrument_settings(self, request):
+        return 200, 'json', [
+            {'code': code, 'minTrade': 0.01, 'maxTrade': 1000000, 'leverage': '1:30'} for code in request.json()
+        ]
+
+    def notifications(self, request):
+        return 200, 'json', []
+
+    def price_alerts(self, request):
+        return 200, 'json', []
+
+    def position(self, request):
+        return 200, 'json', [dict(item) for item in self.get_account(request.user)['positions']]
+
+    def position_open(self, request):
+        account, payload = self.get_account(request.user, 'CFD'), request.json()
+
+        if not payload.get('instrumentCode') or not payload.get('quantity'):
+            raise SimulatorError(400, 'InvalidOrder')
+
+        quantity = payload['quantity']
+        bid, ask = self.get_quote(payload['instrumentCode'])
+        price = payload.get('targetPrice') or (ask if quantity > 0 else bid)
+        side = 1 if quantity > 0 else -1
+
+        position = {
+            'positionId': self.next_id(), 'code': payload['instrumentCode'],
+            'quantity': quantity, 'averagePrice': price, 'created': int(time.time() * 1000)
+        }
+
+        if distance := payload.get('limitDistance'):
+            position['limitPrice'] = round(price + side * distance, 5)
+
+        if distance := payload.get('stopDistance'):
+            position['stopPrice'] = round(price - side * distance, 5)
+
+        account['positions'].append(position)
+        return 200, 'json', self.get_trading_response(account)
+
+    def position_modify(self, request):
+        account, payload = self.get_account(request.user, 'CFD'), request.json()
+        position = self.find(account['positions'], 'positionId', request.args[0])
+
+        for key, field in (('takeProfit', 'limitPrice'), ('stopLoss', 'stopPrice')) if 'tp_sl' in payload else ():
+            if payload['tp_sl'].get(key) is None:
+                position.pop(field, None)
+
+            else:
+                position[field] = payload['tp_sl'][key]
+
+        if 'ts' in payload:
+            position['trailingStop'] = payload['ts']['distance']
+
+        return 200, 'json', self.get_trading_response(account)
+
+    def position_close(self, request):
+        account = self.get_account(request.user, 'CFD')
+        account['positions'].remove(self.find(account['positions'], 'positionId', request.args[0]))
+
+        return 200, 'json', self.get_trading_response(account)
+
+    def get_pending_order(self, order_id: str, instrument: str, payload: dict) -> tuple:
+        if not payload.get('quantity') or not payload.get('targetPrice') or payload['targetPrice'] <= 0:
+            raise SimulatorError(400, 'InvalidOrder')
+
+        bid, ask = self.get_quote(instrument)
+        buy, price = payload['quantity'] > 0, payload['targetPrice']
+        order_type = 'LIMIT' if (buy and price <= ask) or (not buy and price >= bid) else 'STOP'
+
+        order = {
+            'orderId': order_id, 'code': instrument, 'quantity': payload['quantity'],
+            'targetPrice': price, 'type': order_type
+        }
+
+        if payload.get('takeProfit') is None and payload.get('stopLoss') is None:
+            return 'limitStop', order
+
+        for key, field in (('takeProfit', 'limit'), ('stopLoss', 'stop')):
+            if payload.get(key) is not None:
+                order[field] = {'targetPrice': payload[key]}
+
+        return 'ifThen', {**order, 'type': f'TRIGGER-{order_type}'}
+
+    def order_open(self, request):
+        account = self.get_account(request.user, 'CFD')
+        key, order = self.get_pending_order(self.next_id(), request.args[0], request.json())
+
+        account[key].append(order)
+        return 200, 'json', self.get_trading_response(account)
+
+    def order_modify(self, request):
+        account = self.get_account(request.user, 'CFD')
+
+        for previous_key in ('limitStop', 'ifThen'):
+            if order := next((item for item in account[previous_key] if item['orderId'] == request.args[0]), None):
+                break
+
+        else:
+            raise SimulatorError(404, 'NotFound')
+
+        key, modified = self.get_pending_order(order['orderId'], order['code'], request.json())
+
+        if key != previous_key:
+            modified['orderId'] = self.next_id()
+
+        account[previous_key].remove(order)
+        account[key].append(modified)
+
+        return 200, 'json', self.get_trading_response(account)
+
+    def order_delete(self, request):
+        account = self.get_account(request.user, 'CFD')
+
+        for key in ('limitStop', 'ifThen'):
+            for order in account[key]:
+                if order['orderId'] == request.args[0]:
+                    account[key].remove(order)
+                    return 200, 'json', self.get_trading_response(account)
+
+        raise SimulatorError(404, 'NotFound')
+
+    def equity_order_open(self, request):
+        account, payload = self.get_account(request.user, 'EQUITY'), request.json()
+        instrument, quantity = payload.get('instrumentCode'), payload.get('quantity')
+
+        if not instrument or not quantity:
+            raise SimulatorError(400, 'InvalidOrder')
+
+        if payload.get('orderType') == 'MARKET':
+            self.fill_equity_order(account, instrument, quantity)
+            return 200, 'json', self.get_trading_response(account)
+
+        limit_price, stop_price = payload.get('limitPrice'), payload.get('stopPrice')
+        order_type = 'STOP_LIMIT' if limit_price and stop_price else 'LIMIT' if limit_price else 'STOP'
+
+        order = {
+            'orderId': self.next_id(), 'code': instrument, 'quantity': quantity, 'type': order_type,
+            'timeValidity': payload.get('timeValidity', 'DAY')
+        }
+
+        for field, price in (('limitPrice', limit_price), ('stopPrice', stop_price)):
+            if price is not None:
+                order[field] = price
+
+        account['equityOrders'].append(order)
+        return 200, 'json', self.get_trading_response(account)
+
+    def fill_equity_order(self, account: dict, instrument: str, quantity: float):
+        bid, ask = self.get_quote(instrument)
+        position = next((item for item in account['positions'] if item['code'] == instrument), None)
+        held = 0 if position is None else position['quantity']
+
+        if held + quantity < 0:
+            raise SimulatorError(400, 'InsufficientQuantity')
+
+        if position is None:
+            account['positions'].append({
+                'positionId': self.next_id(), 'code': instrument, 'quantity': quantity, 'averagePrice': ask
+            })
+
+        elif held + quantity == 0:
+            account['positions'].remove(position)
+
+        else:
+            if quantity > 0:
+                cost = held * position['averagePrice'] + quantity * ask
+                position['averagePrice'] = round(cost / (held + quantity), 5)
+
+            position['quantity'] = held + quantity
+
+    def equity_order_modify(self, request):
+        account, payload = self.get_account(request.user, 'EQUITY'), request.json()
+        order = self.find(account['equityOrders'], 'orderId', request.args[0])
+
+        if not payload.get('quantity'):
+            raise SimulatorError(400, 'InvalidOrder')
+
+        order['quantity'] = payload['quantity']
+
+        for field in ('limitPrice', 'stopPrice'):
+            if payload.get(field) is not None:
+                order[field] = payload[field]
+
+        return 200, 'json', self.get_trading_response(account)
+
+    def equity_order_close(self, request):
+        account = self.get_account(request.user, 'EQUITY')
+        account['equityOrders'].remove(self.find(account['equityOrders'], 'orderId', request.args[0]))
+
+        return 200, 'json', self.get_trading_response(account)
+
+
+class SimulatorHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        status, headers, content = self.server.simulator.handle(
+            self.command, self.path, self.headers.get('Cookie', ''), body)
+
+        self.send_response(status)
+
+        for name, value in headers:
+            self.send_header(name, value)
+
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = respond
+
+    def log_message(self, *args):
+        pass
+
+
+class Trading212Simulator:
+
+    def __init__(self, config: SimulatorConfig = None, host: str = '127.0.0.1', port: int = 0):
+        self.config = SimulatorConfig() if config is None else config
+        self.broker = SimulatedBroker(self.config)
+
+        self.host = host
+        self.port = port
+
+        self.endpoints = [
+            (method, route, compile_route(SIMULATOR_ROUTES[route]), getattr(self.broker, handler))
+            for method, route, handler in ENDPOINTS
+        ]
+
+        self._lock = threading.Lock()
+        self._random = random.Random(self.config.seed)
+        self._errors = {}
+        self._limiters = {}
+        self._stats = Counter()
+
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    def get_client_kwargs(self) -> dict:
+        return {'base_url': self.url, 'rest_url': self.url}
+
+    def start(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), SimulatorHandler)
+        self._server.daemon_threads = True
+        self._server.simulator = self
+        self.port = self._server.server_port
+
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+        self._server = None
+        self._thread = None
+
+    def inject_error(self, route: str, status: int = 500, count: int = 1):
+        if route not in SIMULATOR_ROUTES:
+            raise ValueError(f'invalid route - {route}')
+
+        with self._lock:
+            self._errors.setdefault(route, deque()).extend([status] * count)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def match(self, method: str, path: str) -> tuple:
+        for endpoint_method, route, pattern, handler in self.endpoints:
+            if endpoint_method == method and (match := pattern.match(path)):
+                return route, match.groups(), handler
+
+        raise SimulatorError(404, 'NotFound')
+
+    def get_limiter(self, key) -> TokenBucket:
+        if key not in self._limiters:
+            self._limiters[key] = TokenBucket(rate=self.config.rate_limit, period=self.config.rate_period)
+
+        return self._limiters[key]
+
+    def get_injected_error(self, route: str, key):
+        with self._lock:
+            if self.config.rate_limit is not None and (wait := self.get_limiter(key).try_acquire()):
+                return 429, 'TooManyRequests', [('Retry-After', str(math.ceil(wait)))]
+
+            if errors := self._errors.get(route):
+                return errors.popleft(), 'InjectedError', []
+
+            if self.config.error_rate and self._random.random() < self.config.error_rate:
+                return self.config.error_status, 'InjectedError', []
+
+        return None
+
+    def handle(self, method: str, path: str, cookie_header: str, body: bytes) -> tuple:
+        if latency := self.config.latency + (self.config.jitter and self._random.uniform(0, self.config.jitter)):
+            time.sleep(latency)
+
+        url = urlsplit(path)
+        cookies = {name: morsel.value for name, morsel in http.cookies.SimpleCookie(cookie_header).items()}
+        route = None
+
+        try:
+            route, args, handler = self.match(method, url.path)
+
+            with self.broker.lock:
+                user = self.broker.get_session_user(cookies)
+
+            if user is None and route not in PUBLIC_ROUTES:
+                raise SimulatorError(401, 'Unauthorized')
+
+            if error := self.get_injected_error(route, cookies.get('CUSTOMER_SESSION')):
+                status, code, headers = error
+                return self.record(route, status, headers, 'json', {'code': code})
+
+            request = SimulatorRequest(method, route, args, parse_qs(url.query), body, cookies, user)
+
+            with self.broker.lock:
+                status, content_type, data, *extra = handler(request)
+
+        except SimulatorError as e:
+            return self.record(route, e.status, [], 'json', {'code': e.code})
+
+        headers = [('Set-Cookie', f'{name}={value}; Path=/') for name, value in (extra[0] if extra else {}).items()]
+        return self.record(route, status, headers, content_type, data)
+
+    def record(self, route, status, headers, content_type, data) -> tuple:
+        with self._lock:
+            self._stats[(route, status)] += 1
+
+        if content_type == 'json':
+            return status, [('Content-Type', 'application/json'), *headers], json.dumps(data).encode()
+
+        return status, [('Content-Type', 'text/html; charset=UTF-8'), *headers], data.encode()
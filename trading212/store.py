@@ -0,0 +1,68 @@
+import os
+import abc
+import json
+import hashlib
+
+
+class SessionStore(abc.ABC):
+
+    @abc.abstractmethod
+    def load(self, key: str):
+        pass
+
+    @abc.abstractmethod
+    def save(self, key: str, state: dict):
+        pass
+
+    @abc.abstractmethod
+    def delete(self, key: str):
+        pass
+
+
+class MemorySessionStore(SessionStore):
+
+    def __init__(self):
+        self._states = {}
+
+    def load(self, key: str):
+        return self._states.get(key)
+
+    def save(self, key: str, state: dict):
+        self._states[key] = state
+
+    def delete(self, key: str):
+        self._states.pop(key, None)
+
+
+class FileSessionStore(SessionStore):
+
+    def __init__(self, path: str = '~/.trading212/sessions'):
+        self.path = os.path.expanduser(path)
+        os.makedirs(self.path, mode=0o700, exist_ok=True)
+
+    def get_filename(self, key: str) -> str:
+        return os.path.join(self.path, hashlib.sha256(key.encode()).hexdigest() + '.json')
+
+    def load(self, key: str):
+        try:
+            with open(self.get_filename(key), 'r') as f:
+                return json.load(f)
+
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def save(self, key: str, state: dict):
+        filename = self.get_filename(key)
+        fd = os.open(filename + '.tmp', os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f)
+
+        os.replace(filename + '.tmp', filename)
+
+    def delete(self, key: str):
+        try:
+            os.remove(self.get_filename(key))
+
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,116 @@
+import sys
+
+from typing import NamedTuple
+
+import requests
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cassette import RecordingAdapter, ReplayAdapter, get_cassette
+
+
+def get_httpx():
+    return sys.modules.get('httpx')
+
+
+def get_http_errors() -> tuple:
+    httpx = get_httpx()
+    return (requests.HTTPError,) if httpx is None else (requests.HTTPError, httpx.HTTPStatusError)
+
+
+class TransportConfig(NamedTuple):
+    pool_connections: int = 10
+    pool_maxsize: int = 100
+    keep_alive: bool = True
+    keep_alive_timeout: float = 15.0
+    retries: int = 2
+    backoff_factor: float = 0.3
+    retry_statuses: tuple = (502, 503, 504)
+    timeout: float = 30.0
+    http2: bool = False
+    backend: str = 'http'
+    cassette: str = None
+    replay_latency: float = 0.0
+
+
+def get_retry(config: TransportConfig) -> Retry:
+    return Retry(
+        total=config.retries,
+        backoff_factor=config.backoff_factor,
+        status_forcelist=config.retry_statuses,
+        allowed_methods=frozenset(['GET']),
+        raise_on_status=False
+    )
+
+
+def get_adapter(config: TransportConfig) -> HTTPAdapter:
+    if config.backend not in ('http', 'record', 'replay'):
+        raise ValueError(f'invalid transport backend - {config.backend}')
+
+    if config.backend != 'http' and config.cassette is None:
+        raise ValueError(f'{config.backend} transport requires a cassette path')
+
+    if config.backend == 'replay':
+        return ReplayAdapter(get_cassette(config.cassette), latency=config.replay_latency)
+
+    kwargs = {
+        'pool_connections': config.pool_connections,
+        'pool_maxsize': config.pool_maxsize,
+        'max_retries': get_retry(config)
+    }
+
+    if config.backend == 'record':
+        return RecordingAdapter(get_cassette(config.cassette, record=True), **kwargs)
+
+    return HTTPAdapter(**kwargs)
+
+
+def create_session(config: TransportConfig):
+    if config.http2 and config.backend != 'http':
+        raise ValueError(f'http2 transport does not support {config.backend} backend')
+
+    if config.http2:
+        return create_http2_session(config)
+
+    session = requests.Session()
+    adapter = get_adapter(config)
+
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    return session
+
+
+def create_http2_session(config: TransportConfig):
+    try:
+        import httpx
+
+    except ImportError:
+        raise ImportError('http2 transport requires httpx - pip install trading212-web-api[http2]')
+
+    limits = httpx.Limits(
+        max_connections=config.pool_maxsize,
+        max_keepalive_connections=config.pool_maxsize if config.keep_alive else 0,
+        keepalive_expiry=config.keep_alive_timeout
+    )
+
+    return httpx.Client(
+        timeout=config.timeout,
+        follow_redirects=True,
+        transport=httpx.HTTPTransport(http2=True, limits=limits, retries=config.retries)
+    )
+
+
+def get_timeout(session, timeout, connect=None):
+    if connect is None:
+        return timeout
+
+    if (httpx := get_httpx()) is not None and isinstance(session, httpx.Client):
+        return httpx.Timeout(timeout, connect=connect, pool=connect)
+
+    return connect, timeout
+
+
+def get_cookie_jar(session):
+    return getattr(session.cookies, 'jar', session.cookies)